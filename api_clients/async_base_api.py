@@ -0,0 +1,270 @@
+import asyncio
+import threading
+import time
+from contextlib import aclosing
+from typing import AsyncIterator, Awaitable, Callable, Iterable
+from urllib.parse import urlsplit
+
+import httpx
+
+from api_clients.base_api import BaseApi, pool_settings
+from api_clients.policy import RequestPolicy
+from api_clients.response_cache import ResponseCache
+from utils.auth import refresh_token
+from utils.json_codec import encode_body, memoize_json
+from utils.json_stream import JsonArrayParser
+from utils.metrics import latency, route_key
+from utils.openmetrics import api_metrics, resource_of
+
+DEFAULT_CONCURRENCY = 20
+
+# background event loop of sync callers, see run_in_loop
+_loop = None
+_loop_lock = threading.Lock()
+
+
+class AsyncBaseApi:
+    """
+    Base class for async API clients. \n
+    Clients of one environment share a single httpx.AsyncClient per event loop.
+    """
+
+    _clients: dict = {}
+    # custom httpx transport for all new clients, e.g. fake API
+    transport = None
+
+    def __init__(self, config):
+        self.config = config
+        self.client = self.get_client(config=self.config)
+        self.policy = RequestPolicy.get(config=self.config)
+        self.cache = ResponseCache.get(config=self.config)
+        self.headers = {}
+
+    @classmethod
+    def get_client(cls, config) -> httpx.AsyncClient:
+        """
+        Get pooled async client for environment and running event loop. \n
+        :param config: environment config.
+        :return: shared httpx.AsyncClient.
+        """
+        key = (config["url"], asyncio.get_running_loop())
+        client = cls._clients.get(key)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(transport=cls.transport, **pool_settings(config=config))
+            cls._clients[key] = client
+        return client
+
+    @classmethod
+    async def aclose_clients(cls):
+        """Close pooled async clients of running event loop."""
+        loop = asyncio.get_running_loop()
+        for key in [key for key in cls._clients if key[1] is loop]:
+            await cls._clients.pop(key).aclose()
+
+    async def stream_json(
+        self, method: str, url: str, fields: tuple = None, **kwargs
+    ) -> AsyncIterator:
+        """
+        Send request and yield items of JSON array response as its bytes arrive. \n
+        Token is refreshed and request is repeated once when server answers 401.
+        Request goes through api_clients.policy, responses are never cached.
+        :param method: http method.
+        :param url: request url.
+        :param fields: keep only these keys of items, e.g. ("id",).
+        :return: items.
+        """
+        headers = {**self.headers, **kwargs.pop("headers", {})}
+
+        async def send() -> httpx.Response:
+            request = self.client.build_request(method, url, headers=headers, **kwargs)
+            return await self.client.send(request, stream=True)
+
+        def key(response: httpx.Response) -> str:
+            return route_key(method, response.url.path, urlsplit(self.config["url"]).path)
+
+        # streamed calls bypass the log decorator, so OpenMetrics are recorded here
+        resource, entered = resource_of(self), api_metrics.enabled
+        if entered:
+            api_metrics.enter(resource)
+        start = time.perf_counter()
+        try:
+            for attempt in range(2):
+                async with aclosing(await self.policy.asend(method, url, send)) as response:
+                    if response.status_code == 401 and "Authorization" in headers and not attempt:
+                        stale_token = headers["Authorization"].removeprefix("Bearer ")
+                        token = await asyncio.to_thread(
+                            refresh_token,
+                            self.config,
+                            BaseApi.get_client(config=self.config),
+                            stale_token=stale_token,
+                        )
+                        self.headers["Authorization"] = headers["Authorization"] = f"Bearer {token}"
+                        continue
+                    if response.status_code != 200:
+                        if entered:
+                            seconds = time.perf_counter() - start
+                            api_metrics.observe(
+                                resource, key(response), seconds, response.status_code
+                            )
+                        await response.aread()
+                        raise Exception(
+                            f"Unexpected status code: {response.status_code}, {response.text}"
+                        )
+                    parser = JsonArrayParser(fields=fields)
+                    async for chunk in response.aiter_bytes():
+                        for item in parser.feed(chunk):
+                            yield item
+                    for item in parser.feed(b"", final=True):
+                        yield item
+                    seconds = time.perf_counter() - start
+                    latency.record(key(response), seconds, response.status_code)
+                    if entered:
+                        api_metrics.observe(resource, key(response), seconds, response.status_code)
+                    return
+        finally:
+            if entered:
+                api_metrics.exit(resource)
+
+    @staticmethod
+    async def paginate(
+        fetch: Callable[..., Awaitable[httpx.Response]], page_size: int
+    ) -> AsyncIterator[dict]:
+        """
+        Walk limit/offset pages lazily, next page is fetched while current one is consumed. \n
+        Stops on first page shorter than page_size, at most two pages are held in memory.
+        :param fetch: async API method accepting limit and offset.
+        :param page_size: items per page.
+        :return: items of all pages.
+        """
+        task = asyncio.ensure_future(fetch(limit=page_size, offset=0))
+        offset = 0
+        try:
+            while task is not None:
+                response = await task
+                if response is None or response.status_code != 200:
+                    raise Exception(f"Unable to get page with offset {offset}!")
+                page = response.json()
+                offset += page_size
+                task = (
+                    asyncio.ensure_future(fetch(limit=page_size, offset=offset))
+                    if len(page) >= page_size
+                    else None
+                )
+                for item in page:
+                    yield item
+        finally:
+            if task is not None:
+                task.cancel()
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Send request through pooled async client. \n
+        Token is refreshed and request is repeated once when server answers 401.
+        JSON bodies are encoded and decoded with utils.json_codec.
+        Rate limit, retries and circuit breaker are applied by api_clients.policy,
+        GETs are served from api_clients.response_cache when it is enabled.
+        :param method: http method.
+        :param url: request url.
+        :return: response.
+        """
+        headers = {**self.headers, **kwargs.pop("headers", {})}
+        kwargs = encode_body(kwargs)
+
+        async def send() -> httpx.Response:
+            return await self.client.request(method, url, headers=headers, **kwargs)
+
+        async def send_authorized() -> httpx.Response:
+            response = await self.policy.asend(method, url, send)
+            if response.status_code == 401 and "Authorization" in self.headers:
+                stale_token = self.headers["Authorization"].removeprefix("Bearer ")
+                token = await asyncio.to_thread(
+                    refresh_token,
+                    self.config,
+                    BaseApi.get_client(config=self.config),
+                    stale_token=stale_token,
+                )
+                self.headers["Authorization"] = f"Bearer {token}"
+                headers["Authorization"] = f"Bearer {token}"
+                response = await self.policy.asend(method, url, send)
+            return memoize_json(response)
+
+        if self.cache is None:
+            return await send_authorized()
+        if self.cache.cacheable(method, headers):
+            key = self.cache.key(url, kwargs.get("params"), headers)
+            return await self.cache.afetch(key, url, send_authorized)
+        response = await send_authorized()
+        self.cache.invalidate(url)
+        return response
+
+
+async def gather_limited(
+    aws: Iterable[Awaitable], limit: int = DEFAULT_CONCURRENCY, return_exceptions: bool = False
+) -> list:
+    """
+    Await coroutines with at most limit of them running at once. \n
+    :param aws: coroutines, e.g. [api.create_space(data=...) for ...].
+    :param limit: max number of concurrent requests.
+    :param return_exceptions: return exceptions as results instead of raising.
+    :return: results in order of aws.
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(aw):
+        async with semaphore:
+            return await aw
+
+    return await asyncio.gather(*(run(aw) for aw in aws), return_exceptions=return_exceptions)
+
+
+async def map_limited(
+    func: Callable[..., Awaitable],
+    items: Iterable,
+    limit: int = DEFAULT_CONCURRENCY,
+    return_exceptions: bool = False,
+) -> list:
+    """
+    Call func for every item with at most limit calls running at once. \n
+    func is called only when a slot is free.
+    :param func: async function, e.g. api.delete_space.
+    :param items: arguments for func, dict items are passed as keyword arguments.
+    :param limit: max number of concurrent requests.
+    :param return_exceptions: return exceptions as results instead of raising.
+    :return: results in order of items.
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(item):
+        async with semaphore:
+            if isinstance(item, dict):
+                return await func(**item)
+            return await func(item)
+
+    return await asyncio.gather(*(run(item) for item in items), return_exceptions=return_exceptions)
+
+
+def run_in_loop(aw: Awaitable) -> any:
+    """
+    Run coroutine from sync code on a long-lived background event loop. \n
+    Async clients are pooled per event loop, so unlike asyncio.run every call reuses
+    connections opened by previous calls, e.g. cleanup after every test.
+    :param aw: coroutine.
+    :return: result of coroutine.
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="api-loop", daemon=True).start()
+        loop = _loop
+    return asyncio.run_coroutine_threadsafe(aw, loop).result()
+
+
+def close_loop():
+    """Close pooled clients of background event loop and stop it."""
+    global _loop
+    with _loop_lock:
+        loop, _loop = _loop, None
+    if loop is not None:
+        asyncio.run_coroutine_threadsafe(AsyncBaseApi.aclose_clients(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
@@ -0,0 +1,199 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from typing import Callable, Iterator
+from urllib.parse import urlsplit
+
+import httpx
+
+from api_clients.policy import RequestPolicy
+from api_clients.response_cache import ResponseCache
+from utils.auth import refresh_token
+from utils.json_codec import encode_body, memoize_json
+from utils.json_stream import JsonArrayParser
+from utils.metrics import latency, route_key
+from utils.openmetrics import api_metrics, resource_of
+
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_PAGE_SIZE = 100
+
+
+def pool_settings(config) -> dict:
+    """
+    Connection pool settings for httpx clients. \n
+    :param config: environment config.
+    :return: keyword arguments for httpx.Client and httpx.AsyncClient.
+    """
+    return {
+        "limits": httpx.Limits(
+            max_connections=int(config.get("max_connections", DEFAULT_MAX_CONNECTIONS)),
+            max_keepalive_connections=int(
+                config.get("max_keepalive_connections", DEFAULT_MAX_KEEPALIVE_CONNECTIONS)
+            ),
+            keepalive_expiry=float(config.get("keepalive_expiry", DEFAULT_KEEPALIVE_EXPIRY)),
+        ),
+        "timeout": float(config.get("timeout", DEFAULT_TIMEOUT)),
+    }
+
+
+class BaseApi:
+    """
+    Base class for API clients. \n
+    All clients of one environment share a single long-lived httpx.Client, so connections
+    (and TLS sessions) are reused between requests and between API classes.
+    """
+
+    _clients: dict = {}
+    _lock = threading.Lock()
+    # custom httpx transport for all new clients, e.g. fake API
+    transport = None
+
+    def __init__(self, config):
+        self.config = config
+        self.client = self.get_client(config=self.config)
+        self.policy = RequestPolicy.get(config=self.config)
+        self.cache = ResponseCache.get(config=self.config)
+        self.headers = {}
+
+    def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Send request through pooled client. \n
+        Token is refreshed and request is repeated once when server answers 401.
+        JSON bodies are encoded and decoded with utils.json_codec.
+        Rate limit, retries and circuit breaker are applied by api_clients.policy,
+        GETs are served from api_clients.response_cache when it is enabled.
+        :param method: http method.
+        :param url: request url.
+        :return: response.
+        """
+        headers = {**self.headers, **kwargs.pop("headers", {})}
+        kwargs = encode_body(kwargs)
+
+        def send() -> httpx.Response:
+            return self.client.request(method, url, headers=headers, **kwargs)
+
+        def send_authorized() -> httpx.Response:
+            response = self.policy.send(method, url, send)
+            if response.status_code == 401 and "Authorization" in self.headers:
+                stale_token = self.headers["Authorization"].removeprefix("Bearer ")
+                token = refresh_token(self.config, self.client, stale_token=stale_token)
+                self.headers["Authorization"] = f"Bearer {token}"
+                headers["Authorization"] = f"Bearer {token}"
+                response = self.policy.send(method, url, send)
+            return memoize_json(response)
+
+        if self.cache is None:
+            return send_authorized()
+        if self.cache.cacheable(method, headers):
+            key = self.cache.key(url, kwargs.get("params"), headers)
+            return self.cache.fetch(key, url, send_authorized)
+        response = send_authorized()
+        self.cache.invalidate(url)
+        return response
+
+    def stream_json(self, method: str, url: str, fields: tuple = None, **kwargs) -> Iterator:
+        """
+        Send request and yield items of JSON array response as its bytes arrive. \n
+        Token is refreshed and request is repeated once when server answers 401.
+        Request goes through api_clients.policy, responses are never cached.
+        :param method: http method.
+        :param url: request url.
+        :param fields: keep only these keys of items, e.g. ("id",).
+        :return: items.
+        """
+        headers = {**self.headers, **kwargs.pop("headers", {})}
+
+        def send() -> httpx.Response:
+            request = self.client.build_request(method, url, headers=headers, **kwargs)
+            return self.client.send(request, stream=True)
+
+        def key(response: httpx.Response) -> str:
+            return route_key(method, response.url.path, urlsplit(self.config["url"]).path)
+
+        # streamed calls bypass the log decorator, so OpenMetrics are recorded here
+        resource, entered = resource_of(self), api_metrics.enabled
+        if entered:
+            api_metrics.enter(resource)
+        start = time.perf_counter()
+        try:
+            for attempt in range(2):
+                with closing(self.policy.send(method, url, send)) as response:
+                    if response.status_code == 401 and "Authorization" in headers and not attempt:
+                        stale_token = headers["Authorization"].removeprefix("Bearer ")
+                        token = refresh_token(self.config, self.client, stale_token=stale_token)
+                        self.headers["Authorization"] = headers["Authorization"] = f"Bearer {token}"
+                        continue
+                    if response.status_code != 200:
+                        if entered:
+                            seconds = time.perf_counter() - start
+                            api_metrics.observe(
+                                resource, key(response), seconds, response.status_code
+                            )
+                        response.read()
+                        raise Exception(
+                            f"Unexpected status code: {response.status_code}, {response.text}"
+                        )
+                    parser = JsonArrayParser(fields=fields)
+                    for chunk in response.iter_bytes():
+                        yield from parser.feed(chunk)
+                    yield from parser.feed(b"", final=True)
+                    seconds = time.perf_counter() - start
+                    latency.record(key(response), seconds, response.status_code)
+                    if entered:
+                        api_metrics.observe(resource, key(response), seconds, response.status_code)
+                    return
+        finally:
+            if entered:
+                api_metrics.exit(resource)
+
+    @staticmethod
+    def paginate(fetch: Callable[..., httpx.Response], page_size: int) -> Iterator[dict]:
+        """
+        Walk limit/offset pages lazily, next page is fetched while current one is consumed. \n
+        Stops on first page shorter than page_size, at most two pages are held in memory.
+        :param fetch: API method accepting limit and offset.
+        :param page_size: items per page.
+        :return: items of all pages.
+        """
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(fetch, limit=page_size, offset=0)
+            offset = 0
+            while future is not None:
+                response = future.result()
+                if response is None or response.status_code != 200:
+                    future.cancel()
+                    raise Exception(f"Unable to get page with offset {offset}!")
+                page = response.json()
+                offset += page_size
+                future = (
+                    executor.submit(fetch, limit=page_size, offset=offset)
+                    if len(page) >= page_size
+                    else None
+                )
+                yield from page
+
+    @classmethod
+    def get_client(cls, config) -> httpx.Client:
+        """
+        Get pooled client for environment, create it on first use. \n
+        :param config: environment config.
+        :return: shared httpx.Client.
+        """
+        with cls._lock:
+            client = cls._clients.get(config["url"])
+            if client is None or client.is_closed:
+                client = httpx.Client(transport=cls.transport, **pool_settings(config=config))
+                cls._clients[config["url"]] = client
+            return client
+
+    @classmethod
+    def close_clients(cls):
+        """Close all pooled clients."""
+        with cls._lock:
+            for client in cls._clients.values():
+                client.close()
+            cls._clients.clear()
@@ -1,13 +1,17 @@
 import json
+from typing import AsyncIterator, Iterator
 
 import httpx
 
+from api_clients.async_base_api import AsyncBaseApi
+from api_clients.base_api import BaseApi
 from utils.logger.log import log
+from utils.resource_registry import track, untrack
 
 
-class BookingApi:
+class BookingApi(BaseApi):
     def __init__(self, config):
-        self.config = config
+        super().__init__(config=config)
         self.headers = {
             "Authorization": f"Bearer {self.config['token']}",
             "Content-Type": "application/json",
@@ -18,13 +22,14 @@ class BookingApi:
         self.url = self.config["url"] + "/booking"
 
     @log
+    @track("booking")
     def create_booking(self, data: json) -> httpx.Response:
         """
         POST /booking/ \n
         :param data: data for create booking.
         :return: json data.
         """
-        return httpx.post(f"{self.url}/", headers=self.headers, json=data)
+        return self.request("POST", f"{self.url}/", json=data)
 
     @log
     def get_booking_tenant(self) -> httpx.Response:
@@ -32,7 +37,7 @@ class BookingApi:
         GET /booking/tenant/ \n
         :return: json data.
         """
-        return httpx.get(f"{self.url}/tenant/", headers=self.headers)
+        return self.request("GET", f"{self.url}/tenant/")
 
     @log
     def get_bookings_for_owner(self) -> httpx.Response:
@@ -40,13 +45,95 @@ class BookingApi:
         GET /booking/owner/ \n
         :return: json data.
         """
-        return httpx.get(f"{self.url}/owner/", headers=self.headers)
+        return self.request("GET", f"{self.url}/owner/")
 
     @log
+    @untrack("booking")
     def delete_booking(self, id_: str) -> httpx.Response:
         """
         DELETE /booking/ \n
         :param id_: booking id.
         :return: json data.
         """
-        return httpx.delete(f"{self.url}/", headers=self.headers, params={"id": id_})
+        return self.request("DELETE", f"{self.url}/", params={"id": id_})
+
+    def stream_booking_tenant(self, fields: tuple = None) -> Iterator[dict]:
+        """
+        GET /booking/tenant/, items are parsed while response is being received. \n
+        :param fields: keep only these keys of bookings, e.g. ("id",).
+        :return: bookings.
+        """
+        return self.stream_json("GET", f"{self.url}/tenant/", fields=fields)
+
+    def stream_bookings_for_owner(self, fields: tuple = None) -> Iterator[dict]:
+        """
+        GET /booking/owner/, items are parsed while response is being received. \n
+        :param fields: keep only these keys of bookings, e.g. ("id",).
+        :return: bookings.
+        """
+        return self.stream_json("GET", f"{self.url}/owner/", fields=fields)
+
+
+class AsyncBookingApi(AsyncBaseApi):
+    def __init__(self, config):
+        super().__init__(config=config)
+        self.headers = {
+            "Authorization": f"Bearer {self.config['token']}",
+            "Content-Type": "application/json",
+            "Connection": "keep-alive",
+            "Accept": "application/json",
+        }
+
+        self.url = self.config["url"] + "/booking"
+
+    @log
+    @track("booking")
+    async def create_booking(self, data: json) -> httpx.Response:
+        """
+        POST /booking/ \n
+        :param data: data for create booking.
+        :return: json data.
+        """
+        return await self.request("POST", f"{self.url}/", json=data)
+
+    @log
+    async def get_booking_tenant(self) -> httpx.Response:
+        """
+        GET /booking/tenant/ \n
+        :return: json data.
+        """
+        return await self.request("GET", f"{self.url}/tenant/")
+
+    @log
+    async def get_bookings_for_owner(self) -> httpx.Response:
+        """
+        GET /booking/owner/ \n
+        :return: json data.
+        """
+        return await self.request("GET", f"{self.url}/owner/")
+
+    @log
+    @untrack("booking")
+    async def delete_booking(self, id_: str) -> httpx.Response:
+        """
+        DELETE /booking/ \n
+        :param id_: booking id.
+        :return: json data.
+        """
+        return await self.request("DELETE", f"{self.url}/", params={"id": id_})
+
+    def stream_booking_tenant(self, fields: tuple = None) -> AsyncIterator[dict]:
+        """
+        GET /booking/tenant/, items are parsed while response is being received. \n
+        :param fields: keep only these keys of bookings, e.g. ("id",).
+        :return: bookings.
+        """
+        return self.stream_json("GET", f"{self.url}/tenant/", fields=fields)
+
+    def stream_bookings_for_owner(self, fields: tuple = None) -> AsyncIterator[dict]:
+        """
+        GET /booking/owner/, items are parsed while response is being received. \n
+        :param fields: keep only these keys of bookings, e.g. ("id",).
+        :return: bookings.
+        """
+        return self.stream_json("GET", f"{self.url}/owner/", fields=fields)
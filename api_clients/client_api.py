@@ -2,12 +2,14 @@ import json
 
 import httpx
 
+from api_clients.async_base_api import AsyncBaseApi
+from api_clients.base_api import BaseApi
 from utils.logger.log import log
 
 
-class ClientApi:
+class ClientApi(BaseApi):
     def __init__(self, config):
-        self.config = config
+        super().__init__(config=config)
         self.headers = {
             "Content-Type": "application/json",
             "Connection": "keep-alive",
@@ -22,7 +24,7 @@ class ClientApi:
         :param data: data for sign in.
         :return: json data.
         """
-        return httpx.put(f"{self.url}/sign-in/", headers=self.headers, json=data)
+        return self.request("PUT", f"{self.url}/sign-in/", json=data)
 
     @log
     def sign_up(self, data: json) -> httpx.Response:
@@ -31,7 +33,7 @@ class ClientApi:
         :param data: data for sign up.
         :return: json data.
         """
-        return httpx.post(f"{self.url}/sign-up/", headers=self.headers, json=data)
+        return self.request("POST", f"{self.url}/sign-up/", json=data)
 
     @log
     def logout(self, data: json) -> httpx.Response:
@@ -40,4 +42,42 @@ class ClientApi:
         :param data: data for sign up.
         :return: json data.
         """
-        return httpx.put(f"{self.url}/logout/", headers=self.headers, json=data)
+        return self.request("PUT", f"{self.url}/logout/", json=data)
+
+
+class AsyncClientApi(AsyncBaseApi):
+    def __init__(self, config):
+        super().__init__(config=config)
+        self.headers = {
+            "Content-Type": "application/json",
+            "Connection": "keep-alive",
+            "Accept": "application/json",
+        }
+        self.url = self.config["url"] + "/client"
+
+    @log
+    async def sign_in(self, data: json) -> httpx.Response:
+        """
+        POST /sign-in \n
+        :param data: data for sign in.
+        :return: json data.
+        """
+        return await self.request("PUT", f"{self.url}/sign-in/", json=data)
+
+    @log
+    async def sign_up(self, data: json) -> httpx.Response:
+        """
+        POST /sign-up \n
+        :param data: data for sign up.
+        :return: json data.
+        """
+        return await self.request("POST", f"{self.url}/sign-up/", json=data)
+
+    @log
+    async def logout(self, data: json) -> httpx.Response:
+        """
+        POST /sign-up \n
+        :param data: data for sign up.
+        :return: json data.
+        """
+        return await self.request("PUT", f"{self.url}/logout/", json=data)
@@ -0,0 +1,336 @@
+import asyncio
+import random
+import threading
+import time
+from typing import Awaitable, Callable
+from urllib.parse import urlsplit
+
+import httpx
+
+# requests per second per endpoint group, 0 - unlimited
+DEFAULT_RATE_LIMIT = 0.0
+DEFAULT_RATE_BURST = 10
+# requests per second of all endpoint groups together, 0 - unlimited, see load --request-rate
+DEFAULT_REQUEST_RATE = 0.0
+DEFAULT_RETRIES = 2
+DEFAULT_RETRY_BACKOFF = 0.2
+DEFAULT_RETRY_MAX_BACKOFF = 5.0
+# consecutive 5xx responses or transport errors which open the circuit, 0 - disabled:
+# functional tests must see every failure, load runs use LOAD_BREAKER_THRESHOLD
+DEFAULT_BREAKER_THRESHOLD = 0
+LOAD_BREAKER_THRESHOLD = 5
+DEFAULT_BREAKER_COOLDOWN = 10.0
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+COUNTERS = ("throttled", "retried", "short_circuited", "tripped")
+
+
+def endpoint_group(url: str, base_path: str) -> str:
+    """
+    First path segment of url after environment base path. \n
+    :param url: request url.
+    :param base_path: path of environment url, e.g. "/one-hour".
+    :return: e.g. "space".
+    """
+    path = urlsplit(str(url)).path
+    if path.startswith(base_path):
+        path = path[len(base_path) :]
+    return path.strip("/").split("/", 1)[0]
+
+
+class CircuitOpenError(Exception):
+    """Request is not sent because circuit of endpoint group is open."""
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter. \n
+    Tokens are taken in advance, so concurrent callers queue up for the next free slot.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        """
+        :param rate: tokens per second.
+        :param burst: bucket capacity.
+        """
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Take one token. \n
+        :return: seconds to wait before sending request.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            self.tokens -= 1
+            return -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker: opens after threshold consecutive failures, lets one probe through
+    after cooldown and closes again when the probe succeeds. Threshold 0 disables it.
+    """
+
+    def __init__(self, threshold: int, cooldown: float):
+        """
+        :param threshold: consecutive failures which open the circuit, 0 - never.
+        :param cooldown: seconds before probe request.
+        """
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> any:
+        """
+        Whether request may be sent. \n
+        :return: False - circuit is open, "probe" - request is the half-open probe, else True.
+        """
+        if self.threshold <= 0:
+            return True
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if self.probing or time.monotonic() - self.opened_at < self.cooldown:
+                return False
+            self.probing = True
+            return "probe"
+
+    def release(self, probe: bool):
+        """
+        Request let through by allow() ended without result, e.g. it was cancelled. \n
+        :param probe: request took the probe.
+        """
+        if probe:
+            with self._lock:
+                self.probing = False
+
+    def record(self, failed: bool, probe: bool = False) -> bool:
+        """
+        Record result of request. \n
+        :param failed: 5xx response or transport error.
+        :param probe: request took the probe.
+        :return: True when this failure opened the circuit.
+        """
+        if self.threshold <= 0:
+            return False
+        with self._lock:
+            if probe:
+                self.probing = False
+            elif self.opened_at is not None:
+                # request let through before the circuit opened, only the probe decides
+                return False
+            if not failed:
+                self.failures = 0
+                self.opened_at = None
+                return False
+            self.failures += 1
+            if self.opened_at is not None:
+                # failed probe, wait another cooldown
+                self.opened_at = time.monotonic()
+                return False
+            if self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+                return True
+            return False
+
+
+class RequestPolicy:
+    """
+    Rate limiting, retries and circuit breaking of one environment. \n
+    Limiter and breaker are kept per endpoint group (client, space, booking), so a struggling
+    endpoint does not block the others. Settings come from config, see DEFAULT_* constants.
+    """
+
+    _policies: dict = {}
+    _lock = threading.Lock()
+
+    def __init__(self, config):
+        self.base_path = urlsplit(config["url"]).path.rstrip("/")
+        self.rate_limit = float(config.get("rate_limit", DEFAULT_RATE_LIMIT))
+        self.rate_burst = int(config.get("rate_burst", DEFAULT_RATE_BURST))
+        self.request_rate = float(config.get("request_rate", DEFAULT_REQUEST_RATE))
+        # no burst, requests are paced evenly at request rate
+        self.request_bucket = TokenBucket(self.request_rate, 1) if self.request_rate > 0 else None
+        self.retries = int(config.get("retries", DEFAULT_RETRIES))
+        self.retry_backoff = float(config.get("retry_backoff", DEFAULT_RETRY_BACKOFF))
+        self.retry_max_backoff = float(config.get("retry_max_backoff", DEFAULT_RETRY_MAX_BACKOFF))
+        self.breaker_threshold = int(config.get("breaker_threshold", DEFAULT_BREAKER_THRESHOLD))
+        self.breaker_cooldown = float(config.get("breaker_cooldown", DEFAULT_BREAKER_COOLDOWN))
+        self.buckets = {}
+        self.breakers = {}
+        self.counters = {name: 0 for name in COUNTERS}
+        self.throttle_seconds = 0.0
+        self._counters_lock = threading.Lock()
+
+    @classmethod
+    def get(cls, config) -> "RequestPolicy":
+        """
+        Get policy of environment, create it on first use. \n
+        :param config: environment config.
+        :return: shared policy.
+        """
+        with cls._lock:
+            policy = cls._policies.get(config["url"])
+            if policy is None:
+                policy = cls._policies[config["url"]] = cls(config=config)
+            return policy
+
+    @classmethod
+    def reset(cls):
+        """Drop policies of all environments."""
+        with cls._lock:
+            cls._policies.clear()
+
+    @classmethod
+    def report(cls) -> str:
+        """
+        Counters of all environments. \n
+        :return: one line per environment with shaped calls.
+        """
+        with cls._lock:
+            policies = dict(cls._policies)
+        lines = []
+        for url, policy in policies.items():
+            if any(policy.counters.values()):
+                counters = ", ".join(f"{name}: {count}" for name, count in policy.counters.items())
+                lines.append(f"{url}: {counters}, throttle wait: {policy.throttle_seconds:.1f} s")
+        return "\n".join(lines)
+
+    def group(self, url: str) -> str:
+        """
+        Endpoint group of url. \n
+        :param url: request url.
+        :return: e.g. "space".
+        """
+        return endpoint_group(url, self.base_path)
+
+    def _count(self, name: str, seconds: float = 0.0):
+        with self._counters_lock:
+            self.counters[name] += 1
+            self.throttle_seconds += seconds
+
+    def acquire(self, group: str) -> tuple:
+        """
+        Check circuit and take rate limiter token of group. \n
+        :param group: endpoint group.
+        :return: seconds to wait before sending request, whether request is the half-open probe.
+        """
+        breaker = self.breakers.get(group)
+        if breaker is None:
+            breaker = self.breakers.setdefault(
+                group, CircuitBreaker(self.breaker_threshold, self.breaker_cooldown)
+            )
+        allowed = breaker.allow()
+        if not allowed:
+            self._count("short_circuited")
+            raise CircuitOpenError(f"Circuit of /{group}/ is open after repeated server errors!")
+        wait = 0.0
+        if self.rate_limit > 0:
+            bucket = self.buckets.get(group)
+            if bucket is None:
+                bucket = self.buckets.setdefault(
+                    group, TokenBucket(self.rate_limit, self.rate_burst)
+                )
+            wait = bucket.reserve()
+        if self.request_bucket is not None:
+            wait = max(wait, self.request_bucket.reserve())
+        if wait:
+            self._count("throttled", wait)
+        return wait, allowed == "probe"
+
+    def complete(
+        self, group: str, method: str, attempt: int, failed: bool, probe: bool = False
+    ) -> float:
+        """
+        Record result of request and decide on retry. \n
+        :param group: endpoint group.
+        :param method: http method.
+        :param attempt: number of retries already made.
+        :param failed: 5xx response or transport error.
+        :param probe: request was the half-open probe.
+        :return: seconds to wait before retry, None when request must not be repeated.
+        """
+        if self.breakers[group].record(failed, probe=probe):
+            self._count("tripped")
+        if not failed or method not in IDEMPOTENT_METHODS or attempt >= self.retries:
+            return None
+        self._count("retried")
+        # full jitter, so retries of concurrent users do not arrive together
+        return random.uniform(0, min(self.retry_max_backoff, self.retry_backoff * 2**attempt))
+
+    def send(self, method: str, url: str, send: Callable[[], httpx.Response]) -> httpx.Response:
+        """
+        Send request under policy. \n
+        :param method: http method.
+        :param url: request url.
+        :param send: function sending request.
+        :return: response.
+        """
+        group = self.group(url)
+        attempt = 0
+        while True:
+            wait, probe = self.acquire(group)
+            if wait:
+                time.sleep(wait)
+            try:
+                response, error = send(), None
+            except httpx.TransportError as e:
+                response, error = None, e
+            except BaseException:
+                # half-open probe must not stay taken when request is cancelled
+                self.breakers[group].release(probe)
+                raise
+            failed = error is not None or response.status_code >= 500
+            delay = self.complete(group, method, attempt, failed, probe=probe)
+            if delay is None:
+                if error is not None:
+                    raise error
+                return response
+            if response is not None:
+                response.close()
+            attempt += 1
+            time.sleep(delay)
+
+    async def asend(
+        self, method: str, url: str, send: Callable[[], Awaitable[httpx.Response]]
+    ) -> httpx.Response:
+        """
+        Send async request under policy. \n
+        :param method: http method.
+        :param url: request url.
+        :param send: coroutine function sending request.
+        :return: response.
+        """
+        group = self.group(url)
+        attempt = 0
+        while True:
+            wait, probe = self.acquire(group)
+            if wait:
+                await asyncio.sleep(wait)
+            try:
+                response, error = await send(), None
+            except httpx.TransportError as e:
+                response, error = None, e
+            except BaseException:
+                # half-open probe must not stay taken when request is cancelled
+                self.breakers[group].release(probe)
+                raise
+            failed = error is not None or response.status_code >= 500
+            delay = self.complete(group, method, attempt, failed, probe=probe)
+            if delay is None:
+                if error is not None:
+                    raise error
+                return response
+            if response is not None:
+                await response.aclose()
+            attempt += 1
+            await asyncio.sleep(delay)
@@ -0,0 +1,219 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Awaitable, Callable
+from urllib.parse import urlsplit
+
+import httpx
+
+from api_clients.policy import endpoint_group
+
+# seconds, 0 - cache is disabled
+DEFAULT_RESPONSE_CACHE_TTL = 0.0
+DEFAULT_RESPONSE_CACHE_SIZE = 256
+# writes of resource invalidate cached GETs of these prefixes too,
+# e.g. deleted space disappears from booking listings
+DEPENDENT_PREFIXES = {"space": ("space", "booking")}
+# requests with these headers are sent as is
+BYPASS_HEADERS = ("If-None-Match", "If-Modified-Since", "Cache-Control")
+COUNTERS = ("hits", "misses", "coalesced", "invalidations", "evictions")
+
+
+class ResponseCache:
+    """
+    Opt-in cache of successful GET responses of one environment. \n
+    Entries are keyed on url with params and token, evicted by TTL and LRU size
+    ("response_cache_ttl" and "response_cache_size" in config). Identical GETs in flight
+    are coalesced into one request. Any other method invalidates cached GETs of the same
+    resource prefix (first path segment, see DEPENDENT_PREFIXES).
+    Cached responses are shared between callers and must not be modified.
+    """
+
+    _caches: dict = {}
+    _lock = threading.Lock()
+
+    def __init__(self, config):
+        self.base_path = urlsplit(config["url"]).path.rstrip("/")
+        self.ttl = float(config.get("response_cache_ttl", DEFAULT_RESPONSE_CACHE_TTL))
+        self.size = int(config.get("response_cache_size", DEFAULT_RESPONSE_CACHE_SIZE))
+        self.entries = OrderedDict()
+        self.inflight = {}
+        self.generations = {}
+        self.counters = {name: 0 for name in COUNTERS}
+        self.bytes_saved = 0
+        self._entries_lock = threading.Lock()
+
+    @classmethod
+    def get(cls, config) -> "ResponseCache":
+        """
+        Get cache of environment, create it on first use. \n
+        :param config: environment config.
+        :return: shared cache, None when disabled by config.
+        """
+        if float(config.get("response_cache_ttl", DEFAULT_RESPONSE_CACHE_TTL)) <= 0:
+            return None
+        with cls._lock:
+            cache = cls._caches.get(config["url"])
+            if cache is None:
+                cache = cls._caches[config["url"]] = cls(config=config)
+            return cache
+
+    @classmethod
+    def reset(cls):
+        """Drop caches of all environments."""
+        with cls._lock:
+            cls._caches.clear()
+
+    @classmethod
+    def report(cls) -> str:
+        """
+        Hit ratio and saved bytes of all environments. \n
+        :return: one line per environment.
+        """
+        with cls._lock:
+            caches = dict(cls._caches)
+        lines = []
+        for url, cache in caches.items():
+            counters = cache.counters
+            lookups = counters["hits"] + counters["misses"] + counters["coalesced"]
+            if not lookups:
+                continue
+            ratio = (counters["hits"] + counters["coalesced"]) / lookups
+            lines.append(
+                f"{url}: hit ratio: {ratio:.1%}, "
+                + ", ".join(f"{name}: {count}" for name, count in counters.items())
+                + f", bytes saved: {cache.bytes_saved}"
+            )
+        return "\n".join(lines)
+
+    @staticmethod
+    def cacheable(method: str, headers: dict) -> bool:
+        """Whether request may be answered from cache."""
+        return method == "GET" and not any(header in headers for header in BYPASS_HEADERS)
+
+    @staticmethod
+    def key(url: str, params: dict, headers: dict) -> tuple:
+        """
+        Cache key of GET request. \n
+        :param url: request url.
+        :param params: query params.
+        :param headers: request headers, responses of different tokens are cached apart.
+        :return: key.
+        """
+        return str(httpx.URL(url, params=params)), headers.get("Authorization")
+
+    def _count(self, name: str, response: httpx.Response = None):
+        with self._entries_lock:
+            self.counters[name] += 1
+            if response is not None:
+                self.bytes_saved += len(response.content)
+
+    def _lookup(self, key: tuple, group: str) -> tuple:
+        """
+        Cached response or in-flight request of key. \n
+        :return: (response, future, generation), future is None when caller has to send request.
+        """
+        with self._entries_lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                expires_at, response = entry
+                if time.monotonic() < expires_at:
+                    self.entries.move_to_end(key)
+                    return response, None, None
+                del self.entries[key]
+            future = self.inflight.get(key)
+            if future is not None:
+                return None, future, None
+            self.inflight[key] = Future()
+            return None, None, self.generations.get(group, 0)
+
+    def _complete(self, key: tuple, group: str, generation: int, response, error=None):
+        with self._entries_lock:
+            future = self.inflight.pop(key)
+            # response of request started before a write is not stored, neither is
+            # response of request repeated with refreshed token, key has the stale one
+            if error is None and response.status_code == 200:
+                token = response.request.headers.get("Authorization")
+                if self.generations.get(group, 0) == generation and token == key[1]:
+                    self.entries[key] = (time.monotonic() + self.ttl, response)
+                    self.entries.move_to_end(key)
+                    while len(self.entries) > self.size:
+                        self.entries.popitem(last=False)
+                        self.counters["evictions"] += 1
+        if error is None:
+            future.set_result(response)
+        else:
+            future.set_exception(error)
+
+    def invalidate(self, url: str):
+        """
+        Drop cached GETs of resource prefix of url. \n
+        :param url: url of write request.
+        """
+        group = endpoint_group(url, self.base_path)
+        prefixes = DEPENDENT_PREFIXES.get(group, (group,))
+        with self._entries_lock:
+            for prefix in prefixes:
+                self.generations[prefix] = self.generations.get(prefix, 0) + 1
+            stale = [
+                key for key in self.entries if endpoint_group(key[0], self.base_path) in prefixes
+            ]
+            for key in stale:
+                del self.entries[key]
+            self.counters["invalidations"] += len(stale)
+
+    def fetch(self, key: tuple, url: str, send: Callable[[], httpx.Response]) -> httpx.Response:
+        """
+        Cached response, response of identical request in flight or new response. \n
+        :param key: cache key.
+        :param url: request url.
+        :param send: function sending request.
+        :return: response.
+        """
+        group = endpoint_group(url, self.base_path)
+        response, future, generation = self._lookup(key, group)
+        if response is not None:
+            self._count("hits", response)
+            return response
+        if future is not None:
+            response = future.result()
+            self._count("coalesced", response)
+            return response
+        self._count("misses")
+        try:
+            response = send()
+        except BaseException as e:
+            self._complete(key, group, generation, None, error=e)
+            raise
+        self._complete(key, group, generation, response)
+        return response
+
+    async def afetch(
+        self, key: tuple, url: str, send: Callable[[], Awaitable[httpx.Response]]
+    ) -> httpx.Response:
+        """
+        Cached response, response of identical request in flight or new response. \n
+        :param key: cache key.
+        :param url: request url.
+        :param send: coroutine function sending request.
+        :return: response.
+        """
+        group = endpoint_group(url, self.base_path)
+        response, future, generation = self._lookup(key, group)
+        if response is not None:
+            self._count("hits", response)
+            return response
+        if future is not None:
+            response = await asyncio.wrap_future(future)
+            self._count("coalesced", response)
+            return response
+        self._count("misses")
+        try:
+            response = await send()
+        except BaseException as e:
+            self._complete(key, group, generation, None, error=e)
+            raise
+        self._complete(key, group, generation, response)
+        return response
@@ -1,13 +1,18 @@
+import functools
 import json
+from typing import AsyncIterator, Iterator
 
 import httpx
 
+from api_clients.async_base_api import AsyncBaseApi
+from api_clients.base_api import DEFAULT_PAGE_SIZE, BaseApi
 from utils.logger.log import log
+from utils.resource_registry import track, untrack
 
 
-class SpaceApi:
+class SpaceApi(BaseApi):
     def __init__(self, config):
-        self.config = config
+        super().__init__(config=config)
         self.headers = {
             "Authorization": f"Bearer {self.config['token']}",
             "Content-Type": "application/json",
@@ -45,39 +50,43 @@ class SpaceApi:
         }
         params = {key: value for key, value in params.items() if value}
 
-        resp = httpx.get(
+        resp = self.request(
+            "GET",
             f"{self.url}/",
-            headers=self.headers,
             params=params,
         )
 
         return resp
 
     @log
-    def get_space_filter(self) -> httpx.Response:
+    def get_space_filter(self, etag: str = None) -> httpx.Response:
         """
         GET /space/filter/ \n
+        :param etag: ETag of cached catalog, server answers 304 when it is unchanged.
         :return: json data.
         """
-        return httpx.get(f"{self.url}/filter/", headers=self.headers)
+        headers = {"If-None-Match": etag} if etag else {}
+        return self.request("GET", f"{self.url}/filter/", headers=headers)
 
     @log
+    @track("space")
     def create_space(self, data: json) -> httpx.Response:
         """
         POST /space/ \n
         :param data: data for create space.
         :return: json data.
         """
-        return httpx.post(f"{self.url}/", headers=self.headers, json=data)
+        return self.request("POST", f"{self.url}/", json=data)
 
     @log
+    @untrack("space")
     def delete_space(self, id_: str) -> httpx.Response:
         """
         DELETE /space/ \n
         :param id_: space id.
         :return: json data.
         """
-        return httpx.delete(f"{self.url}/", headers=self.headers, params={"id": id_})
+        return self.request("DELETE", f"{self.url}/", params={"id": id_})
 
     @log
     def get_space_owner(self, limit: int = None, offset: int = None) -> httpx.Response:
@@ -88,4 +97,216 @@ class SpaceApi:
         params = {"limit": limit, "offset": offset}
         params = {key: value for key, value in params.items() if value}
 
-        return httpx.get(f"{self.url}/owner/", headers=self.headers, params=params)
+        return self.request("GET", f"{self.url}/owner/", params=params)
+
+    def iter_spaces(
+        self,
+        available_from: str = None,
+        available_to: str = None,
+        city: str = None,
+        type_: str = None,
+        country: str = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> Iterator[dict]:
+        """
+        All spaces matching filters, GET /space/ page by page. \n
+        :param page_size: spaces per request.
+        :return: spaces.
+        """
+        fetch = functools.partial(
+            self.get_space,
+            available_from=available_from,
+            available_to=available_to,
+            city=city,
+            type_=type_,
+            country=country,
+        )
+        return self.paginate(fetch, page_size)
+
+    def iter_owner_spaces(self, page_size: int = DEFAULT_PAGE_SIZE) -> Iterator[dict]:
+        """
+        All spaces of owner, GET /space/owner/ page by page. \n
+        :param page_size: spaces per request.
+        :return: spaces.
+        """
+        return self.paginate(self.get_space_owner, page_size)
+
+    def stream_spaces(
+        self,
+        available_from: str = None,
+        available_to: str = None,
+        city: str = None,
+        type_: str = None,
+        country: str = None,
+        limit: int = None,
+        offset: int = None,
+        fields: tuple = None,
+    ) -> Iterator[dict]:
+        """
+        GET /space/, items are parsed while response is being received. \n
+        :param fields: keep only these keys of spaces, e.g. ("id",).
+        :return: spaces.
+        """
+        params = {
+            "available_from": available_from,
+            "available_to": available_to,
+            "city": city,
+            "type": type_,
+            "country": country,
+            "limit": limit,
+            "offset": offset,
+        }
+        params = {key: value for key, value in params.items() if value}
+
+        return self.stream_json("GET", f"{self.url}/", params=params, fields=fields)
+
+
+class AsyncSpaceApi(AsyncBaseApi):
+    def __init__(self, config):
+        super().__init__(config=config)
+        self.headers = {
+            "Authorization": f"Bearer {self.config['token']}",
+            "Content-Type": "application/json",
+            "Connection": "keep-alive",
+            "Accept": "application/json",
+        }
+
+        self.url = self.config["url"] + "/space"
+
+    @log
+    async def get_space(
+        self,
+        id_: str = None,
+        available_from: str = None,
+        available_to: str = None,
+        city: str = None,
+        type_: str = None,
+        country: str = None,
+        limit: int = None,
+        offset: int = None,
+    ) -> httpx.Response:
+        """
+        GET /space/ \n
+        :return: json data.
+        """
+        params = {
+            "id": id_,
+            "available_from": available_from,
+            "available_to": available_to,
+            "city": city,
+            "type": type_,
+            "country": country,
+            "limit": limit,
+            "offset": offset,
+        }
+        params = {key: value for key, value in params.items() if value}
+
+        resp = await self.request(
+            "GET",
+            f"{self.url}/",
+            params=params,
+        )
+
+        return resp
+
+    @log
+    async def get_space_filter(self, etag: str = None) -> httpx.Response:
+        """
+        GET /space/filter/ \n
+        :param etag: ETag of cached catalog, server answers 304 when it is unchanged.
+        :return: json data.
+        """
+        headers = {"If-None-Match": etag} if etag else {}
+        return await self.request("GET", f"{self.url}/filter/", headers=headers)
+
+    @log
+    @track("space")
+    async def create_space(self, data: json) -> httpx.Response:
+        """
+        POST /space/ \n
+        :param data: data for create space.
+        :return: json data.
+        """
+        return await self.request("POST", f"{self.url}/", json=data)
+
+    @log
+    @untrack("space")
+    async def delete_space(self, id_: str) -> httpx.Response:
+        """
+        DELETE /space/ \n
+        :param id_: space id.
+        :return: json data.
+        """
+        return await self.request("DELETE", f"{self.url}/", params={"id": id_})
+
+    @log
+    async def get_space_owner(self, limit: int = None, offset: int = None) -> httpx.Response:
+        """
+        GET /space/owner \n
+        :return: json data.
+        """
+        params = {"limit": limit, "offset": offset}
+        params = {key: value for key, value in params.items() if value}
+
+        return await self.request("GET", f"{self.url}/owner/", params=params)
+
+    def iter_spaces(
+        self,
+        available_from: str = None,
+        available_to: str = None,
+        city: str = None,
+        type_: str = None,
+        country: str = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> AsyncIterator[dict]:
+        """
+        All spaces matching filters, GET /space/ page by page. \n
+        :param page_size: spaces per request.
+        :return: spaces.
+        """
+        fetch = functools.partial(
+            self.get_space,
+            available_from=available_from,
+            available_to=available_to,
+            city=city,
+            type_=type_,
+            country=country,
+        )
+        return self.paginate(fetch, page_size)
+
+    def iter_owner_spaces(self, page_size: int = DEFAULT_PAGE_SIZE) -> AsyncIterator[dict]:
+        """
+        All spaces of owner, GET /space/owner/ page by page. \n
+        :param page_size: spaces per request.
+        :return: spaces.
+        """
+        return self.paginate(self.get_space_owner, page_size)
+
+    def stream_spaces(
+        self,
+        available_from: str = None,
+        available_to: str = None,
+        city: str = None,
+        type_: str = None,
+        country: str = None,
+        limit: int = None,
+        offset: int = None,
+        fields: tuple = None,
+    ) -> AsyncIterator[dict]:
+        """
+        GET /space/, items are parsed while response is being received. \n
+        :param fields: keep only these keys of spaces, e.g. ("id",).
+        :return: spaces.
+        """
+        params = {
+            "available_from": available_from,
+            "available_to": available_to,
+            "city": city,
+            "type": type_,
+            "country": country,
+            "limit": limit,
+            "offset": offset,
+        }
+        params = {key: value for key, value in params.items() if value}
+
+        return self.stream_json("GET", f"{self.url}/", params=params, fields=fields)
@@ -0,0 +1,61 @@
+import threading
+import time
+
+from api_clients.space_api import SpaceApi
+
+DEFAULT_FILTER_TTL = 300.0
+
+
+class SpaceFilterCache:
+    """
+    Session-wide cache of GET /space/filter/ per environment. \n
+    Entry is served from memory while younger than TTL ("filter_ttl" in config), then
+    revalidated with If-None-Match, so unchanged catalog costs a 304 without body.
+    """
+
+    _entries: dict = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls, config) -> dict:
+        """
+        Get space filter catalog. \n
+        :param config: environment config with token.
+        :return: json data of GET /space/filter/.
+        """
+        with cls._lock:
+            entry = cls._entries.get(config["url"])
+            ttl = float(config.get("filter_ttl", DEFAULT_FILTER_TTL))
+            if entry is not None and time.monotonic() - entry["fetched_at"] < ttl:
+                return entry["data"]
+
+            response = SpaceApi(config=config).get_space_filter(
+                etag=entry["etag"] if entry is not None else None
+            )
+            if response is None:
+                raise Exception("Unable to get space filter!")
+            if response.status_code == 304 and entry is not None:
+                entry["fetched_at"] = time.monotonic()
+                return entry["data"]
+            if response.status_code != 200:
+                raise Exception(f"Unable to get space filter: {response.status_code}!")
+
+            entry = {
+                "data": response.json(),
+                "etag": response.headers.get("ETag"),
+                "fetched_at": time.monotonic(),
+            }
+            cls._entries[config["url"]] = entry
+            return entry["data"]
+
+    @classmethod
+    def invalidate(cls, config=None):
+        """
+        Drop cached catalog. \n
+        :param config: environment config, all environments when None.
+        """
+        with cls._lock:
+            if config is None:
+                cls._entries.clear()
+            else:
+                cls._entries.pop(config["url"], None)
@@ -0,0 +1,79 @@
+"""
+Startup time of pytest --collect-only and import times of the harness from -X importtime. \n
+Exit code is 1 when startup exceeds the budget.
+python -m benchmarks.importtime --budget-ms 2000
+python -m benchmarks.importtime --top 30 -- --fake-api
+"""
+
+import argparse
+import subprocess
+import sys
+import time
+
+DEFAULT_BUDGET_MS = 2000.0
+DEFAULT_TOP = 15
+PROJECT_PACKAGES = ("api_clients", "utils", "factories", "fake_api", "tests", "conftest")
+
+
+def run(arguments: list) -> tuple:
+    """
+    Run python with -X importtime. \n
+    :param arguments: python arguments.
+    :return: wall time in ms, dict module to (self us, cumulative us).
+    """
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", *arguments], capture_output=True, text=True
+    )
+    wall = (time.perf_counter() - start) * 1000
+    if completed.returncode != 0:
+        raise Exception(f"{' '.join(arguments)} failed:\n{completed.stdout}{completed.stderr}")
+    modules = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return wall, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=DEFAULT_BUDGET_MS,
+        help="Allowed startup of pytest --collect-only: default 2000",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs, best is kept")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, help="Slowest imports to print")
+    parser.add_argument("pytest_args", nargs="*", help="Extra pytest arguments after --")
+    args = parser.parse_args()
+
+    # modules imported by pytest assertion rewriting are not reported, so import graph
+    # of the harness is measured by importing conftest directly
+    _, modules = min(
+        (run(["-c", "import conftest"]) for _ in range(args.repeat)), key=lambda r: r[0]
+    )
+    print(f"{'module':<50}{'self ms':>10}{'cumulative ms':>15}")
+    slowest = sorted(modules.items(), key=lambda item: -item[1][1])[: args.top]
+    for name, (self_us, cumulative_us) in slowest:
+        print(f"{name:<50}{self_us / 1000:>10.1f}{cumulative_us / 1000:>15.1f}")
+    project = sum(
+        self_us for name, (self_us, _) in modules.items() if name.split(".")[0] in PROJECT_PACKAGES
+    )
+    print()
+    print(f"project modules self time: {project / 1000:.1f} ms")
+
+    command = ["-m", "pytest", "--collect-only", "-q", "-p", "no:cacheprovider", *args.pytest_args]
+    wall = min(run(command)[0] for _ in range(args.repeat))
+    print(f"pytest --collect-only: {wall:.0f} ms, budget: {args.budget_ms:.0f} ms")
+    if wall > args.budget_ms:
+        print("Startup is over budget!")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
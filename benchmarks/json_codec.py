@@ -0,0 +1,101 @@
+"""
+Encode and decode throughput of JSON backends on space and booking payloads. \n
+python -m benchmarks.json_codec -n 20000 --items 200
+"""
+
+import argparse
+import json
+import time
+import uuid
+
+from factories.booking_factory import BookingFactory
+from utils import json_codec
+
+
+def space(number: int) -> dict:
+    """
+    Space like SpaceFactory().default_data and GET /space/ items. \n
+    :param number: space number.
+    :return: space.
+    """
+    guid = str(uuid.uuid4())
+    return {
+        "name": f"Autotest_space_{guid[:6]}",
+        "type": "office",
+        "city": f"Autotest_city_{guid[:6]}",
+        "country": f"Autotest_count_{guid[:6]}",
+        "address": f"Autotest_address_{guid[:6]}",
+        "area": number % 90 + 1,
+        "price": number % 90 + 2,
+        "available_from": "2020-01-01T01:01:01.001Z",
+        "available_to": "2030-01-01T01:01:01.001Z",
+        "short_description": f"Autotest_short_desc_{guid[:6]}",
+        "detailed_description": f"Autotest_detail_desc_{guid[:6]}",
+        "image_urls": ["https://www.neptunus.co.uk/wp-content/uploads/2018/08/showroom.jpg"],
+        "id": guid,
+        "lat": str(number % 90),
+        "lng": str(number % 90),
+    }
+
+
+def booking(number: int) -> dict:
+    """
+    Booking like GET /booking/owner/ items. \n
+    :param number: booking number.
+    :return: booking.
+    """
+    data = BookingFactory().default_data
+    return {**data, "id": str(uuid.uuid4()), "cost": number % 50 + 1, "status": "created"}
+
+
+def backends() -> dict:
+    """
+    Installed backends. \n
+    :return: name to (dumps, loads).
+    """
+    result = {"stdlib": (json_codec._stdlib_dumps, json.loads)}
+    if json_codec.orjson is not None:
+        result["orjson"] = (json_codec.orjson.dumps, json_codec.orjson.loads)
+    if json_codec.msgspec is not None:
+        decoder = json_codec.msgspec.json.Decoder()
+        result["msgspec"] = (json_codec.msgspec.json.Encoder().encode, decoder.decode)
+    return result
+
+
+def per_op_us(func, arg, number: int) -> float:
+    start = time.perf_counter()
+    for _ in range(number):
+        func(arg)
+    return (time.perf_counter() - start) / number * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("-n", "--number", type=int, default=20000, help="Operations per payload")
+    parser.add_argument("--items", type=int, default=200, help="Items in listing payloads")
+    args = parser.parse_args()
+
+    payloads = {
+        "space": space(0),
+        "booking": booking(0),
+        f"spaces[{args.items}]": [space(i) for i in range(args.items)],
+        f"bookings[{args.items}]": [booking(i) for i in range(args.items)],
+    }
+    print(f"default backend: {json_codec.BACKEND}")
+    for payload_name, payload in payloads.items():
+        number = args.number if isinstance(payload, dict) else max(args.number // args.items, 10)
+        for name, (dumps, loads) in backends().items():
+            body = dumps(payload)
+            encode = per_op_us(dumps, payload, number)
+            decode = per_op_us(loads, body, number)
+            print(
+                f"{payload_name:<15} {name:<8} encode: {encode:9.2f} us  "
+                f"decode: {decode:9.2f} us  "
+                f"throughput: {len(body) / decode:8.1f} MB/s decode"
+            )
+
+
+if __name__ == "__main__":
+    main()
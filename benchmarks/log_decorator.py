@@ -0,0 +1,80 @@
+"""
+Per-call overhead of the log decorator at each log level. \n
+python -m benchmarks.log_decorator -n 20000 --items 500
+"""
+
+import argparse
+import datetime
+import json
+import logging
+import os
+import time
+
+import httpx
+
+from utils.logger.log import log, logger, setup_logging
+
+
+def listing_response(items: int) -> httpx.Response:
+    """
+    Listing response like GET /booking/owner/ with given number of items. \n
+    :param items: number of items.
+    :return: response.
+    """
+    body = [
+        {"id": f"{number:08d}", "space_id": f"{number:08d}", "contact": "+79999000000", "cost": 10}
+        for number in range(items)
+    ]
+    response = httpx.Response(
+        200,
+        content=json.dumps(body).encode(),
+        request=httpx.Request("GET", "http://0.0.0.0:8080/booking/owner/"),
+    )
+    response.elapsed = datetime.timedelta(milliseconds=5)
+    return response
+
+
+class StubApi:
+    def __init__(self, response: httpx.Response):
+        self.config = {"url": "http://0.0.0.0:8080"}
+        self.response = response
+
+    def get_bookings_for_owner(self, limit: int = None) -> httpx.Response:
+        return self.response
+
+    logged_get_bookings_for_owner = log(get_bookings_for_owner)
+
+
+def per_call_us(func, number: int) -> float:
+    start = time.perf_counter()
+    for _ in range(number):
+        func(limit=10)
+    return (time.perf_counter() - start) / number * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("-n", "--number", type=int, default=20000, help="Calls per level")
+    parser.add_argument("--items", type=int, default=500, help="Items in listing response")
+    args = parser.parse_args()
+
+    setup_logging()
+    with open(os.devnull, "w") as devnull:
+        for handler in logger.handlers:
+            if isinstance(handler, logging.StreamHandler):
+                handler.setStream(devnull)
+
+        api = StubApi(listing_response(args.items))
+        bare = per_call_us(api.get_bookings_for_owner, args.number)
+        print(f"{'level':<10}{'us/call':>10}{'overhead us':>14}")
+        print(f"{'bare':<10}{bare:>10.2f}{0:>14.2f}")
+        for level in ["CRITICAL", "WARNING", "INFO", "DEBUG"]:
+            logger.setLevel(level)
+            logged = per_call_us(api.logged_get_bookings_for_owner, args.number)
+            print(f"{level:<10}{logged:>10.2f}{logged - bare:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Compare response.json() with streaming parsing of a large listing. \n
+python -m benchmarks.streaming -n 100000
+"""
+import argparse
+import json
+import time
+import tracemalloc
+
+import httpx
+
+from utils.json_stream import iter_json_array
+
+CHUNK_SIZE = 64 * 1024
+
+
+def listing(number: int) -> bytes:
+    """
+    Synthetic GET /space/ response body. \n
+    :param number: number of spaces.
+    :return: JSON array.
+    """
+    spaces = [
+        {
+            "id": i,
+            "title": f"autotest space {i}",
+            "description": "Space for autotests " * 5,
+            "type": "office",
+            "price": 1000 + i % 100,
+            "country": "Russia",
+            "city": "Moscow",
+            "address": f"Street {i}",
+            "available_from": "2024-01-01T10:00:00",
+            "available_to": "2024-12-31T18:00:00",
+        }
+        for i in range(number)
+    ]
+    return json.dumps(spaces).encode()
+
+
+def transport(body: bytes) -> httpx.MockTransport:
+    """
+    Transport answering every request with body sent in chunks. \n
+    :param body: response body.
+    :return: transport.
+    """
+
+    def chunks():
+        for i in range(0, len(body), CHUNK_SIZE):
+            yield body[i : i + CHUNK_SIZE]
+
+    return httpx.MockTransport(lambda request: httpx.Response(200, content=chunks()))
+
+
+def measure(consume, client: httpx.Client) -> tuple:
+    """
+    Run consume and collect time to first item, total time and peak memory. \n
+    :param consume: function returning iterator over items.
+    :param client: httpx client.
+    :return: first item ms, total ms, peak MiB, items.
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    first = None
+    count = 0
+    for _ in consume(client):
+        if first is None:
+            first = (time.perf_counter() - start) * 1000
+        count += 1
+    total = (time.perf_counter() - start) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return first, total, peak / 2**20, count
+
+
+def buffered(client: httpx.Client):
+    return iter(client.get("http://bench/space/").json())
+
+
+def streamed(client: httpx.Client, fields: tuple = None):
+    with client.stream("GET", "http://bench/space/") as response:
+        yield from iter_json_array(response.iter_bytes(), fields=fields)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--number", type=int, default=100000, help="Spaces in listing")
+    args = parser.parse_args()
+
+    body = listing(args.number)
+    client = httpx.Client(transport=transport(body))
+    print(f"listing: {args.number} spaces, {len(body) / 2**20:.1f} MiB")
+    for name, consume in (
+        ("json()", buffered),
+        ("stream", streamed),
+        ("stream id", lambda c: streamed(c, fields=("id",))),
+    ):
+        first, total, peak, count = measure(consume, client)
+        print(
+            f"{name:<10} first item: {first:8.1f} ms  total: {total:8.1f} ms  "
+            f"peak memory: {peak:7.1f} MiB  items: {count}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Local stub of one-hour API answering every endpoint with a canned response. \n
+Unlike fake_api it keeps no state, so only client-side cost is measured.
+"""
+
+import httpx
+
+from utils import json_codec
+
+STUB_URL = "http://stub.one-hour/one-hour"
+SPACE_ID = "00000000-0000-0000-0000-000000000001"
+BOOKING_ID = "00000000-0000-0000-0000-000000000002"
+
+
+def stub_config() -> dict:
+    """
+    Config of environment served by stub transport. \n
+    :return: config.
+    """
+    return {
+        "url": STUB_URL,
+        "phone": "+79990000000",
+        "password": "Aboba322228",
+        "token": "stub-token",
+    }
+
+
+def space(number: int) -> dict:
+    return {
+        "id": f"{number:08d}-0000-0000-0000-000000000000",
+        "name": f"Autotest_space_{number:06d}",
+        "type": "office",
+        "city": "Autotest_city",
+        "country": "Autotest_count",
+        "address": f"Autotest_address_{number:06d}",
+        "area": number % 90 + 1,
+        "price": number % 90 + 2,
+        "available_from": "2020-01-01T01:01:01.001Z",
+        "available_to": "2030-01-01T01:01:01.001Z",
+    }
+
+
+def booking(number: int) -> dict:
+    return {
+        "id": f"{number:08d}-0000-0000-0000-000000000000",
+        "space_id": SPACE_ID,
+        "datetime_from": "2030-01-01T10:00:00+00:00",
+        "datetime_to": "2030-01-01T11:00:00+00:00",
+        "cost": 10,
+        "status": "created",
+    }
+
+
+class StubTransport(httpx.BaseTransport):
+    """
+    Transport returning pre-encoded responses by method and path. \n
+    :param items: items in listing responses.
+    """
+
+    def __init__(self, items: int = 20):
+        listing_spaces = json_codec.dumps([space(number) for number in range(items)])
+        listing_bookings = json_codec.dumps([booking(number) for number in range(items)])
+        deleted = json_codec.dumps({"detail": "Successfully deleted"})
+        self.routes = {
+            ("PUT", "/client/sign-in/"): json_codec.dumps({"token": "stub-token"}),
+            ("POST", "/client/sign-up/"): json_codec.dumps({"token": "stub-token"}),
+            ("PUT", "/client/logout/"): json_codec.dumps({"detail": "Successfully logout"}),
+            ("GET", "/space/"): listing_spaces,
+            ("POST", "/space/"): json_codec.dumps(space(0) | {"id": SPACE_ID}),
+            ("DELETE", "/space/"): deleted,
+            ("GET", "/space/owner/"): listing_spaces,
+            ("GET", "/space/filter/"): json_codec.dumps(
+                {"types": ["office", "flat"], "cities": ["Autotest_city"]}
+            ),
+            ("POST", "/booking/"): json_codec.dumps(booking(0) | {"id": BOOKING_ID}),
+            ("GET", "/booking/tenant/"): listing_bookings,
+            ("GET", "/booking/owner/"): listing_bookings,
+            ("DELETE", "/booking/"): deleted,
+        }
+        self.prefix = httpx.URL(STUB_URL).path.rstrip("/")
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.read()
+        path = request.url.path[len(self.prefix) :]
+        body = self.routes.get((request.method, path))
+        if body is None:
+            return httpx.Response(404, content=b'{"detail":"Not Found"}', request=request)
+        return httpx.Response(
+            200, content=body, headers={"Content-Type": "application/json"}, request=request
+        )
@@ -0,0 +1,205 @@
+"""
+Client-side overhead of api_clients, factories and the log decorator against a local stub. \n
+Results are compared with baseline JSON, exit code is 1 when a metric regresses.
+python -m benchmarks.suite --baseline benchmarks/baseline.json --threshold 0.2
+python -m benchmarks.suite --save - write current results as new baseline.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import time
+
+from api_clients.base_api import BaseApi
+from api_clients.booking_api import BookingApi
+from api_clients.client_api import ClientApi
+from api_clients.space_api import SpaceApi
+from benchmarks.log_decorator import StubApi, listing_response
+from benchmarks.stub import BOOKING_ID, SPACE_ID, StubTransport, stub_config
+from factories.booking_factory import BookingFactory
+from factories.client_config_factory import ClientConfigFactory
+from factories.client_factory import ClientFactory
+from factories.space_factory import SpaceFactory
+from utils.logger.log import logger, setup_logging
+from utils.resource_registry import resources
+
+DEFAULT_BASELINE = "benchmarks/baseline.json"
+DEFAULT_THRESHOLD = 0.2
+# smaller differences are noise of timer and scheduler
+DEFAULT_MIN_DELTA_US = 1.0
+LOG_LEVELS = ["CRITICAL", "WARNING", "INFO", "DEBUG"]
+
+
+def measure(func, number: int, repeat: int) -> float:
+    """
+    Best per-call time of several rounds. \n
+    :param func: function without arguments.
+    :param number: calls per round.
+    :param repeat: number of rounds.
+    :return: microseconds per call.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best * 1_000_000
+
+
+def api_calls(config) -> dict:
+    """
+    Every API client method with valid arguments. \n
+    :param config: stub config.
+    :return: metric name to call.
+    """
+    booking_api = BookingApi(config=config)
+    space_api = SpaceApi(config=config)
+    client_api = ClientApi(config=config)
+    booking = BookingFactory(space_id=SPACE_ID).default_data
+    space = SpaceFactory(config=config).default_data
+    client = ClientFactory().default_data
+    sign_in = ClientConfigFactory(config=config).default_data
+    return {
+        "api.BookingApi.create_booking": lambda: booking_api.create_booking(data=booking),
+        "api.BookingApi.get_booking_tenant": booking_api.get_booking_tenant,
+        "api.BookingApi.get_bookings_for_owner": booking_api.get_bookings_for_owner,
+        "api.BookingApi.delete_booking": lambda: booking_api.delete_booking(id_=BOOKING_ID),
+        "api.SpaceApi.get_space": lambda: space_api.get_space(city="Autotest_city"),
+        "api.SpaceApi.get_space_filter": space_api.get_space_filter,
+        "api.SpaceApi.create_space": lambda: space_api.create_space(data=space),
+        "api.SpaceApi.delete_space": lambda: space_api.delete_space(id_=SPACE_ID),
+        "api.SpaceApi.get_space_owner": space_api.get_space_owner,
+        "api.ClientApi.sign_in": lambda: client_api.sign_in(data=sign_in),
+        "api.ClientApi.sign_up": lambda: client_api.sign_up(data=client),
+        "api.ClientApi.logout": lambda: client_api.logout(data=sign_in),
+    }
+
+
+def factories(config) -> dict:
+    """
+    Construction of every factory. \n
+    :param config: stub config.
+    :return: metric name to call.
+    """
+    return {
+        "factory.BookingFactory": lambda: BookingFactory(space_id=SPACE_ID),
+        "factory.SpaceFactory": lambda: SpaceFactory(config=config),
+        "factory.ClientFactory": ClientFactory,
+        "factory.ClientConfigFactory": lambda: ClientConfigFactory(config=config),
+    }
+
+
+def run(number: int, repeat: int, items: int) -> dict:
+    """
+    Collect all metrics. \n
+    :param number: calls per round.
+    :param repeat: rounds per metric.
+    :param items: items in listing responses.
+    :return: metric name to microseconds per call.
+    """
+    BaseApi.transport = StubTransport(items=items)
+    config = stub_config()
+    level = logger.level
+    results = {}
+    try:
+        logger.setLevel("INFO")
+        for name, func in {**api_calls(config), **factories(config)}.items():
+            results[name] = measure(func, number, repeat)
+
+        api = StubApi(listing_response(items))
+        bare = measure(lambda: api.get_bookings_for_owner(limit=10), number, repeat)
+        for log_level in LOG_LEVELS:
+            logger.setLevel(log_level)
+            logged = measure(lambda: api.logged_get_bookings_for_owner(limit=10), number, repeat)
+            results[f"log.{log_level}"] = max(logged - bare, 0.0)
+    finally:
+        logger.setLevel(level)
+        BaseApi.transport = None
+        # nothing was created, stub ids must not reach cleanup
+        resources.resources.clear()
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float, min_delta: float) -> list:
+    """
+    Metrics slower than baseline by more than threshold. \n
+    :param results: current metrics.
+    :param baseline: baseline metrics.
+    :param threshold: allowed relative slowdown, 0.2 is 20%.
+    :param min_delta: allowed absolute slowdown in microseconds.
+    :return: regressed metric names.
+    """
+    regressions = []
+    for name, value in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if value > base * (1 + threshold) and value - base > min_delta:
+            regressions.append(name)
+    return regressions
+
+
+def report(results: dict, baseline: dict, regressions: list):
+    print(f"{'metric':<40}{'us/call':>12}{'baseline':>12}{'change':>10}")
+    for name, value in results.items():
+        base = baseline.get(name)
+        change = f"{(value - base) / base * 100:+.1f}%" if base else "new"
+        mark = "  REGRESSION" if name in regressions else ""
+        base_text = f"{base:.2f}" if base is not None else "-"
+        print(f"{name:<40}{value:>12.2f}{base_text:>12}{change:>10}{mark}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("-n", "--number", type=int, default=500, help="Calls per round")
+    parser.add_argument("--repeat", type=int, default=5, help="Rounds per metric, best is kept")
+    parser.add_argument("--items", type=int, default=20, help="Items in listing responses")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Allowed relative slowdown: default 0.2",
+    )
+    parser.add_argument(
+        "--min-delta",
+        type=float,
+        default=DEFAULT_MIN_DELTA_US,
+        help="Allowed absolute slowdown in microseconds: default 1.0",
+    )
+    parser.add_argument("--save", action="store_true", help="Write results as new baseline")
+    args = parser.parse_args()
+
+    setup_logging()
+    with open(os.devnull, "w") as devnull:
+        for handler in logger.handlers:
+            if isinstance(handler, logging.StreamHandler):
+                handler.setStream(devnull)
+        logging.getLogger("httpx").setLevel("WARNING")
+        results = run(args.number, args.repeat, args.items)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)["metrics"]
+
+    regressions = [] if args.save else compare(results, baseline, args.threshold, args.min_delta)
+    report(results, baseline, regressions)
+
+    if args.save or not baseline:
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump({"python": platform.python_version(), "metrics": results}, file, indent=2)
+        print(f"baseline saved to {args.baseline}")
+    if regressions:
+        print(f"{len(regressions)} metric(s) regressed more than {args.threshold:.0%}!")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Compare per-request connections with the pooled transport. \n
+python -m benchmarks.transport --env DEV -n 50
+"""
+import argparse
+import statistics
+import time
+
+import httpx
+
+from api_clients.base_api import BaseApi
+from utils.config import read_config
+
+HEADERS = {
+    "Content-Type": "application/json",
+    "Connection": "keep-alive",
+    "Accept": "application/json",
+}
+
+
+def measure(send, url: str, headers: dict, number: int) -> list:
+    """
+    Send GET request number times and collect latencies. \n
+    :param send: function sending GET request.
+    :param url: request url.
+    :param headers: request headers.
+    :param number: number of requests.
+    :return: latencies in milliseconds.
+    """
+    latencies = []
+    for _ in range(number):
+        start = time.perf_counter()
+        send(url, headers=headers)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def report(name: str, latencies: list):
+    print(
+        f"{name:<10} total: {sum(latencies):9.1f} ms  "
+        f"mean: {statistics.mean(latencies):7.2f} ms  "
+        f"median: {statistics.median(latencies):7.2f} ms  "
+        f"max: {max(latencies):7.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--env", default="TEST", help="Chose environment: default TEST")
+    parser.add_argument("-n", "--number", type=int, default=50, help="Requests per transport")
+    args = parser.parse_args()
+
+    config = read_config(env=args.env)
+    client = BaseApi.get_client(config=config)
+    token = (
+        client.put(
+            f"{config['url']}/client/sign-in/",
+            headers=HEADERS,
+            json={"phone_number": config["phone"], "password": config["password"]},
+        )
+        .json()
+        .get("token")
+    )
+    headers = {**HEADERS, "Authorization": f"Bearer {token}"}
+    url = f"{config['url']}/space/filter/"
+
+    try:
+        report("unpooled", measure(httpx.get, url, headers, args.number))
+        report("pooled", measure(client.get, url, headers, args.number))
+    finally:
+        BaseApi.close_clients()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,48 +1,284 @@
-import configparser
+from urllib.parse import urlsplit
 
-import httpx
 import pytest
+import pytest_check
+
+from api_clients.async_base_api import AsyncBaseApi, close_loop
+from api_clients.base_api import BaseApi, pool_settings
+from api_clients.policy import RequestPolicy
+from api_clients.response_cache import ResponseCache
+from fake_api.server import FakeOneHourApi
+from utils.auth import get_token
+from utils.cassette import CassetteReader, CassetteWriter, RecordTransport, ReplayTransport
+from utils.config import read_config
+from utils.logger.log import setup_logging
+from utils.metrics import latency
+from utils.openmetrics import api_metrics, worker_path
+from utils.parallel import DurationStore, sign_up_worker_account, worker_id
+from utils.resource_registry import resources
+from utils.sla import PERCENTILE_LIMITS, sla
+from utils.space_pool import DEFAULT_POOL_SIZE, SpacePool
 
 
 def pytest_addoption(parser):
     parser.addoption(
         "--env", action="store", default="TEST", help="Chose environment: default TEST"
     )
+    parser.addoption(
+        "--fake-api",
+        action="store_true",
+        default=False,
+        help="Answer all requests with in-process fake API, no network: default disabled",
+    )
+    parser.addoption(
+        "--record",
+        action="store",
+        default=None,
+        help="Append all API traffic to cassette file: default disabled",
+    )
+    parser.addoption(
+        "--replay",
+        action="store",
+        default=None,
+        help="Answer all API requests from cassette file, no network: default disabled",
+    )
+    parser.addoption(
+        "--token-cache",
+        action="store",
+        default=None,
+        help="File to cache token between runs and xdist workers: default disabled",
+    )
+    parser.addoption(
+        "--response-cache",
+        action="store",
+        type=float,
+        default=None,
+        help="Cache successful GET responses for given seconds: default from config, disabled",
+    )
+    parser.addoption(
+        "--space-pool-size",
+        action="store",
+        type=int,
+        default=DEFAULT_POOL_SIZE,
+        help=f"Spaces created per batch for booking tests: default {DEFAULT_POOL_SIZE}",
+    )
+    parser.addoption(
+        "--sweep-autotest",
+        action="store_true",
+        default=False,
+        help="Delete all Autotest_ spaces of account at session end: default disabled",
+    )
+    parser.addoption(
+        "--worker-accounts",
+        action="store_true",
+        default=False,
+        help="Sign up own account and data namespace per xdist worker: default disabled",
+    )
+    parser.addoption(
+        "--durations-file",
+        action="store",
+        default=None,
+        help="JSON file with recorded test durations, run longest tests first: default disabled",
+    )
+    parser.addoption(
+        "--latency-report",
+        action="store",
+        default=None,
+        help="JSON file for per-endpoint latency report: default disabled",
+    )
+    parser.addoption(
+        "--openmetrics",
+        action="store",
+        default=None,
+        help="OpenMetrics textfile of API calls written at session end: default disabled",
+    )
 
 
-@pytest.fixture(autouse=True)
+_duration_store = None
+# environment config read once in pytest_configure
+env_config_key = pytest.StashKey[dict]()
+
+
+def pytest_configure(config):
+    global _duration_store
+    setup_logging()
+    latency.listeners.append(sla.observe)
+    api_metrics.enabled = config.getoption("--openmetrics") is not None
+    env_config = read_config(env=config.getoption("--env"))
+    sla.base_path = urlsplit(env_config["url"]).path
+    token_cache = config.getoption("--token-cache")
+    if token_cache is not None:
+        env_config.update({"token_cache": token_cache})
+    response_cache = config.getoption("--response-cache")
+    if response_cache is not None:
+        env_config.update({"response_cache_ttl": response_cache})
+    config.stash[env_config_key] = env_config
+
+    config.addinivalue_line(
+        "markers", "consumes_space: test deletes leased space, pool must not reuse it"
+    )
+    config.addinivalue_line(
+        "markers",
+        "latency(p50_ms, p90_ms, p95_ms, p99_ms, max_ms, endpoint): "
+        "soft limits for durations of API calls made by test, per endpoint",
+    )
+    durations_file = config.getoption("--durations-file")
+    if durations_file is not None:
+        _duration_store = DurationStore(path=durations_file)
+
+
+def pytest_collection_modifyitems(session, config, items):
+    if _duration_store is not None:
+        _duration_store.sort(items)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    marker = item.get_closest_marker("latency")
+    sla.start(observe=marker is not None)
+    yield
+    if marker is not None:
+        _check_latency_marker(marker)
+    rows = sla.finish()
+    if rows:
+        # user properties reach the controller with the report under xdist
+        item.user_properties.append(("latency_sla", rows))
+
+
+def _check_latency_marker(marker):
+    endpoint = marker.kwargs.get("endpoint")
+    limits = {key: value for key, value in marker.kwargs.items() if key in PERCENTILE_LIMITS}
+    if endpoint is not None and endpoint not in sla.samples:
+        sla.samples[endpoint] = []
+    for name, values in sorted(sla.samples.items()):
+        if endpoint is not None and name != endpoint:
+            continue
+        for metric, limit_ms in limits.items():
+            row = sla.check(name, metric, limit_ms, values, percent=PERCENTILE_LIMITS[metric])
+            pytest_check.is_true(
+                row["passed"],
+                f"Endpoint is too slow: {name}!\n"
+                f"Expected: {metric} <= {limit_ms} ms,\n"
+                f"Actual: {row['observed_ms']} ms of {row['samples']} call(s)",
+            )
+
+
+def pytest_runtest_logreport(report):
+    # with xdist reports of all workers reach the controller
+    if _duration_store is not None and worker_id() == "master":
+        _duration_store.record(report.nodeid, report.duration)
+    if report.when == "call" and worker_id() == "master":
+        for name, rows in report.user_properties:
+            if name == "latency_sla":
+                sla.add_results(report.nodeid, rows)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    BaseApi.close_clients()
+    close_loop()
+    if _duration_store is not None and worker_id() == "master":
+        _duration_store.save()
+    latency_report = session.config.getoption("--latency-report")
+    if latency_report is not None:
+        latency.to_json(latency_report)
+    openmetrics = session.config.getoption("--openmetrics")
+    if openmetrics is not None:
+        # with xdist every worker writes own file, told apart by worker label
+        worker = worker_id()
+        api_metrics.write(
+            worker_path(openmetrics, worker),
+            labels={} if worker == "master" else {"worker": worker},
+        )
+
+
+def pytest_terminal_summary(terminalreporter):
+    if sla.results:
+        terminalreporter.section("Latency SLA")
+        terminalreporter.write_line(sla.report())
+    if latency.endpoints:
+        terminalreporter.section("API latency")
+        terminalreporter.write_line(latency.report())
+    policy_report = RequestPolicy.report()
+    if policy_report:
+        terminalreporter.section("API request policy")
+        terminalreporter.write_line(policy_report)
+    cache_report = ResponseCache.report()
+    if cache_report:
+        terminalreporter.section("API response cache")
+        terminalreporter.write_line(cache_report)
+
+
+@pytest.fixture(scope="session", autouse=True)
 def config(request):
     print("\n")
     print("Creating session.\n")
 
-    env = request.config.getoption("--env")
-    configuration = configparser.RawConfigParser()
-    configuration.read("config.ini")
-
-    test_config = {
-        "url": configuration.get(env, "url"),
-        "phone": configuration.get(env, "phone"),
-        "password": configuration.get(env, "password"),
-    }
-
-    token = (
-        httpx.put(
-            url=f"{test_config['url']}/client/sign-in/",
-            headers={
-                "Content-Type": "application/json",
-                "Connection": "keep-alive",
-                "Accept": "application/json",
-            },
-            json={"phone_number": test_config["phone"], "password": test_config["password"]},
-        )
-        .json()
-        .get("token")
-    )
+    test_config = dict(request.config.stash[env_config_key])
+    cassette = _install_transport(request, test_config)
 
-    if token is not None:
-        test_config.update({"token": token})
+    if request.config.getoption("--worker-accounts"):
+        test_config.update(sign_up_worker_account(config=test_config))
     else:
-        raise Exception("Unable to get token!")
+        test_config.update(
+            {"token": get_token(config=test_config, client=BaseApi.get_client(config=test_config))}
+        )
 
     print("Session successfully created.\n")
-    return test_config
+    yield test_config
+
+    failed = resources.cleanup()
+    if request.config.getoption("--sweep-autotest"):
+        failed += resources.sweep(config=test_config)
+    if failed:
+        print(f"Unable to delete: {failed}")
+    if cassette is not None:
+        cassette.close()
+
+
+def _install_transport(request, test_config):
+    """
+    Replace network transport of all API clients: fake API, record or replay. \n
+    :return: cassette to close at session end or None.
+    """
+    transport = cassette = None
+    if request.config.getoption("--fake-api"):
+        fake_api = FakeOneHourApi(phone=test_config["phone"], password=test_config["password"])
+        transport = fake_api.transport()
+    if request.config.getoption("--replay") is not None:
+        cassette = CassetteReader(path=request.config.getoption("--replay"))
+        transport = ReplayTransport(reader=cassette)
+    elif request.config.getoption("--record") is not None:
+        cassette = CassetteWriter(path=request.config.getoption("--record"))
+        transport = RecordTransport(
+            writer=cassette, transport=transport, limits=pool_settings(test_config)["limits"]
+        )
+
+    if transport is not None:
+        BaseApi.transport = AsyncBaseApi.transport = transport
+        BaseApi.close_clients()
+    return cassette
+
+
+@pytest.fixture(scope="session")
+def space_pool(request, config):
+    pool = SpacePool(config=config, size=request.config.getoption("--space-pool-size"))
+    yield pool
+    pool.close()
+
+
+@pytest.fixture
+def space(request, space_pool):
+    leased = space_pool.lease()
+    yield leased
+    space_pool.release(
+        leased, consumed=request.node.get_closest_marker("consumes_space") is not None
+    )
+
+
+@pytest.fixture(autouse=True)
+def cleanup(config):
+    mark = resources.mark()
+    yield
+    failed = resources.cleanup(since=mark)
+    if failed:
+        print(f"Unable to delete: {failed}")
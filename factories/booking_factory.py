@@ -1,23 +1,62 @@
 import datetime
 import uuid
 
+from factories.booking_slots import (
+    DEFAULT_AVAILABLE_FROM,
+    DEFAULT_AVAILABLE_TO,
+    DEFAULT_DURATION,
+    slots,
+)
+
 
 class BookingFactory:
     def __init__(self, space_id: str = None, datetime_from: str = None, datetime_to: str = None):
-        self.date_now = datetime.datetime.now(tz=datetime.timezone.utc).astimezone()
+        self.datetime_now = datetime.datetime.now(tz=datetime.timezone.utc).astimezone()
 
-        self.date_now = self.date_now + datetime.timedelta(days=1)
-        self.date_now = self.date_now.isoformat()
+        self.datetime_now = self.datetime_now + datetime.timedelta(days=1)
+        self.date_now = self.datetime_now.isoformat()
 
         if space_id is None:
             space_id = str(uuid.uuid4())
+            window = (self.datetime_now, self.datetime_now + DEFAULT_DURATION)
+        elif datetime_from is None or datetime_to is None:
+            # own window of space, so bookings of one space do not overlap
+            window = slots.allocate(space_id)[0]
         if datetime_from is None:
-            datetime_from = self.date_now
+            datetime_from = window[0].isoformat()
         if datetime_to is None:
-            datetime_to = self.date_now.replace("2023", "2024")
+            datetime_to = window[1].isoformat()
 
         self.default_data = {
             "space_id": space_id,
             "datetime_from": datetime_from,
             "datetime_to": datetime_to,
         }
+
+    @staticmethod
+    def build_batch(
+        n: int,
+        space_id: str = None,
+        available_from=DEFAULT_AVAILABLE_FROM,
+        available_to=DEFAULT_AVAILABLE_TO,
+        duration: datetime.timedelta = DEFAULT_DURATION,
+    ) -> list:
+        """
+        Booking payloads for n disjoint windows of one space. \n
+        :param n: number of bookings.
+        :param space_id: space id, random when None.
+        :param available_from: space available_from.
+        :param available_to: space available_to.
+        :param duration: length of booking.
+        :return: list of booking data.
+        """
+        if space_id is None:
+            space_id = str(uuid.uuid4())
+        windows = slots.allocate(space_id, n, available_from, available_to, duration)
+        # windows are consecutive: end of one is start of next
+        bounds = [start.isoformat() for start, _ in windows]
+        bounds.append(windows[-1][1].isoformat() if windows else None)
+        return [
+            {"space_id": space_id, "datetime_from": bounds[i], "datetime_to": bounds[i + 1]}
+            for i in range(n)
+        ]
@@ -0,0 +1,86 @@
+import datetime
+import threading
+
+# dates of spaces created by SpaceFactory
+DEFAULT_AVAILABLE_FROM = "2020-01-01T01:01:01.001Z"
+DEFAULT_AVAILABLE_TO = "2030-01-01T01:01:01.001Z"
+DEFAULT_DURATION = datetime.timedelta(hours=1)
+# bookings must be in future when request reaches server
+DEFAULT_LEAD = datetime.timedelta(days=1)
+
+
+def parse_datetime(value) -> datetime.datetime:
+    """
+    Timezone aware datetime from ISO string or datetime, naive values are UTC. \n
+    :param value: ISO string or datetime.
+    :return: datetime.
+    """
+    if isinstance(value, str):
+        value = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=datetime.timezone.utc)
+    return value
+
+
+def _ceil_hour(value: datetime.datetime) -> datetime.datetime:
+    floor = value.replace(minute=0, second=0, microsecond=0)
+    return floor if floor == value else floor + datetime.timedelta(hours=1)
+
+
+class SlotAllocator:
+    """
+    Hands out disjoint booking windows per space. \n
+    Windows of one space follow each other from the first whole hour after now + lead,
+    so bookings created from them never overlap and are inside space available dates.
+    """
+
+    def __init__(self, lead: datetime.timedelta = DEFAULT_LEAD):
+        self._lock = threading.Lock()
+        self.lead = lead
+        self.cursors = {}
+
+    def allocate(
+        self,
+        space_id: str,
+        count: int = 1,
+        available_from=DEFAULT_AVAILABLE_FROM,
+        available_to=DEFAULT_AVAILABLE_TO,
+        duration: datetime.timedelta = DEFAULT_DURATION,
+    ) -> list:
+        """
+        Reserve consecutive windows of space. \n
+        :param space_id: space id.
+        :param count: number of windows.
+        :param available_from: space available_from.
+        :param available_to: space available_to.
+        :param duration: length of window.
+        :return: list of (datetime_from, datetime_to).
+        """
+        available_from = parse_datetime(available_from)
+        available_to = parse_datetime(available_to)
+        now = datetime.datetime.now(tz=datetime.timezone.utc)
+        with self._lock:
+            start = _ceil_hour(max(now + self.lead, available_from))
+            start = max(start, self.cursors.get(space_id, start))
+            end = start + duration * count
+            if end > available_to:
+                raise Exception(
+                    f"No free booking slots for space {space_id}: "
+                    f"{count} x {duration} after {start.isoformat()}!"
+                )
+            self.cursors[space_id] = end
+        return [(start + duration * i, start + duration * (i + 1)) for i in range(count)]
+
+    def reset(self, space_id: str = None):
+        """
+        Forget reserved windows. \n
+        :param space_id: space id, all spaces when None.
+        """
+        with self._lock:
+            if space_id is None:
+                self.cursors.clear()
+            else:
+                self.cursors.pop(space_id, None)
+
+
+slots = SlotAllocator()
@@ -1,16 +1,29 @@
-import uuid
+from factories.identity_pool import identities
 
-from phone_gen import PhoneNumber
+PASSWORD = "Aboba322228"
+
+
+def _client_data(phone_number: str, guid: str) -> dict:
+    return {
+        "first_name": f"Autotest_first_name_{guid}",
+        "last_name": f"Autotest_last_name_{guid}",
+        "phone_number": phone_number,
+        "email": f"Autotest_email_{guid}@gmail.com",
+        "password": PASSWORD,
+    }
 
 
 class ClientFactory:
     def __init__(self):
-        self.phone_number = PhoneNumber("RS").get_number(full=False)
-        self.guid = str(uuid.uuid4())[:6]
-        self.default_data = {
-            "first_name": f"Autotest_first_name_{self.guid}",
-            "last_name": f"Autotest_last_name_{self.guid}",
-            "phone_number": f"{self.phone_number}",
-            "email": f"Autotest_email_{self.guid}@gmail.com",
-            "password": f"Aboba322228",
-        }
+        # unique phone and guid, see factories.identity_pool
+        self.phone_number, self.guid = identities.take()[0]
+        self.default_data = _client_data(self.phone_number, self.guid)
+
+    @staticmethod
+    def build_batch(n: int) -> list:
+        """
+        Sign-up payloads with unique phones, identities are reserved in one block. \n
+        :param n: number of clients.
+        :return: list of client data.
+        """
+        return [_client_data(phone, guid) for phone, guid in identities.take(n)]
@@ -0,0 +1,78 @@
+import json
+import os
+import random
+import threading
+
+from utils.file_lock import FileLock
+
+DEFAULT_PATH = ".identity_pool.json"
+DEFAULT_BLOCK_SIZE = 1000
+# serbian mobile numbers without country code: 9 digits starting with 6, like phone_gen "RS"
+PHONE_BASE = 6 * 10**8
+PHONE_SPACE = 10**8
+
+
+class IdentityPool:
+    """
+    Unique phone numbers and guids for sign-up data. \n
+    Identities are numbered, every process reserves blocks of numbers in a shared state file
+    under FileLock, so xdist workers never overlap and numbers used by previous runs are
+    never handed out again. The first run starts from a random offset, so pools of
+    different machines are unlikely to meet.
+    """
+
+    def __init__(self, path: str = DEFAULT_PATH, block_size: int = DEFAULT_BLOCK_SIZE):
+        """
+        :param path: state file with next free number.
+        :param block_size: numbers reserved at once.
+        """
+        self.path = path
+        self.block_size = block_size
+        self._lock = threading.Lock()
+        self._next = 0
+        self._end = 0
+
+    def _reserve(self, count: int) -> int:
+        """
+        Reserve count numbers in state file. \n
+        :param count: numbers to reserve.
+        :return: first reserved number.
+        """
+        with FileLock(f"{self.path}.lock"):
+            try:
+                with open(self.path, encoding="utf-8") as file:
+                    state = json.load(file)
+            except (OSError, ValueError):
+                state = {"next": random.randrange(PHONE_SPACE), "used": 0}
+            # tail too short for count is skipped on wrap-around, it counts as used,
+            # so the pool never cycles back into numbers of earlier runs
+            wraps = state["next"] + count > PHONE_SPACE
+            start = 0 if wraps else state["next"]
+            skipped = PHONE_SPACE - state["next"] if wraps else 0
+            if state["used"] + skipped + count > PHONE_SPACE:
+                raise Exception(f"Identity pool is exhausted: {self.path}!")
+            state["next"] = start + count
+            state["used"] += skipped + count
+            with open(self.path, "w", encoding="utf-8") as file:
+                json.dump(state, file)
+        return start
+
+    def take(self, count: int = 1) -> list:
+        """
+        Take unused identities. \n
+        :param count: number of identities.
+        :return: list of (phone_number, guid).
+        """
+        with self._lock:
+            if self._end - self._next < count:
+                size = max(count, self.block_size)
+                self._next = self._reserve(size)
+                self._end = self._next + size
+            start = self._next
+            self._next += count
+        return [
+            (str(PHONE_BASE + number), f"{number:07x}") for number in range(start, start + count)
+        ]
+
+
+identities = IdentityPool(path=os.environ.get("IDENTITY_POOL", DEFAULT_PATH))
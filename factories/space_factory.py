@@ -1,32 +1,73 @@
 import random
 import uuid
 
-from api_clients.space_api import SpaceApi
+from api_clients.space_filter_cache import SpaceFilterCache
+from factories.booking_slots import DEFAULT_AVAILABLE_FROM, DEFAULT_AVAILABLE_TO
+
+IMAGE_URL = (
+    "https://www.neptunus.co.uk/wp-content/uploads/2018/08/"
+    "demontabel-bouwen-Flexolution-2-flex2shop-mclaren-showroom-hatfield-8-820x546.jpg"
+)
 
 
 class SpaceFactory:
     def __init__(self, config):
         self.config = config
         self.guid = str(uuid.uuid4())
+        # own namespace of xdist worker, see --worker-accounts
+        self.namespace = f"{self.config['namespace']}_" if self.config.get("namespace") else ""
         self.rnd_number = random.randint(0, 89)
-        self.space_api = SpaceApi(config=self.config)
-        self.types = self.space_api.get_space_filter().json().get("types")
+        self.types = SpaceFilterCache.get(config=self.config).get("types")
         self.default_data = {
-            "name": f"Autotest_space_{self.guid[:6]}",
+            "name": f"Autotest_space_{self.namespace}{self.guid[:6]}",
             "type": random.choice(self.types),
-            "city": f"Autotest_city_{self.guid[:6]}",
-            "country": f"Autotest_count_{self.guid[:6]}",
-            "address": f"Autotest_address_{self.guid[:6]}",
+            "city": f"Autotest_city_{self.namespace}{self.guid[:6]}",
+            "country": f"Autotest_count_{self.namespace}{self.guid[:6]}",
+            "address": f"Autotest_address_{self.namespace}{self.guid[:6]}",
             "area": self.rnd_number + 1,
             "price": self.rnd_number + 2,
-            "available_from": "2020-01-01T01:01:01.001Z",
-            "available_to": "2030-01-01T01:01:01.001Z",
-            "short_description": f"Autotest_short_desc_{self.guid[:6]}",
-            "detailed_description": f"Autotest_detail_desc_{self.guid[:6]}",
-            "image_urls": [
-                "https://www.neptunus.co.uk/wp-content/uploads/2018/08/demontabel-bouwen-Flexolution-2-flex2shop-mclaren-showroom-hatfield-8-820x546.jpg"
-            ],
+            "available_from": DEFAULT_AVAILABLE_FROM,
+            "available_to": DEFAULT_AVAILABLE_TO,
+            "short_description": f"Autotest_short_desc_{self.namespace}{self.guid[:6]}",
+            "detailed_description": f"Autotest_detail_desc_{self.namespace}{self.guid[:6]}",
+            "image_urls": [IMAGE_URL],
             "id": self.guid,
             "lat": str(self.rnd_number),
             "lng": str(self.rnd_number),
         }
+
+    @staticmethod
+    def build_batch(n: int, config) -> list:
+        """
+        Space payloads like default_data, filter catalog is read once for the whole batch. \n
+        :param n: number of spaces.
+        :param config: environment config with token.
+        :return: list of space data.
+        """
+        namespace = f"{config['namespace']}_" if config.get("namespace") else ""
+        types = random.choices(SpaceFilterCache.get(config=config).get("types"), k=n)
+        numbers = random.choices(range(90), k=n)
+        batch = []
+        for type_, number in zip(types, numbers):
+            guid = str(uuid.uuid4())
+            suffix = f"{namespace}{guid[:6]}"
+            batch.append(
+                {
+                    "name": f"Autotest_space_{suffix}",
+                    "type": type_,
+                    "city": f"Autotest_city_{suffix}",
+                    "country": f"Autotest_count_{suffix}",
+                    "address": f"Autotest_address_{suffix}",
+                    "area": number + 1,
+                    "price": number + 2,
+                    "available_from": DEFAULT_AVAILABLE_FROM,
+                    "available_to": DEFAULT_AVAILABLE_TO,
+                    "short_description": f"Autotest_short_desc_{suffix}",
+                    "detailed_description": f"Autotest_detail_desc_{suffix}",
+                    "image_urls": [IMAGE_URL],
+                    "id": guid,
+                    "lat": str(number),
+                    "lng": str(number),
+                }
+            )
+        return batch
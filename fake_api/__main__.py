@@ -0,0 +1,33 @@
+"""
+Fake one-hour API on a real port for the TEST environment. \n
+python -m fake_api --port 8080
+"""
+
+import argparse
+
+from fake_api.server import FakeOneHourApi
+from utils.config import read_config
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--host", default="0.0.0.0", help="Host to bind: default 0.0.0.0")
+    parser.add_argument("--port", type=int, default=8080, help="Port to bind: default 8080")
+    parser.add_argument("--env", default="TEST", help="Account from config.ini section")
+    args = parser.parse_args()
+
+    config = read_config(env=args.env)
+    server = FakeOneHourApi(phone=config["phone"], password=config["password"]).serve(
+        host=args.host, port=args.port
+    )
+    print(f"Fake one-hour API on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+import hashlib
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+from fake_api.store import ApiError, Store
+
+
+class FakeOneHourApi:
+    """
+    In-memory stand-in for /client, /space and /booking routes of one-hour API. \n
+    Mount it as httpx transport (transport()) or serve it on a real port (serve()).
+    """
+
+    def __init__(self, phone: str = None, password: str = None):
+        """
+        :param phone: phone number of pre-registered account, e.g. from config.ini.
+        :param password: password of pre-registered account.
+        """
+        self.store = Store()
+        if phone is not None:
+            self.store.sign_up(
+                {
+                    "first_name": "Fake",
+                    "last_name": "Account",
+                    "phone_number": phone,
+                    "email": "fake@example.com",
+                    "password": password,
+                }
+            )
+        self.routes = {
+            ("PUT", "client/sign-in"): self._sign_in,
+            ("POST", "client/sign-up"): self._sign_up,
+            ("PUT", "client/logout"): self._logout,
+            ("GET", "space"): self._get_space,
+            ("POST", "space"): self._create_space,
+            ("DELETE", "space"): self._delete_space,
+            ("GET", "space/filter"): self._get_space_filter,
+            ("GET", "space/owner"): self._get_space_owner,
+            ("POST", "booking"): self._create_booking,
+            ("DELETE", "booking"): self._delete_booking,
+            ("GET", "booking/owner"): self._get_bookings_owner,
+            ("GET", "booking/tenant"): self._get_bookings_tenant,
+        }
+
+    def transport(self) -> httpx.MockTransport:
+        """Transport for httpx.Client and httpx.AsyncClient."""
+        return httpx.MockTransport(self.handle)
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        """
+        Answer request. \n
+        :param request: request to any base url, route is taken from the end of the path.
+        :return: response.
+        """
+        handler = self.routes.get((request.method, self._route(request.url.path)))
+        if handler is None:
+            return httpx.Response(404, json={"detail": "Not Found"})
+        try:
+            return handler(request)
+        except ApiError as e:
+            return httpx.Response(e.status_code, json={"detail": e.detail})
+
+    @staticmethod
+    def _route(path: str) -> str:
+        parts = [part for part in path.split("/") if part]
+        for number, part in enumerate(parts):
+            if part in ("client", "space", "booking"):
+                return "/".join(parts[number:])
+        return ""
+
+    @staticmethod
+    def _body(request: httpx.Request) -> any:
+        try:
+            return json.loads(request.content or b"null")
+        except ValueError:
+            raise ApiError(422, [{"loc": ["body"], "msg": "invalid json"}])
+
+    def _client(self, request: httpx.Request) -> str:
+        return self.store.authenticate(
+            request.headers.get("Authorization", "").removeprefix("Bearer ")
+        )
+
+    def _sign_in(self, request):
+        return httpx.Response(200, json=self.store.sign_in(self._body(request)))
+
+    def _sign_up(self, request):
+        return httpx.Response(200, json=self.store.sign_up(self._body(request)))
+
+    def _logout(self, request):
+        token = request.headers.get("Authorization", "").removeprefix("Bearer ")
+        return httpx.Response(200, json=self.store.logout(token))
+
+    def _get_space(self, request):
+        self._client(request)
+        return httpx.Response(200, json=self.store.find_spaces(dict(request.url.params)))
+
+    def _create_space(self, request):
+        space = self.store.create_space(self._client(request), self._body(request))
+        return httpx.Response(200, json=space)
+
+    def _delete_space(self, request):
+        client = self._client(request)
+        return httpx.Response(
+            200, json=self.store.delete_space(client, request.url.params.get("id"))
+        )
+
+    def _get_space_filter(self, request):
+        self._client(request)
+        body = json.dumps(self.store.space_filter()).encode()
+        etag = f'"{hashlib.md5(body).hexdigest()}"'
+        if request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304, headers={"ETag": etag})
+        return httpx.Response(
+            200, content=body, headers={"ETag": etag, "Content-Type": "application/json"}
+        )
+
+    def _get_space_owner(self, request):
+        client = self._client(request)
+        return httpx.Response(200, json=self.store.owner_spaces(client, dict(request.url.params)))
+
+    def _create_booking(self, request):
+        booking = self.store.create_booking(self._client(request), self._body(request))
+        return httpx.Response(200, json=booking)
+
+    def _delete_booking(self, request):
+        client = self._client(request)
+        return httpx.Response(
+            200, json=self.store.delete_booking(client, request.url.params.get("id"))
+        )
+
+    def _get_bookings_owner(self, request):
+        return httpx.Response(200, json=self.store.bookings_of("owner", self._client(request)))
+
+    def _get_bookings_tenant(self, request):
+        return httpx.Response(200, json=self.store.bookings_of("tenant", self._client(request)))
+
+    def serve(self, host: str = "0.0.0.0", port: int = 8080) -> ThreadingHTTPServer:
+        """
+        Create HTTP server answering with this fake API, call serve_forever() to run it. \n
+        :param host: host to bind.
+        :param port: port to bind.
+        :return: server.
+        """
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # headers and body are separate writes, with Nagle every answer waits ~40 ms
+            disable_nagle_algorithm = True
+
+            def _answer(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                request = httpx.Request(
+                    self.command,
+                    f"http://{host}:{port}{self.path}",
+                    headers=dict(self.headers),
+                    content=self.rfile.read(length),
+                )
+                response = api.handle(request)
+                self.send_response(response.status_code)
+                for key, value in response.headers.items():
+                    if key.lower() not in ("content-length", "transfer-encoding"):
+                        self.send_header(key, value)
+                self.send_header("Content-Length", str(len(response.content)))
+                self.end_headers()
+                self.wfile.write(response.content)
+
+            do_GET = do_POST = do_PUT = do_DELETE = _answer
+
+            def log_message(self, format, *args):
+                pass
+
+        return ThreadingHTTPServer((host, port), Handler)
@@ -0,0 +1,288 @@
+import bisect
+import datetime
+import math
+import threading
+import uuid
+
+SPACE_TYPES = ["office", "coworking", "meeting_room", "studio", "warehouse"]
+
+SPACE_FIELDS = {
+    "name": str,
+    "type": str,
+    "city": str,
+    "country": str,
+    "address": str,
+    "area": (int, float),
+    "price": (int, float),
+    "available_from": str,
+    "available_to": str,
+}
+BOOKING_FIELDS = {"space_id": str, "datetime_from": str, "datetime_to": str}
+SIGN_UP_FIELDS = {
+    "first_name": str,
+    "last_name": str,
+    "phone_number": str,
+    "email": str,
+    "password": str,
+}
+SIGN_IN_FIELDS = {"phone_number": str, "password": str}
+
+
+class ApiError(Exception):
+    """Error answered by fake API with status code and detail."""
+
+    def __init__(self, status_code: int, detail: any):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def validate(data: any, fields: dict):
+    """
+    Check request body like the real API does, FastAPI style errors. \n
+    :param data: request body.
+    :param fields: required field name to type.
+    """
+    if not isinstance(data, dict):
+        raise ApiError(422, [{"loc": ["body"], "msg": "value is not a valid dict"}])
+    errors = []
+    for name, type_ in fields.items():
+        if name not in data:
+            errors.append(
+                {"loc": ["body", name], "msg": "field required", "type": "value_error.missing"}
+            )
+        elif not isinstance(data[name], type_):
+            errors.append({"loc": ["body", name], "msg": "invalid type", "type": "type_error"})
+    if errors:
+        raise ApiError(422, errors)
+
+
+def parse_datetime(value: str, name: str) -> datetime.datetime:
+    try:
+        result = datetime.datetime.fromisoformat(value)
+    except ValueError:
+        raise ApiError(422, [{"loc": ["body", name], "msg": "invalid datetime format"}])
+    if result.tzinfo is None:
+        result = result.replace(tzinfo=datetime.timezone.utc)
+    return result
+
+
+class Store:
+    """
+    In-memory state of fake one-hour API. \n
+    Spaces are indexed by id, city, type, country, owner and availability window, bookings by
+    owner, tenant and space, so lookups don't scan the whole store.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.clients = {}
+        self.tokens = {}
+        self.spaces = {}
+        self.space_index = {"city": {}, "type": {}, "country": {}, "owner": {}}
+        self.available_from = []
+        self.available_to = []
+        self.bookings = {}
+        self.booking_index = {"owner": {}, "tenant": {}}
+        self.space_bookings = {}
+
+    # clients
+
+    def sign_up(self, data: dict) -> dict:
+        validate(data, SIGN_UP_FIELDS)
+        with self.lock:
+            if data["phone_number"] in self.clients:
+                raise ApiError(400, "Phone already exists")
+            self.clients[data["phone_number"]] = dict(data)
+            return {"token": self._issue_token(data["phone_number"])}
+
+    def sign_in(self, data: dict) -> dict:
+        validate(data, SIGN_IN_FIELDS)
+        with self.lock:
+            client = self.clients.get(data["phone_number"])
+            if client is None:
+                raise ApiError(404, "Phone is not registered")
+            if not data["password"] or client["password"] != data["password"]:
+                raise ApiError(401, "Bad credentials")
+            return {"token": self._issue_token(data["phone_number"])}
+
+    def logout(self, token: str) -> dict:
+        with self.lock:
+            self.tokens.pop(token, None)
+            return {"detail": "Successfully logged out"}
+
+    def _issue_token(self, phone: str) -> str:
+        token = uuid.uuid4().hex
+        self.tokens[token] = phone
+        return token
+
+    def authenticate(self, token: str) -> str:
+        """
+        :param token: bearer token.
+        :return: phone number of client.
+        """
+        with self.lock:
+            phone = self.tokens.get(token)
+        if phone is None:
+            raise ApiError(401, "Not authenticated")
+        return phone
+
+    # spaces
+
+    def create_space(self, owner: str, data: dict) -> dict:
+        validate(data, SPACE_FIELDS)
+        available_from = parse_datetime(data["available_from"], "available_from")
+        available_to = parse_datetime(data["available_to"], "available_to")
+        with self.lock:
+            id_ = data.get("id")
+            if not isinstance(id_, str) or not id_ or id_ in self.spaces:
+                id_ = str(uuid.uuid4())
+            space = {**data, "id": id_, "owner_id": owner}
+            self.spaces[id_] = space
+            for key in ("city", "type", "country"):
+                self.space_index[key].setdefault(space[key], {})[id_] = None
+            self.space_index["owner"].setdefault(owner, {})[id_] = None
+            bisect.insort(self.available_from, (available_from, id_))
+            bisect.insort(self.available_to, (available_to, id_))
+            return dict(space)
+
+    def delete_space(self, owner: str, id_: str) -> dict:
+        with self.lock:
+            space = self.spaces.get(id_)
+            if space is None or space["owner_id"] != owner:
+                raise ApiError(400, "Wrong space id")
+            del self.spaces[id_]
+            for key in ("city", "type", "country"):
+                ids = self.space_index[key][space[key]]
+                del ids[id_]
+                if not ids:
+                    del self.space_index[key][space[key]]
+            del self.space_index["owner"][owner][id_]
+            for index, key in (
+                (self.available_from, "available_from"),
+                (self.available_to, "available_to"),
+            ):
+                position = bisect.bisect_left(index, (parse_datetime(space[key], key), id_))
+                del index[position]
+            for booking_id in self.space_bookings.pop(id_, []):
+                self._drop_booking(booking_id)
+            return {"detail": "Successfully deleted"}
+
+    def find_spaces(self, params: dict) -> list:
+        with self.lock:
+            candidates = []
+            if params.get("id"):
+                candidates.append({params["id"]} & self.spaces.keys())
+            for key in ("city", "type", "country"):
+                if params.get(key):
+                    candidates.append(self.space_index[key].get(params[key], {}).keys())
+            if params.get("available_from"):
+                value = parse_datetime(params["available_from"], "available_from")
+                end = bisect.bisect_right(self.available_from, (value, "￿"))
+                candidates.append({id_ for _, id_ in self.available_from[:end]})
+            if params.get("available_to"):
+                value = parse_datetime(params["available_to"], "available_to")
+                start = bisect.bisect_left(self.available_to, (value, ""))
+                candidates.append({id_ for _, id_ in self.available_to[start:]})
+
+            if candidates:
+                candidates.sort(key=len)
+                ids = set(candidates[0]).intersection(*candidates[1:])
+                spaces = [space for id_, space in self.spaces.items() if id_ in ids]
+            else:
+                spaces = list(self.spaces.values())
+            return self._page([dict(space) for space in spaces], params)
+
+    def owner_spaces(self, owner: str, params: dict) -> list:
+        with self.lock:
+            ids = self.space_index["owner"].get(owner, {})
+            return self._page([dict(self.spaces[id_]) for id_ in ids], params)
+
+    def space_filter(self) -> dict:
+        with self.lock:
+            return {
+                "types": SPACE_TYPES,
+                "cities": list(self.space_index["city"]),
+                "countries": list(self.space_index["country"]),
+            }
+
+    @staticmethod
+    def _page(items: list, params: dict) -> list:
+        offset = int(params.get("offset") or 0)
+        limit = params.get("limit")
+        return items[offset : offset + int(limit)] if limit else items[offset:]
+
+    # bookings
+
+    def create_booking(self, tenant: str, data: dict) -> dict:
+        validate(data, BOOKING_FIELDS)
+        datetime_from = parse_datetime(data["datetime_from"], "datetime_from")
+        datetime_to = parse_datetime(data["datetime_to"], "datetime_to")
+        now = datetime.datetime.now(tz=datetime.timezone.utc)
+        with self.lock:
+            space = self.spaces.get(data["space_id"])
+            if space is None:
+                raise ApiError(400, "Wrong space id")
+            if datetime_from < now or datetime_to < now:
+                raise ApiError(400, "Book date and time must be in future")
+            if datetime_from < parse_datetime(
+                space["available_from"], "available_from"
+            ) or datetime_to > parse_datetime(space["available_to"], "available_to"):
+                raise ApiError(400, "Book date is out of space available dates")
+            if datetime_to <= datetime_from:
+                raise ApiError(400, "Book time must be greater then 0")
+            for booking_id in self.space_bookings.get(space["id"], []):
+                booking = self.bookings[booking_id]
+                if booking["_from"] < datetime_to and datetime_from < booking["_to"]:
+                    raise ApiError(400, "Space is already booked for this time")
+
+            hours = math.ceil((datetime_to - datetime_from).total_seconds() / 3600)
+            booking = {
+                "id": str(uuid.uuid4()),
+                "space_id": space["id"],
+                "datetime_from": data["datetime_from"],
+                "datetime_to": data["datetime_to"],
+                "cost": hours * space["price"],
+                "status": "created",
+                "contact": tenant,
+                "_owner": space["owner_id"],
+                "_from": datetime_from,
+                "_to": datetime_to,
+            }
+            self.bookings[booking["id"]] = booking
+            self.booking_index["owner"].setdefault(booking["_owner"], {})[booking["id"]] = None
+            self.booking_index["tenant"].setdefault(tenant, {})[booking["id"]] = None
+            self.space_bookings.setdefault(space["id"], {})[booking["id"]] = None
+            return self._public(booking)
+
+    def delete_booking(self, client: str, id_: str) -> dict:
+        with self.lock:
+            booking = self.bookings.get(id_)
+            if booking is None or client not in (booking["contact"], booking["_owner"]):
+                raise ApiError(400, "Wrong booking id")
+            self._drop_booking(id_)
+            del self.space_bookings[booking["space_id"]][id_]
+            return {"detail": "Successfully deleted"}
+
+    def _drop_booking(self, id_: str):
+        booking = self.bookings.pop(id_)
+        del self.booking_index["owner"][booking["_owner"]][id_]
+        del self.booking_index["tenant"][booking["contact"]][id_]
+
+    def bookings_of(self, role: str, client: str) -> list:
+        """
+        Booking history, bookings in status "created" are hidden like in the real API. \n
+        :param role: owner or tenant.
+        :param client: phone number of client.
+        """
+        with self.lock:
+            ids = self.booking_index[role].get(client, {})
+            return [
+                self._public(self.bookings[id_])
+                for id_ in ids
+                if self.bookings[id_]["status"] != "created"
+            ]
+
+    @staticmethod
+    def _public(booking: dict) -> dict:
+        return {key: value for key, value in booking.items() if not key.startswith("_")}
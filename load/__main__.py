@@ -0,0 +1,169 @@
+"""
+Load generator replaying test scenarios. \n
+python -m load --env DEV --users 10 --duration 60 --ramp-up 10
+python -m load --env DEV --rate 5 --arrival poisson --scenario booking_flow=1 --scenario browse_spaces=4
+python -m load --env DEV --processes 8 --users 200 --duration 60
+python -m load --env DEV --users 50 --request-rate 100
+"""
+
+import argparse
+import logging
+
+from api_clients.base_api import BaseApi
+from api_clients.policy import LOAD_BREAKER_THRESHOLD, RequestPolicy
+from load.driver import DEFAULT_REPORT_INTERVAL, ProcessDriver
+from load.runner import LoadRunner, request_rate_report
+from load.scenarios import DEFAULT_WEIGHTS, SCENARIOS
+from utils.auth import get_token
+from utils.config import read_config
+from utils.logger.log import setup_logging
+from utils.metrics import latency
+from utils.openmetrics import api_metrics
+
+
+def parse_weight(value: str) -> tuple:
+    name, _, weight = value.partition("=")
+    if name not in SCENARIOS:
+        raise argparse.ArgumentTypeError(f"Unknown scenario: {name}! Known: {', '.join(SCENARIOS)}")
+    return name, float(weight or 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--env", default="TEST", help="Chose environment: default TEST")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--users", type=int, default=1, help="Virtual users, closed model")
+    mode.add_argument(
+        "--rate",
+        type=float,
+        help="Scenario starts per second, open model; every scenario sends 3-7 requests, "
+        "so request rate is not held, see --request-rate",
+    )
+    parser.add_argument(
+        "--arrival", choices=["constant", "poisson"], default="constant", help="Open model arrivals"
+    )
+    parser.add_argument("--max-workers", type=int, default=100, help="Open model concurrency")
+    parser.add_argument("--duration", type=float, default=60, help="Run duration, seconds")
+    parser.add_argument("--ramp-up", type=float, default=0, help="Ramp-up duration, seconds")
+    parser.add_argument(
+        "--scenario",
+        type=parse_weight,
+        action="append",
+        help="Scenario with weight, e.g. booking_flow=2: default all",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        help="Requests per second per endpoint group, client side: default from config",
+    )
+    parser.add_argument(
+        "--request-rate",
+        type=float,
+        help="Requests per second of all API calls, paced client side; users must be enough "
+        "to reach it, achieved rate is reported",
+    )
+    parser.add_argument(
+        "--breaker-threshold",
+        type=int,
+        default=LOAD_BREAKER_THRESHOLD,
+        help=f"Consecutive 5xx which open circuit of endpoint group, 0 - disabled: "
+        f"default {LOAD_BREAKER_THRESHOLD}",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=1,
+        help="Worker processes with own accounts, users and rates are split: default 1",
+    )
+    parser.add_argument(
+        "--report-interval",
+        type=float,
+        default=DEFAULT_REPORT_INTERVAL,
+        help="Seconds between live lines of worker processes, 0 - none",
+    )
+    parser.add_argument("--latency-json", help="JSON file for per-endpoint latency report")
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        help="Serve OpenMetrics on 127.0.0.1:PORT/metrics during run, worker N on PORT+N",
+    )
+    parser.add_argument("--openmetrics", help="OpenMetrics textfile of API calls written at end")
+    parser.add_argument("--log-level", default="WARNING", help="Log level of API calls")
+    args = parser.parse_args()
+
+    setup_logging()
+    logging.getLogger().setLevel(args.log_level)
+    weights = dict(args.scenario) if args.scenario else DEFAULT_WEIGHTS
+    if args.processes > 1:
+        report, registry, elapsed = ProcessDriver(
+            env=args.env, processes=args.processes, report_interval=args.report_interval
+        ).run(
+            weights=weights,
+            duration=args.duration,
+            ramp_up=args.ramp_up,
+            users=args.users,
+            rate=args.rate,
+            rate_limit=args.rate_limit,
+            request_rate=args.request_rate,
+            breaker_threshold=args.breaker_threshold,
+            max_workers=args.max_workers,
+            arrival=args.arrival,
+            log_level=args.log_level,
+            metrics_port=args.metrics_port,
+            openmetrics=args.openmetrics,
+        )
+        print(report)
+        print()
+        print(registry.report())
+        requests = sum(endpoint.histogram.total for endpoint in registry.endpoints.values())
+        print(request_rate_report(requests, elapsed, args.request_rate))
+        if args.latency_json:
+            registry.to_json(args.latency_json)
+        return
+
+    config = read_config(env=args.env)
+    config.update({"breaker_threshold": args.breaker_threshold})
+    if args.rate_limit is not None:
+        config.update({"rate_limit": args.rate_limit})
+    if args.request_rate is not None:
+        config.update({"request_rate": args.request_rate})
+    config.update({"token": get_token(config=config, client=BaseApi.get_client(config=config))})
+
+    runner = LoadRunner(
+        config=config,
+        weights=weights,
+        duration=args.duration,
+        ramp_up=args.ramp_up,
+    )
+    api_metrics.enabled = args.metrics_port is not None or args.openmetrics is not None
+    server = api_metrics.serve(port=args.metrics_port) if args.metrics_port else None
+    try:
+        if args.rate:
+            stats = runner.run_rate(
+                rate=args.rate, arrival=args.arrival, max_workers=args.max_workers
+            )
+        else:
+            stats = runner.run_users(users=args.users)
+    finally:
+        BaseApi.close_clients()
+        if server is not None:
+            server.shutdown()
+    if args.openmetrics:
+        api_metrics.write(args.openmetrics)
+    print(stats.report())
+    print()
+    print(latency.report())
+    requests = sum(endpoint.histogram.total for endpoint in latency.endpoints.values())
+    print(request_rate_report(requests, stats.finished_at - stats.started_at, args.request_rate))
+    policy_report = RequestPolicy.report()
+    if policy_report:
+        print()
+        print(policy_report)
+    if args.latency_json:
+        latency.to_json(args.latency_json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+
+from api_clients.base_api import BaseApi
+from load.runner import LoadRunner, RunStats
+from utils.config import read_config
+from utils.logger.log import setup_logging
+from utils.metrics import EndpointStats, LatencyRegistry, SharedMetrics, latency
+from utils.openmetrics import api_metrics, worker_path
+from utils.parallel import sign_up_worker_account
+
+DEFAULT_REPORT_INTERVAL = 5.0
+
+
+class SharedRunStats(RunStats):
+    """RunStats of worker process: iterations go to shared memory instead of lists."""
+
+    def __init__(self, shared: SharedMetrics):
+        super().__init__()
+        self.shared = shared
+
+    def add(self, name: str, duration: float, error: Exception = None):
+        with self._lock:
+            stats = self.shared.stats(name)
+            stats.histogram.record(int(duration * 1_000_000))
+            if error is not None:
+                stats.errors += 1
+                self.errors[f"{type(error).__name__}: {error}"] += 1
+
+
+def split(total: float, parts: int, part: int) -> float:
+    """
+    Share of worker in total, remainder of integers goes to first workers. \n
+    :param total: users or rate of all workers.
+    :param parts: number of workers.
+    :param part: number of worker.
+    :return: share.
+    """
+    if isinstance(total, int):
+        return total // parts + (part < total % parts)
+    return total / parts
+
+
+def worker(
+    env: str,
+    api_block: str,
+    scenario_block: str,
+    weights: dict,
+    duration: float,
+    ramp_up: float,
+    users: int = None,
+    rate: float = None,
+    arrival: str = "constant",
+    max_workers: int = 100,
+    rate_limit: float = None,
+    request_rate: float = None,
+    breaker_threshold: int = None,
+    log_level: str = "WARNING",
+    metrics_port: int = None,
+    openmetrics: str = None,
+    number: int = 0,
+) -> dict:
+    """
+    Load run in worker process with own connection pool and account. \n
+    :param env: config.ini section.
+    :param api_block: name of SharedMetrics block for API calls.
+    :param scenario_block: name of SharedMetrics block for scenario iterations.
+    :param request_rate: requests per second of worker, see api_clients.policy.
+    :param breaker_threshold: circuit breaker threshold, see api_clients.policy.
+    :param metrics_port: OpenMetrics of worker are served on metrics_port + number.
+    :param openmetrics: OpenMetrics textfile, worker writes own file with worker label.
+    :param number: number of worker.
+    :return: error messages with counts.
+    """
+    setup_logging()
+    logging.getLogger().setLevel(log_level)
+    latency.shared = SharedMetrics.attach(api_block)
+    scenarios = SharedMetrics.attach(scenario_block)
+    config = read_config(env=env)
+    if rate_limit is not None:
+        config.update({"rate_limit": rate_limit})
+    if request_rate is not None:
+        config.update({"request_rate": request_rate})
+    if breaker_threshold is not None:
+        config.update({"breaker_threshold": breaker_threshold})
+    labels = {"worker": f"w{number}"}
+    api_metrics.enabled = metrics_port is not None or openmetrics is not None
+    server = api_metrics.serve(port=metrics_port + number, labels=labels) if metrics_port else None
+    try:
+        # own account of worker, spaces are named with worker label like xdist workers
+        config.update({**sign_up_worker_account(config=config), "namespace": labels["worker"]})
+        runner = LoadRunner(config=config, weights=weights, duration=duration, ramp_up=ramp_up)
+        runner.stats = SharedRunStats(scenarios)
+        if rate:
+            runner.run_rate(rate=rate, arrival=arrival, max_workers=max_workers)
+        else:
+            runner.run_users(users=users)
+        return dict(runner.stats.errors)
+    finally:
+        BaseApi.close_clients()
+        if server is not None:
+            server.shutdown()
+        if openmetrics:
+            api_metrics.write(worker_path(openmetrics, labels["worker"]), labels=labels)
+        latency.shared.close()
+        scenarios.close()
+
+
+def merged(blocks: list) -> LatencyRegistry:
+    """
+    Statistics of all workers. \n
+    :param blocks: SharedMetrics of workers.
+    :return: registry with merged statistics.
+    """
+    registry = LatencyRegistry()
+    for block in blocks:
+        registry.merge(block.read())
+    return registry
+
+
+def total(registry: LatencyRegistry) -> EndpointStats:
+    """All endpoints of registry in one EndpointStats."""
+    stats = EndpointStats()
+    for endpoint in registry.endpoints.values():
+        stats.merge(endpoint)
+    return stats
+
+
+def report(registry: LatencyRegistry, elapsed: float, errors: dict) -> str:
+    """
+    Scenario table of merged workers, same columns as RunStats.report. \n
+    :param registry: merged scenario statistics.
+    :param elapsed: run duration in seconds.
+    :param errors: error messages with counts.
+    :return: table.
+    """
+    lines = [
+        f"{'scenario':<16}{'count':>8}{'failed':>8}{'rate/s':>9}"
+        f"{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}"
+    ]
+    for name, stats in registry.to_dict().items():
+        lines.append(
+            f"{name:<16}{stats['count']:>8}{stats['errors']:>8}"
+            f"{stats['count'] / elapsed:>9.2f}{stats['p50_ms']:>10.1f}"
+            f"{stats['p90_ms']:>10.1f}{stats['p99_ms']:>10.1f}{stats['max_ms']:>10.1f}"
+        )
+    for error, count in sorted(errors.items(), key=lambda item: -item[1])[:10]:
+        lines.append(f"{count:>8} x {error}")
+    return "\n".join(lines)
+
+
+class ProcessDriver:
+    """
+    Load run in worker processes, so the client is not limited by one interpreter. \n
+    Every worker signs up own account and has own connection pools. Latencies are recorded
+    into SharedMetrics blocks, the parent merges them live without per-call messages.
+    """
+
+    def __init__(self, env: str, processes: int, report_interval: float = DEFAULT_REPORT_INTERVAL):
+        """
+        :param env: config.ini section.
+        :param processes: number of worker processes.
+        :param report_interval: seconds between live progress lines, 0 - no progress.
+        """
+        self.env = env
+        self.processes = processes
+        self.report_interval = report_interval
+
+    def progress(self, api: list, started: float, previous: tuple) -> tuple:
+        """
+        Print live line of merged API calls. \n
+        :return: (time, calls) for the next line.
+        """
+        now = time.perf_counter()
+        stats = total(merged(api))
+        calls = stats.histogram.total
+        rate = (calls - previous[1]) / (now - previous[0])
+        print(
+            f"{now - started:>7.1f} s {calls:>9} calls {rate:>9.1f} /s "
+            f"p50 {stats.histogram.percentile(50) / 1000:>8.1f} ms "
+            f"p99 {stats.histogram.percentile(99) / 1000:>8.1f} ms "
+            f"errors {stats.errors}",
+            flush=True,
+        )
+        return now, calls
+
+    def run(
+        self,
+        weights: dict,
+        duration: float,
+        ramp_up: float = 0.0,
+        users: int = 1,
+        rate: float = None,
+        rate_limit: float = None,
+        request_rate: float = None,
+        max_workers: int = 100,
+        **options,
+    ) -> tuple:
+        """
+        Split users, rate and rate limit between workers and run them. \n
+        :param weights: scenario name to weight.
+        :param duration: run duration in seconds.
+        :param ramp_up: seconds to reach number of users or rate.
+        :param users: virtual users of all workers, closed model.
+        :param rate: scenario starts per second of all workers, open model.
+        :param rate_limit: requests per second per endpoint group of all workers.
+        :param request_rate: requests per second of all workers together.
+        :param max_workers: open model concurrency of all workers.
+        :param options: arrival, log_level, breaker_threshold, metrics_port and openmetrics of worker.
+        :return: report of scenarios, merged latency registry of API calls, duration.
+        """
+        api = [SharedMetrics.create() for _ in range(self.processes)]
+        scenarios = [SharedMetrics.create() for _ in range(self.processes)]
+        errors = {}
+        # spawned workers do not inherit locks, threads and open connections of parent
+        context = multiprocessing.get_context("spawn")
+        started = time.perf_counter()
+        try:
+            with ProcessPoolExecutor(self.processes, mp_context=context) as executor:
+                futures = [
+                    executor.submit(
+                        worker,
+                        self.env,
+                        api[number].name,
+                        scenarios[number].name,
+                        weights,
+                        duration,
+                        ramp_up,
+                        users=split(users, self.processes, number),
+                        rate=rate and split(rate, self.processes, number),
+                        rate_limit=rate_limit and split(rate_limit, self.processes, number),
+                        request_rate=request_rate and split(request_rate, self.processes, number),
+                        max_workers=max(1, split(max_workers, self.processes, number)),
+                        number=number,
+                        **options,
+                    )
+                    for number in range(self.processes)
+                ]
+                previous = (started, 0)
+                pending = futures
+                while pending:
+                    _, pending = wait(pending, timeout=self.report_interval or None)
+                    if pending and self.report_interval:
+                        previous = self.progress(api, started, previous)
+                for future in futures:
+                    for error, count in future.result().items():
+                        errors[error] = errors.get(error, 0) + count
+            elapsed = time.perf_counter() - started
+            return report(merged(scenarios), elapsed, errors), merged(api), elapsed
+        finally:
+            for block in api + scenarios:
+                block.close(unlink=True)
@@ -0,0 +1,225 @@
+"""
+Double-booking race: N simultaneous POST /booking/ at one space with overlapping windows. \n
+Every window overlaps all others, so at most one booking per level may be accepted.
+python -m load.race --env DEV --levels 1,2,4,8,16,32,64,128,256,512 --accounts 32
+"""
+
+import argparse
+import asyncio
+import datetime
+import logging
+import time
+
+from api_clients.async_base_api import AsyncBaseApi, close_loop, map_limited
+from api_clients.base_api import BaseApi
+from api_clients.booking_api import AsyncBookingApi
+from api_clients.client_api import AsyncClientApi
+from api_clients.space_api import AsyncSpaceApi
+from factories.booking_factory import BookingFactory
+from factories.booking_slots import DEFAULT_DURATION, DEFAULT_LEAD
+from factories.client_factory import ClientFactory
+from factories.space_factory import SpaceFactory
+from load.runner import RunStats
+from utils.auth import get_token
+from utils.config import read_config
+from utils.logger.log import setup_logging
+from utils.resource_registry import resources
+
+DEFAULT_LEVELS = "1,2,4,8,16,32,64,128,256,512"
+DEFAULT_ACCOUNTS = 32
+
+
+def windows(count: int) -> list:
+    """
+    Windows which all overlap each other: starts are spread inside the first window. \n
+    :param count: number of windows.
+    :return: list of (datetime_from, datetime_to).
+    """
+    base = datetime.datetime.now(tz=datetime.timezone.utc).replace(microsecond=0) + DEFAULT_LEAD
+    step = DEFAULT_DURATION / (count + 1)
+    return [(base + step * i, base + step * i + DEFAULT_DURATION) for i in range(count)]
+
+
+def overlaps(accepted: list) -> int:
+    """
+    Number of accepted bookings overlapping an earlier accepted one. \n
+    :param accepted: list of (datetime_from, datetime_to).
+    :return: double-accepted bookings.
+    """
+    double = 0
+    latest_end = None
+    for start, end in sorted(accepted):
+        if latest_end is not None and start < latest_end:
+            double += 1
+        latest_end = end if latest_end is None else max(latest_end, end)
+    return double
+
+
+async def sign_up_accounts(config, count: int) -> list:
+    """
+    Sign up tenant accounts. \n
+    :param config: environment config.
+    :param count: number of accounts.
+    :return: configs of accounts.
+    """
+    client_api = AsyncClientApi(config=config)
+    payloads = ClientFactory.build_batch(count)
+    responses = await map_limited(client_api.sign_up, [{"data": data} for data in payloads])
+    accounts = []
+    for data, response in zip(payloads, responses):
+        token = response.json().get("token") if response is not None else None
+        if token is None:
+            raise Exception(f"Unable to sign up race account {data['phone_number']}!")
+        accounts.append(
+            {**config, "phone": data["phone_number"], "password": data["password"], "token": token}
+        )
+    return accounts
+
+
+async def race(space_api: AsyncSpaceApi, booking_apis: list, level: int) -> dict:
+    """
+    Fire level simultaneous bookings of one new space. \n
+    :param space_api: API of space owner.
+    :param booking_apis: APIs of tenant accounts, used round robin.
+    :param level: number of simultaneous requests.
+    :return: results of level.
+    """
+    response = await space_api.create_space(data=SpaceFactory(config=space_api.config).default_data)
+    if response is None or response.status_code != 200:
+        raise Exception("Unable to create space for race!")
+    space_id = response.json().get("id")
+
+    payloads = [
+        BookingFactory(
+            space_id=space_id,
+            datetime_from=datetime_from.isoformat(),
+            datetime_to=datetime_to.isoformat(),
+        ).default_data
+        for datetime_from, datetime_to in windows(level)
+    ]
+    start_gate = asyncio.Event()
+
+    async def book(index: int) -> tuple:
+        await start_gate.wait()
+        started = time.perf_counter()
+        response = await booking_apis[index % len(booking_apis)].create_booking(
+            data=payloads[index]
+        )
+        return response, time.perf_counter() - started
+
+    tasks = [asyncio.create_task(book(index)) for index in range(level)]
+    # let every task reach the gate, then release them together
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    start_gate.set()
+    results = await asyncio.gather(*tasks)
+    wall = time.perf_counter() - started
+
+    statuses = [response.status_code if response is not None else None for response, _ in results]
+    accepted = [
+        (
+            datetime.datetime.fromisoformat(payloads[index]["datetime_from"]),
+            datetime.datetime.fromisoformat(payloads[index]["datetime_to"]),
+        )
+        for index, status in enumerate(statuses)
+        if status == 200
+    ]
+    durations = [seconds for _, seconds in results]
+    return {
+        "level": level,
+        "throughput": level / wall if wall else 0.0,
+        "p50": RunStats.percentile(durations, 50),
+        "p99": RunStats.percentile(durations, 99),
+        "max": max(durations),
+        "accepted": len(accepted),
+        "rejected": sum(status is not None and 400 <= status < 500 for status in statuses),
+        "errors": sum(status is None or status >= 500 for status in statuses),
+        "double_accepted": overlaps(accepted),
+    }
+
+
+def report(rows: list) -> str:
+    """
+    Table of race results, one row per concurrency level. \n
+    :param rows: results of race.
+    :return: table.
+    """
+    lines = [
+        f"{'level':>6}{'req/s':>9}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}"
+        f"{'accepted':>10}{'rejected':>10}{'errors':>8}{'double':>8}"
+    ]
+    for row in rows:
+        lines.append(
+            f"{row['level']:>6}{row['throughput']:>9.1f}{row['p50'] * 1000:>9.1f}"
+            f"{row['p99'] * 1000:>9.1f}{row['max'] * 1000:>9.1f}{row['accepted']:>10}"
+            f"{row['rejected']:>10}{row['errors']:>8}{row['double_accepted']:>8}"
+            + ("  DOUBLE BOOKING!" if row["double_accepted"] else "")
+        )
+    return "\n".join(lines)
+
+
+async def run(config, levels: list, accounts: int) -> list:
+    """
+    Sign up tenants and race every concurrency level on a new space. \n
+    :param config: environment config with token of space owner.
+    :param levels: concurrency levels.
+    :param accounts: number of tenant accounts.
+    :return: results of levels.
+    """
+    try:
+        accounts = await sign_up_accounts(config, accounts)
+        space_api = AsyncSpaceApi(config=config)
+        booking_apis = [AsyncBookingApi(config=account) for account in accounts]
+        rows = []
+        print(report(rows), flush=True)
+        for level in levels:
+            rows.append(await race(space_api, booking_apis, level))
+            print(report(rows[-1:]).splitlines()[-1], flush=True)
+        return rows
+    finally:
+        await AsyncBaseApi.aclose_clients()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--env", default="TEST", help="Chose environment: default TEST")
+    parser.add_argument(
+        "--levels", default=DEFAULT_LEVELS, help=f"Concurrency levels: default {DEFAULT_LEVELS}"
+    )
+    parser.add_argument(
+        "--accounts", type=int, default=DEFAULT_ACCOUNTS, help="Tenant accounts, round robin"
+    )
+    parser.add_argument("--log-level", default="CRITICAL", help="Log level of API calls")
+    args = parser.parse_args()
+
+    setup_logging()
+    logging.getLogger().setLevel(args.log_level)
+    levels = [int(level) for level in args.levels.split(",")]
+    config = read_config(env=args.env)
+    # measure the backend: every request is sent at once, no client-side shaping
+    config.update(
+        {
+            "max_connections": max(levels),
+            "max_keepalive_connections": max(levels),
+            "retries": 0,
+            "rate_limit": 0,
+            "breaker_threshold": 0,
+        }
+    )
+    config.update({"token": get_token(config=config, client=BaseApi.get_client(config=config))})
+
+    # rows are printed live, one per level
+    try:
+        asyncio.run(run(config, levels, args.accounts))
+    finally:
+        failed = resources.cleanup()
+        BaseApi.close_clients()
+        close_loop()
+    if failed:
+        print(f"Unable to delete: {failed}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+import collections
+import math
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from load.scenarios import SCENARIOS
+
+
+def arrival_offset(index: float, rate: float, ramp_up: float) -> float:
+    """
+    Time of arrival number index when rate grows linearly from 0 to rate during ramp_up. \n
+    :param index: cumulative number of arrivals.
+    :param rate: target arrivals per second.
+    :param ramp_up: ramp-up duration in seconds.
+    :return: seconds from start.
+    """
+    ramp_arrivals = rate * ramp_up / 2
+    if index < ramp_arrivals:
+        return math.sqrt(2 * index * ramp_up / rate)
+    return ramp_up + (index - ramp_arrivals) / rate
+
+
+class RunStats:
+    """Thread-safe counters of scenario iterations."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.durations = collections.defaultdict(list)
+        self.failures = collections.Counter()
+        self.errors = collections.Counter()
+        self.start_lags = []
+        self.started_at = time.perf_counter()
+        self.finished_at = None
+
+    def add(self, name: str, duration: float, error: Exception = None):
+        with self._lock:
+            self.durations[name].append(duration)
+            if error is not None:
+                self.failures[name] += 1
+                self.errors[f"{type(error).__name__}: {error}"] += 1
+
+    def add_start_lag(self, lag: float):
+        with self._lock:
+            self.start_lags.append(lag)
+
+    def finish(self):
+        self.finished_at = time.perf_counter()
+
+    @staticmethod
+    def percentile(values: list, percent: float) -> float:
+        values = sorted(values)
+        return values[min(len(values) - 1, int(len(values) * percent / 100))] if values else 0.0
+
+    def report(self) -> str:
+        elapsed = (self.finished_at or time.perf_counter()) - self.started_at
+        lines = [
+            f"{'scenario':<16}{'count':>8}{'failed':>8}{'rate/s':>9}"
+            f"{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}"
+        ]
+        for name, durations in sorted(self.durations.items()):
+            lines.append(
+                f"{name:<16}{len(durations):>8}{self.failures[name]:>8}"
+                f"{len(durations) / elapsed:>9.2f}"
+                f"{self.percentile(durations, 50) * 1000:>10.1f}"
+                f"{self.percentile(durations, 90) * 1000:>10.1f}"
+                f"{self.percentile(durations, 99) * 1000:>10.1f}"
+                f"{max(durations) * 1000:>10.1f}"
+            )
+        if self.start_lags:
+            lines.append(
+                f"start lag p99: {self.percentile(self.start_lags, 99) * 1000:.1f} ms, "
+                f"max: {max(self.start_lags) * 1000:.1f} ms"
+            )
+        for error, count in self.errors.most_common(10):
+            lines.append(f"{count:>8} x {error}")
+        return "\n".join(lines)
+
+
+def request_rate_report(requests: int, elapsed: float, target: float = None) -> str:
+    """
+    Achieved request rate, scenarios send several requests each. \n
+    :param requests: API calls of run.
+    :param elapsed: run duration in seconds.
+    :param target: requests per second of --request-rate.
+    :return: line.
+    """
+    line = f"requests: {requests}, {requests / elapsed:.2f}/s"
+    if target:
+        line += f", target: {target:.2f}/s ({requests / elapsed / target:.0%})"
+    return line
+
+
+class LoadRunner:
+    """Replay weighted scenarios with virtual users or with target arrival rate."""
+
+    def __init__(self, config, weights: dict, duration: float, ramp_up: float = 0.0):
+        """
+        :param config: environment config with token.
+        :param weights: scenario name to weight.
+        :param duration: run duration in seconds, ramp-up included.
+        :param ramp_up: seconds to reach number of users or rate.
+        """
+        self.config = config
+        self.names = list(weights)
+        self.weights = [weights[name] for name in self.names]
+        self.duration = duration
+        self.ramp_up = ramp_up
+        self.stats = RunStats()
+
+    def iteration(self):
+        """Run one randomly chosen scenario."""
+        name = random.choices(self.names, weights=self.weights)[0]
+        start = time.perf_counter()
+        try:
+            SCENARIOS[name](self.config)
+        except Exception as e:
+            self.stats.add(name, time.perf_counter() - start, error=e)
+        else:
+            self.stats.add(name, time.perf_counter() - start)
+
+    def run_users(self, users: int) -> RunStats:
+        """
+        Closed model: every virtual user runs scenarios one after another. \n
+        :param users: number of virtual users, started evenly during ramp-up.
+        :return: statistics.
+        """
+        deadline = time.monotonic() + self.duration
+
+        def user(delay: float):
+            time.sleep(delay)
+            while time.monotonic() < deadline:
+                self.iteration()
+
+        threads = [
+            threading.Thread(target=user, args=(self.ramp_up * number / users,), daemon=True)
+            for number in range(users)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.stats.finish()
+        return self.stats
+
+    def run_rate(self, rate: float, arrival: str = "constant", max_workers: int = 100) -> RunStats:
+        """
+        Open model: scenarios start on schedule, not when previous ones finish. \n
+        :param rate: target scenario starts per second.
+        :param arrival: "constant" intervals or "poisson" arrivals.
+        :param max_workers: max concurrent scenarios, late starts show up as start lag.
+        :return: statistics.
+        """
+        start = time.monotonic()
+        index = 0.0
+
+        def scheduled(planned: float):
+            self.stats.add_start_lag(time.monotonic() - planned)
+            self.iteration()
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while True:
+                index += random.expovariate(1.0) if arrival == "poisson" else 1.0
+                offset = arrival_offset(index, rate, self.ramp_up)
+                if offset >= self.duration:
+                    break
+                planned = start + offset
+                delay = planned - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                executor.submit(scheduled, planned)
+        self.stats.finish()
+        return self.stats
@@ -0,0 +1,85 @@
+import random
+
+import httpx
+
+from api_clients.booking_api import BookingApi
+from api_clients.client_api import ClientApi
+from api_clients.space_api import SpaceApi
+from factories.booking_factory import BookingFactory
+from factories.booking_slots import slots
+from factories.client_factory import ClientFactory
+from factories.space_factory import SpaceFactory
+
+
+class ScenarioError(Exception):
+    """Unexpected response in scenario step."""
+
+
+def check(response: httpx.Response, exp_code: int = 200) -> httpx.Response:
+    """
+    Check response of scenario step. \n
+    :param response: response or None when request failed.
+    :param exp_code: expected status code.
+    :return: response.
+    """
+    if response is None:
+        raise ScenarioError("Request failed!")
+    if response.status_code != exp_code:
+        raise ScenarioError(
+            f"{response.request.method} {response.request.url.path}: "
+            f"expected {exp_code}, actual {response.status_code}"
+        )
+    return response
+
+
+def booking_flow(config):
+    """Sign up, create space, book it, list bookings as owner and tenant, delete all."""
+    client_api = ClientApi(config=config)
+    token = check(client_api.sign_up(data=ClientFactory().default_data)).json().get("token")
+    user_config = {**config, "token": token}
+
+    space_api = SpaceApi(config=user_config)
+    booking_api = BookingApi(config=user_config)
+    space_id = (
+        check(space_api.create_space(data=SpaceFactory(config=user_config).default_data))
+        .json()
+        .get("id")
+    )
+    try:
+        booking_id = (
+            check(booking_api.create_booking(data=BookingFactory(space_id=space_id).default_data))
+            .json()
+            .get("id")
+        )
+        check(booking_api.get_bookings_for_owner())
+        check(booking_api.get_booking_tenant())
+        check(booking_api.delete_booking(id_=booking_id))
+    finally:
+        slots.reset(space_id)
+        check(space_api.delete_space(id_=space_id))
+
+
+def browse_spaces(config):
+    """Look through filter and first pages of space catalog."""
+    space_api = SpaceApi(config=config)
+    filters = check(space_api.get_space_filter()).json()
+    check(space_api.get_space(limit=20))
+    if filters.get("cities"):
+        check(space_api.get_space(city=random.choice(filters["cities"]), limit=20))
+
+
+def owner_history(config):
+    """List bookings as owner and tenant and owned spaces."""
+    booking_api = BookingApi(config=config)
+    check(booking_api.get_bookings_for_owner())
+    check(booking_api.get_booking_tenant())
+    check(SpaceApi(config=config).get_space_owner(limit=20))
+
+
+SCENARIOS = {
+    "booking_flow": booking_flow,
+    "browse_spaces": browse_spaces,
+    "owner_history": owner_history,
+}
+
+DEFAULT_WEIGHTS = {"booking_flow": 1, "browse_spaces": 3, "owner_history": 1}
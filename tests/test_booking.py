@@ -1,36 +1,21 @@
+import datetime
+
 import pytest
 
 from api_clients.booking_api import BookingApi
 from api_clients.space_api import SpaceApi
 from factories.booking_factory import BookingFactory
-from factories.space_factory import SpaceFactory
 from utils.utils import check_status_code
 
 
 class TestBooking:
     @pytest.fixture(autouse=True)
-    def setup(self, config):
+    def setup(self, config, space):
         self.config = config
         self.booking_api = BookingApi(config=self.config)
         self.space_api = SpaceApi(config=self.config)
-        self.space = SpaceFactory(config=self.config)
-        self.space_id = self.space_api.create_space(data=self.space.default_data).json().get("id")
-
-    def teardown(self):
-        booking = self.booking_api.get_bookings_for_owner()
-        if booking.status_code == 200:
-            if len(booking.json()) != 0:
-                for book in booking.json():
-                    self.booking_api.delete_booking(id_=book.get("id"))
-            else:
-                print("Nothing to delete for bookings.")
-        space = self.space_api.get_space(city=self.space.default_data.get("city"))
-        if space.status_code == 200:
-            try:
-                space_id = space.json()[0].get("id")
-                self.space_api.delete_space(id_=space_id)
-            except IndexError:
-                print("Nothing to delete for spaces.")
+        self.space = space
+        self.space_id = self.space.get("id")
 
     # POST /booking/
     def test_create_booking(self):
@@ -56,8 +41,8 @@ class TestBooking:
         ), f"Incorrect response: {response.json()}!"
 
     def test_create_booking_datetime_in_future_not_available_date(self):
-        date_now = BookingFactory().date_now.replace("2023", "2050")
-        data = BookingFactory(space_id=self.space_id, datetime_to=date_now).default_data
+        date_to = BookingFactory().datetime_now + datetime.timedelta(days=365 * 30)
+        data = BookingFactory(space_id=self.space_id, datetime_to=date_to.isoformat()).default_data
         response = self.booking_api.create_booking(data=data)
 
         check_status_code(request=response, exp_code=400)
@@ -66,8 +51,8 @@ class TestBooking:
         ), f"Incorrect response: {response.json()}!"
 
     def test_create_booking_datetime_in_past_not_available_date(self):
-        date_now = BookingFactory().date_now.replace("2023", "2010")
-        data = BookingFactory(space_id=self.space_id, datetime_to=date_now).default_data
+        date_to = BookingFactory().datetime_now - datetime.timedelta(days=365 * 15)
+        data = BookingFactory(space_id=self.space_id, datetime_to=date_to.isoformat()).default_data
         response = self.booking_api.create_booking(data=data)
 
         check_status_code(request=response, exp_code=400)
@@ -81,6 +66,7 @@ class TestBooking:
         check_status_code(request=response, exp_code=422)
 
     # GET /booking/owner/
+    @pytest.mark.latency(p95_ms=1000, endpoint="GET /booking/owner/")
     def test_get_booking_owner(self):
         booking_id = (
             self.booking_api.create_booking(
@@ -105,6 +91,7 @@ class TestBooking:
             booking_id not in booking_ids
         ), f"Booking with status created found in the history: {response.json()}!"
 
+    @pytest.mark.consumes_space
     def test_get_booking_owner_after_delete_space(self):
         booking_id = (
             self.booking_api.create_booking(
@@ -163,6 +150,7 @@ class TestBooking:
             booking_id not in booking_ids
         ), f"Booking with status created found in history: {response.json()}!"
 
+    @pytest.mark.consumes_space
     def test_get_booking_tenant_after_delete_space(self):
         booking_id = (
             self.booking_api.create_booking(
@@ -233,7 +221,7 @@ class TestBooking:
         check_status_code(request=response, exp_code=400)
 
     def test_delete_booking_id_not_found(self):
-        booking_id = self.space.default_data["id"]
+        booking_id = self.space_id
         self.booking_api.delete_booking(id_=booking_id)
         response = self.booking_api.delete_booking(id_=booking_id)
 
@@ -0,0 +1,72 @@
+import json
+import os
+
+import httpx
+import pytest
+
+from utils.cassette import CassetteMiss, CassetteReader, CassetteWriter, request_key
+
+
+def record(writer: CassetteWriter, path: str, body: bytes):
+    request = httpx.Request("GET", f"http://test{path}")
+    response = httpx.Response(200, content=body, request=request)
+    writer.write(request_key(request), request, response)
+
+
+def get(reader: CassetteReader, path: str) -> bytes:
+    return reader.response(httpx.Request("GET", f"http://test{path}")).content
+
+
+class TestCassette:
+    @pytest.fixture
+    def path(self, tmp_path):
+        return str(tmp_path / "api.cassette")
+
+    def test_replay(self, path):
+        writer = CassetteWriter(path)
+        record(writer, "/space/", b"first")
+        record(writer, "/space/", b"second")
+        writer.close()
+        reader = CassetteReader(path)
+        assert [get(reader, "/space/"), get(reader, "/space/")] == [b"first", b"second"]
+        with pytest.raises(CassetteMiss):
+            get(reader, "/booking/")
+        reader.close()
+
+    # recording run killed before close leaves .idx of previous run
+    def test_stale_index(self, path):
+        writer = CassetteWriter(path)
+        record(writer, "/space/", b"space")
+        writer.close()
+        writer = CassetteWriter(path)
+        record(writer, "/booking/", b"booking")
+        writer._file.close()
+
+        reader = CassetteReader(path)
+        assert get(reader, "/booking/") == b"booking"
+        reader.close()
+        writer = CassetteWriter(path)
+        assert len(writer.index) == 2
+        writer.close()
+        with open(f"{path}.idx", encoding="utf-8") as file:
+            assert json.load(file)["size"] == os.path.getsize(path)
+
+    def test_partial_record(self, path):
+        writer = CassetteWriter(path)
+        record(writer, "/space/", b"space")
+        record(writer, "/booking/", b"booking")
+        writer._file.close()
+        with open(path, "r+b") as file:
+            file.truncate(os.path.getsize(path) - 3)
+
+        assert list(CassetteReader.scan(path)) == [
+            request_key(httpx.Request("GET", "http://test/space/"))
+        ]
+        # new records are appended after the last complete one
+        writer = CassetteWriter(path)
+        record(writer, "/booking/", b"again")
+        writer.close()
+        reader = CassetteReader(path)
+        assert get(reader, "/booking/") == b"again"
+        assert CassetteReader.scan(path) == reader.index
+        reader.close()
@@ -0,0 +1,30 @@
+import json
+
+import pytest
+
+from factories import identity_pool
+from factories.identity_pool import IdentityPool
+
+
+class TestIdentityPool:
+    @pytest.fixture
+    def path(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(identity_pool, "PHONE_SPACE", 10)
+        path = tmp_path / "identity_pool.json"
+        path.write_text(json.dumps({"next": 6, "used": 0}))
+        return str(path)
+
+    def test_unique(self, path):
+        pool = IdentityPool(path=path, block_size=1)
+        numbers = [phone for phone, _ in pool.take(4)]
+        assert numbers == [str(identity_pool.PHONE_BASE + number) for number in range(6, 10)]
+
+    # tail skipped on wrap-around is used, numbers of earlier runs are never handed out
+    def test_wrap_around(self, path):
+        pool = IdentityPool(path=path, block_size=3)
+        taken = [number for _ in range(3) for number in pool.take(3)]
+        assert len(set(taken)) == 9
+        with open(path, encoding="utf-8") as file:
+            assert json.load(file) == {"next": 6, "used": 10}
+        with pytest.raises(Exception, match="exhausted"):
+            IdentityPool(path=path, block_size=3).take(3)
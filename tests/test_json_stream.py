@@ -0,0 +1,42 @@
+import json
+import random
+
+import pytest
+
+from utils.json_stream import iter_json_array
+
+DOCUMENTS = [
+    [1, 2.5, -3e10, 1e-06, 0, -0.5, 12345678901234567890],
+    [True, False, None, "a, b]", {"id": "x", "n": [1, 2]}, [3.25e-7]],
+    [],
+]
+
+
+def chunks(text: str, sizes: list) -> list:
+    data = text.encode()
+    result = []
+    for size in sizes:
+        result.append(data[:size])
+        data = data[size:]
+    return result + [data]
+
+
+class TestJsonStream:
+    # every split into two chunks, e.g. right after "." or "e" of a number
+    @pytest.mark.parametrize("document", DOCUMENTS)
+    def test_split_in_two(self, document):
+        text = json.dumps(document)
+        for position in range(len(text) + 1):
+            assert list(iter_json_array(chunks(text, [position]))) == document, position
+
+    @pytest.mark.parametrize("document", DOCUMENTS)
+    def test_random_splits(self, document):
+        text = json.dumps(document)
+        rng = random.Random(0)
+        for _ in range(200):
+            sizes = [rng.randint(0, 4) for _ in range(len(text))]
+            assert list(iter_json_array(chunks(text, sizes))) == document, sizes
+
+    def test_fields(self):
+        text = json.dumps([{"id": 1, "name": "a"}, {"id": 2}])
+        assert list(iter_json_array(chunks(text, [7]), fields=("id",))) == [{"id": 1}, {"id": 2}]
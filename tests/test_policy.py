@@ -0,0 +1,120 @@
+import asyncio
+
+import httpx
+import pytest
+
+from api_clients import policy as policy_module
+from api_clients.policy import CircuitBreaker, CircuitOpenError, RequestPolicy
+
+URL = "http://test/one-hour/space/"
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(policy_module.time, "monotonic", clock)
+    return clock
+
+
+def response(status_code: int) -> httpx.Response:
+    return httpx.Response(status_code, request=httpx.Request("GET", URL))
+
+
+class TestCircuitBreaker:
+    def test_disabled(self):
+        breaker = CircuitBreaker(threshold=0, cooldown=10)
+        assert not any(breaker.record(failed=True) for _ in range(100))
+        assert breaker.allow() is True
+
+    def test_state_machine(self, clock):
+        breaker = CircuitBreaker(threshold=2, cooldown=10)
+        # closed
+        assert breaker.allow() is True
+        assert breaker.record(failed=True) is False
+        assert breaker.record(failed=True) is True
+        # open until cooldown
+        assert breaker.allow() is False
+        clock.now += 10
+        # single probe
+        assert breaker.allow() == "probe"
+        assert breaker.allow() is False
+        # failed probe waits another cooldown
+        assert breaker.record(failed=True, probe=True) is False
+        assert breaker.allow() is False
+        clock.now += 10
+        assert breaker.allow() == "probe"
+        breaker.release(probe=True)
+        assert breaker.allow() == "probe"
+        # successful probe closes
+        assert breaker.record(failed=False, probe=True) is False
+        assert breaker.allow() is True
+        assert breaker.failures == 0
+
+    # requests let through while closed must not free or decide the probe
+    def test_late_results(self, clock):
+        breaker = CircuitBreaker(threshold=1, cooldown=10)
+        assert breaker.allow() is True
+        assert breaker.allow() is True
+        assert breaker.record(failed=True) is True
+        clock.now += 10
+        assert breaker.allow() == "probe"
+        breaker.release(probe=False)
+        assert breaker.record(failed=False) is False
+        assert breaker.allow() is False
+        assert breaker.record(failed=False, probe=True) is False
+        assert breaker.allow() is True
+
+
+class TestRequestPolicy:
+    @pytest.fixture
+    def policy(self):
+        return RequestPolicy(
+            config={"url": "http://test/one-hour", "retries": 0, "breaker_threshold": 1}
+        )
+
+    def test_short_circuit(self, policy, clock):
+        assert policy.send("GET", URL, lambda: response(500)).status_code == 500
+        with pytest.raises(CircuitOpenError):
+            policy.send("GET", URL, lambda: response(200))
+        clock.now += policy.breaker_cooldown
+        assert policy.send("GET", URL, lambda: response(200)).status_code == 200
+        assert policy.counters["short_circuited"] == 1
+        assert policy.counters["tripped"] == 1
+
+    def test_cancelled_probe(self, policy, clock):
+        async def scenario():
+            gate = asyncio.Event()
+
+            async def hanging():
+                await gate.wait()
+                return response(200)
+
+            async def server_error():
+                return response(500)
+
+            # admitted while closed, still in flight when the circuit opens
+            early = asyncio.create_task(policy.asend("GET", URL, hanging))
+            await asyncio.sleep(0)
+            await policy.asend("GET", URL, server_error)
+            clock.now += policy.breaker_cooldown
+            probe = asyncio.create_task(policy.asend("GET", URL, hanging))
+            await asyncio.sleep(0)
+
+            early.cancel()
+            await asyncio.gather(early, return_exceptions=True)
+            with pytest.raises(CircuitOpenError):
+                await policy.asend("GET", URL, server_error)
+
+            probe.cancel()
+            await asyncio.gather(probe, return_exceptions=True)
+            return await policy.asend("GET", URL, lambda: asyncio.sleep(0, response(200)))
+
+        assert asyncio.run(scenario()).status_code == 200
@@ -0,0 +1,38 @@
+import httpx
+
+from api_clients.response_cache import ResponseCache
+
+URL = "http://test/one-hour/space/"
+
+
+def sender(token: str, calls: list):
+    def send() -> httpx.Response:
+        calls.append(token)
+        request = httpx.Request("GET", URL, headers={"Authorization": f"Bearer {token}"})
+        return httpx.Response(200, content=b"[]", request=request)
+
+    return send
+
+
+class TestResponseCache:
+    def test_hit(self):
+        cache = ResponseCache(config={"url": "http://test/one-hour", "response_cache_ttl": 60})
+        key = cache.key(URL, None, {"Authorization": "Bearer token"})
+        calls = []
+        for _ in range(3):
+            assert cache.fetch(key, URL, sender("token", calls)).status_code == 200
+        assert calls == ["token"]
+        assert cache.counters["hits"] == 2
+
+    # 401 answered with refreshed token must not be stored under the stale token
+    def test_refreshed_token(self):
+        cache = ResponseCache(config={"url": "http://test/one-hour", "response_cache_ttl": 60})
+        stale = cache.key(URL, None, {"Authorization": "Bearer stale"})
+        calls = []
+        cache.fetch(stale, URL, sender("fresh", calls))
+        assert not cache.entries
+        fresh = cache.key(URL, None, {"Authorization": "Bearer fresh"})
+        cache.fetch(fresh, URL, sender("fresh", calls))
+        cache.fetch(fresh, URL, sender("fresh", calls))
+        assert list(cache.entries) == [fresh]
+        assert calls == ["fresh", "fresh"]
@@ -2,7 +2,7 @@ import pytest
 
 from api_clients.space_api import SpaceApi
 from factories.space_factory import SpaceFactory
-from utils.utils import check_status_code
+from utils.utils import check_latency, check_status_code
 
 
 class TestSpace:
@@ -12,15 +12,6 @@ class TestSpace:
         self.space_api = SpaceApi(config=self.config)
         self.space = SpaceFactory(config=self.config)
 
-    def teardown(self):
-        space = self.space_api.get_space(city=self.space.default_data.get("city"))
-        if space.status_code == 200:
-            try:
-                space_id = space.json()[0].get("id")
-                self.space_api.delete_space(id_=space_id)
-            except IndexError:
-                print("Nothing to delete.")
-
     # POST /space/create/
     def test_create_space(self):
         data: dict = self.space.default_data
@@ -124,6 +115,7 @@ class TestSpace:
         response = self.space_api.get_space_filter()
 
         check_status_code(request=response, exp_code=200)
+        check_latency(response, max_ms=1000)
 
         kok = response.json().get("cities")
 
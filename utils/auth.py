@@ -0,0 +1,102 @@
+import json
+import os
+import threading
+import time
+
+import httpx
+
+from utils.file_lock import FileLock
+
+DEFAULT_TOKEN_TTL = 3600.0
+
+_tokens: dict = {}
+_lock = threading.Lock()
+
+
+def _key(config) -> str:
+    return f"{config['url']}|{config['phone']}"
+
+
+def sign_in(config, client: httpx.Client) -> str:
+    """
+    Sign in with phone and password from config. \n
+    :param config: environment config.
+    :param client: http client.
+    :return: token.
+    """
+    token = (
+        client.put(
+            url=f"{config['url']}/client/sign-in/",
+            headers={
+                "Content-Type": "application/json",
+                "Connection": "keep-alive",
+                "Accept": "application/json",
+            },
+            json={"phone_number": config["phone"], "password": config["password"]},
+        )
+        .json()
+        .get("token")
+    )
+    if token is None:
+        raise Exception("Unable to get token!")
+    return token
+
+
+def _read_cache(path: str) -> dict:
+    try:
+        with open(path, encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_cache(path: str, cache: dict):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump(cache, file)
+    os.replace(tmp_path, path)
+
+
+def get_token(config, client: httpx.Client, stale_token: str = None) -> str:
+    """
+    Get token for environment: from memory, from on-disk cache or by sign in. \n
+    :param config: environment config, "token_cache" and "token_ttl" are optional.
+    :param client: http client.
+    :param stale_token: token rejected by server, it is never returned.
+    :return: token.
+    """
+    key = _key(config)
+    ttl = float(config.get("token_ttl", DEFAULT_TOKEN_TTL))
+    cache_path = config.get("token_cache")
+
+    with _lock:
+        entry = _tokens.get(key)
+        if entry and entry["token"] != stale_token and entry["expires_at"] > time.time():
+            return entry["token"]
+
+        if not cache_path:
+            entry = {"token": sign_in(config, client), "expires_at": time.time() + ttl}
+            _tokens[key] = entry
+            return entry["token"]
+
+        with FileLock(f"{cache_path}.lock"):
+            cache = _read_cache(cache_path)
+            entry = cache.get(key)
+            if not entry or entry["token"] == stale_token or entry["expires_at"] <= time.time():
+                entry = {"token": sign_in(config, client), "expires_at": time.time() + ttl}
+                cache[key] = entry
+                _write_cache(cache_path, cache)
+        _tokens[key] = entry
+        return entry["token"]
+
+
+def refresh_token(config, client: httpx.Client, stale_token: str) -> str:
+    """
+    Replace token rejected by server, config is updated in place. \n
+    :param config: environment config.
+    :param client: http client.
+    :param stale_token: token rejected by server.
+    :return: new token.
+    """
+    config["token"] = get_token(config, client, stale_token=stale_token)
+    return config["token"]
@@ -0,0 +1,282 @@
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+import threading
+
+import httpx
+
+# record header: length of meta JSON and length of body
+RECORD_HEADER = struct.Struct("<II")
+
+MASKS = [
+    (
+        re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"),
+        "<uuid>",
+    ),
+    (
+        re.compile(r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(\.\d+)?(Z|[+-]\d{2}:?\d{2})?"),
+        "<datetime>",
+    ),
+    (re.compile(r"eyJ[\w-]+\.[\w-]+\.[\w-]+|\b[0-9a-f]{32,}\b"), "<token>"),
+    (re.compile(r"Autotest_[\w.@-]*"), "Autotest_<guid>"),
+]
+# shorter values are not substituted in replayed responses to avoid accidental matches
+SUBSTITUTION_MIN_LENGTH = 6
+# generated by factories at random
+VOLATILE_KEYS = {"phone_number", "password", "area", "price", "lat", "lng", "type"}
+
+
+class CassetteMiss(httpx.TransportError):
+    """Request is not recorded in cassette."""
+
+
+def mask(value: any) -> any:
+    """
+    Replace volatile values: uuids, timestamps, tokens and generated names. \n
+    :param value: JSON value.
+    :return: masked value.
+    """
+    if isinstance(value, dict):
+        return {
+            key: "<volatile>" if key in VOLATILE_KEYS else mask(item) for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [mask(item) for item in value]
+    if isinstance(value, str):
+        for pattern, replacement in MASKS:
+            value = pattern.sub(replacement, value)
+    return value
+
+
+def request_key(request: httpx.Request) -> str:
+    """
+    Hash of normalized request: method, route, masked query and masked JSON body. \n
+    Host and headers are ignored, so DEV traffic is replayed against any url.
+    :param request: request.
+    :return: hex digest.
+    """
+    try:
+        body = json.loads(request.content) if request.content else None
+    except ValueError:
+        body = request.content.decode("latin-1")
+    normalized = {
+        "method": request.method,
+        "path": mask(request.url.path),
+        "params": mask(dict(sorted(request.url.params.items()))),
+        "body": mask(body),
+    }
+    return hashlib.sha1(json.dumps(normalized, sort_keys=True).encode()).hexdigest()
+
+
+def read_index(path: str) -> dict:
+    """
+    Index of cassette from .idx file, rebuilt by scan when .idx is missing or stale. \n
+    .idx is written on close of writer only, a run killed before it leaves the old one.
+    :param path: path to cassette.
+    :return: request key to offsets of records.
+    """
+    try:
+        with open(f"{path}.idx", encoding="utf-8") as file:
+            saved = json.load(file)
+        if saved["size"] == os.path.getsize(path):
+            return saved["records"]
+    except (OSError, ValueError, TypeError, KeyError):
+        pass
+    return CassetteReader.scan(path)
+
+
+class CassetteWriter:
+    """Append-only cassette: records of header, meta JSON and raw body, plus .idx index file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "ab")
+        self.index = read_index(path) if self._file.tell() else {}
+        # drop partial last record of killed run, records appended after it would be unreadable
+        self._file.truncate(self._end(path))
+        self._file.seek(0, os.SEEK_END)
+
+    def _end(self, path: str) -> int:
+        """End of last complete record."""
+        offsets = [offset for offsets in self.index.values() for offset in offsets]
+        if not offsets:
+            return 0
+        with open(path, "rb") as file:
+            file.seek(max(offsets))
+            meta_length, body_length = RECORD_HEADER.unpack(file.read(RECORD_HEADER.size))
+        return max(offsets) + RECORD_HEADER.size + meta_length + body_length
+
+    def write(self, key: str, request: httpx.Request, response: httpx.Response):
+        meta = json.dumps(
+            {
+                "key": key,
+                "method": request.method,
+                "url": str(request.url),
+                "request_body": request.content.decode("utf-8", errors="replace"),
+                "status_code": response.status_code,
+                "headers": [
+                    [name, value]
+                    for name, value in response.headers.items()
+                    if name.lower()
+                    not in ("content-encoding", "content-length", "transfer-encoding")
+                ],
+            }
+        ).encode()
+        with self._lock:
+            offset = self._file.tell()
+            self._file.write(RECORD_HEADER.pack(len(meta), len(response.content)))
+            self._file.write(meta)
+            self._file.write(response.content)
+            self.index.setdefault(key, []).append(offset)
+
+    def close(self):
+        with self._lock:
+            self._file.flush()
+            size = os.fstat(self._file.fileno()).st_size
+            self._file.close()
+            with open(f"{self.path}.idx", "w", encoding="utf-8") as file:
+                json.dump({"size": size, "records": self.index}, file)
+
+
+class CassetteReader:
+    """Memory-mapped cassette, responses for the same request are served in recorded order."""
+
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.index = read_index(path)
+        self._served = {}
+        self._lock = threading.Lock()
+        # recorded volatile values to values of current run, e.g. generated names
+        self.substitutions = {}
+
+    @staticmethod
+    def scan(path: str) -> dict:
+        """
+        Build index by reading record headers, partial last record is skipped. \n
+        :param path: path to cassette.
+        :return: request key to offsets of records.
+        """
+        index = {}
+        with open(path, "rb") as file:
+            data = file.read()
+        offset = 0
+        while offset + RECORD_HEADER.size <= len(data):
+            meta_length, body_length = RECORD_HEADER.unpack_from(data, offset)
+            start = offset + RECORD_HEADER.size
+            if start + meta_length + body_length > len(data):
+                break
+            key = json.loads(data[start : start + meta_length])["key"]
+            index.setdefault(key, []).append(offset)
+            offset = start + meta_length + body_length
+        return index
+
+    def response(self, request: httpx.Request) -> httpx.Response:
+        key = request_key(request)
+        offsets = self.index.get(key)
+        if not offsets:
+            raise CassetteMiss(f"Not recorded: {request.method} {request.url}", request=request)
+        with self._lock:
+            served = self._served.get(key, 0)
+            self._served[key] = served + 1
+        offset = offsets[min(served, len(offsets) - 1)]
+        meta_length, body_length = RECORD_HEADER.unpack_from(self._mmap, offset)
+        start = offset + RECORD_HEADER.size
+        meta = json.loads(self._mmap[start : start + meta_length])
+        body = self._mmap[start + meta_length : start + meta_length + body_length]
+        with self._lock:
+            self._learn(meta, request)
+            for recorded, current in self.substitutions.items():
+                body = body.replace(recorded, current)
+        return httpx.Response(
+            meta["status_code"], headers=meta["headers"], content=body, request=request
+        )
+
+    def _learn(self, meta: dict, request: httpx.Request):
+        """Remember generated values of current request which differ from recorded ones."""
+        try:
+            recorded = json.loads(meta["request_body"]) if meta["request_body"] else None
+            current = json.loads(request.content) if request.content else None
+        except ValueError:
+            return
+        recorded_url = httpx.URL(meta["url"])
+        pairs = [(recorded, current)] + [
+            (value, request.url.params.get(name)) for name, value in recorded_url.params.items()
+        ]
+        while pairs:
+            recorded, current = pairs.pop()
+            if isinstance(recorded, dict) and isinstance(current, dict):
+                pairs.extend((value, current.get(key)) for key, value in recorded.items())
+            elif isinstance(recorded, list) and isinstance(current, list):
+                pairs.extend(zip(recorded, current))
+            elif (
+                isinstance(recorded, str)
+                and isinstance(current, str)
+                and recorded != current
+                and len(recorded) >= SUBSTITUTION_MIN_LENGTH
+            ):
+                self.substitutions[recorded.encode()] = current.encode()
+
+    def close(self):
+        self._mmap.close()
+        self._file.close()
+
+
+class RecordTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """Transport passing requests to real (or fake) transport and writing them to cassette."""
+
+    def __init__(self, writer: CassetteWriter, transport=None, limits: httpx.Limits = None):
+        """
+        :param writer: cassette writer.
+        :param transport: inner transport, default HTTP transports with limits.
+        :param limits: connection pool limits of default HTTP transports.
+        """
+        self.writer = writer
+        limits = limits or httpx.Limits()
+        self.sync_transport = transport or httpx.HTTPTransport(limits=limits)
+        self.async_transport = transport or httpx.AsyncHTTPTransport(limits=limits)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        response = self.sync_transport.handle_request(request)
+        content = response.read()
+        response.close()
+        return self._record(request, response, content)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self.async_transport.handle_async_request(request)
+        content = await response.aread()
+        await response.aclose()
+        return self._record(request, response, content)
+
+    def _record(self, request, response, content: bytes) -> httpx.Response:
+        headers = [
+            (name, value)
+            for name, value in response.headers.items()
+            if name.lower() not in ("content-encoding", "content-length", "transfer-encoding")
+        ]
+        recorded = httpx.Response(
+            response.status_code, headers=headers, content=content, request=request
+        )
+        self.writer.write(request_key(request), request, recorded)
+        return recorded
+
+    def close(self):
+        # transport is shared by all clients, cassette is closed by its owner
+        pass
+
+
+class ReplayTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """Transport answering from cassette without network."""
+
+    def __init__(self, reader: CassetteReader):
+        self.reader = reader
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        return self.reader.response(request)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return self.reader.response(request)
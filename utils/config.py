@@ -0,0 +1,43 @@
+import configparser
+
+OPTIONAL_KEYS = (
+    "max_connections",
+    "max_keepalive_connections",
+    "keepalive_expiry",
+    "timeout",
+    "token_ttl",
+    "token_cache",
+    "filter_ttl",
+    "rate_limit",
+    "rate_burst",
+    "request_rate",
+    "retries",
+    "retry_backoff",
+    "retry_max_backoff",
+    "breaker_threshold",
+    "breaker_cooldown",
+    "response_cache_ttl",
+    "response_cache_size",
+)
+
+
+def read_config(env: str, path: str = "config.ini") -> dict:
+    """
+    Read environment section from config file. \n
+    :param env: environment name, section of config file.
+    :param path: path to config file.
+    :return: environment config.
+    """
+    configuration = configparser.RawConfigParser()
+    configuration.read(path)
+
+    config = {
+        "url": configuration.get(env, "url"),
+        "phone": configuration.get(env, "phone"),
+        "password": configuration.get(env, "password"),
+    }
+    for option in OPTIONAL_KEYS:
+        if configuration.has_option(env, option):
+            config[option] = configuration.get(env, option)
+
+    return config
@@ -0,0 +1,54 @@
+import os
+import time
+
+
+class FileLock:
+    """
+    Inter-process lock based on exclusive creation of a lock file. \n
+    Used to share files between pytest-xdist workers without extra dependencies.
+    """
+
+    def __init__(self, path: str, timeout: float = 30.0, stale_after: float = 60.0):
+        """
+        :param path: path to lock file.
+        :param timeout: seconds to wait for the lock.
+        :param stale_after: seconds after which a lock left by a dead process is removed.
+        """
+        self.path = path
+        self.timeout = timeout
+        self.stale_after = stale_after
+        self._fd = None
+
+    def acquire(self):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                self._fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.write(self._fd, str(os.getpid()).encode())
+                return
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(self.path) > self.stale_after:
+                        os.remove(self.path)
+                        continue
+                except OSError:
+                    continue
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Unable to acquire lock: {self.path}!")
+                time.sleep(0.05)
+
+    def release(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
@@ -0,0 +1,112 @@
+"""
+JSON codec for request and response bodies. \n
+orjson or msgspec is used when installed, stdlib json otherwise.
+JSON_CODEC=orjson|msgspec|stdlib forces the backend.
+"""
+
+import json
+import os
+
+import httpx
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+def _stdlib_dumps(obj) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def _msgspec_loads(data: bytes):
+    try:
+        return _msgspec_decoder.decode(data)
+    except msgspec.DecodeError as e:
+        raise json.JSONDecodeError(str(e), data.decode(errors="replace"), 0) from None
+
+
+def _select_backend() -> str:
+    backend = os.environ.get("JSON_CODEC")
+    if backend:
+        if backend not in ("orjson", "msgspec", "stdlib"):
+            raise Exception(f"Unknown JSON_CODEC: {backend}!")
+        if {"orjson": orjson, "msgspec": msgspec}.get(backend, json) is None:
+            raise Exception(f"JSON_CODEC {backend} is not installed!")
+        return backend
+    if orjson is not None:
+        return "orjson"
+    if msgspec is not None:
+        return "msgspec"
+    return "stdlib"
+
+
+BACKEND = _select_backend()
+
+if BACKEND == "orjson":
+    dumps = orjson.dumps
+    loads = orjson.loads
+elif BACKEND == "msgspec":
+    _msgspec_decoder = msgspec.json.Decoder()
+    dumps = msgspec.json.Encoder().encode
+    loads = _msgspec_loads
+else:
+    dumps = _stdlib_dumps
+    loads = json.loads
+
+_DECODED = "_decoded_json"
+
+
+def decode(response: httpx.Response):
+    """
+    Body of response decoded once, later calls return the same object. \n
+    :param response: httpx response.
+    :return: decoded body.
+    """
+    try:
+        return response.__dict__[_DECODED]
+    except KeyError:
+        pass
+    if response.charset_encoding not in (None, "utf-8", "UTF-8"):
+        value = json.loads(response.text)
+    else:
+        value = loads(response.content)
+    response.__dict__[_DECODED] = value
+    return value
+
+
+def encode_body(kwargs: dict) -> dict:
+    """
+    Replace json argument of httpx request with body encoded by codec. \n
+    :param kwargs: httpx request arguments.
+    :return: arguments.
+    """
+    if "json" in kwargs:
+        data = kwargs.pop("json")
+        kwargs["content"] = dumps(data)
+    return kwargs
+
+
+class CodecResponse(httpx.Response):
+    """Response which json() decodes body with codec once, arguments go to stdlib json."""
+
+    def json(self, **kwargs):
+        if kwargs:
+            return super().json(**kwargs)
+        return decode(self)
+
+
+def memoize_json(response: httpx.Response) -> httpx.Response:
+    """
+    Make response.json() decode body with codec once. \n
+    :param response: httpx response.
+    :return: the same response as CodecResponse.
+    """
+    if type(response) is httpx.Response:
+        response.__class__ = CodecResponse
+    return response
@@ -0,0 +1,86 @@
+import codecs
+import json
+from typing import Iterable, Iterator
+
+WHITESPACE = " \t\n\r"
+
+
+class JsonArrayParser:
+    """
+    Incremental parser of top-level JSON array. \n
+    Bytes are fed as they arrive, every complete item is returned at once, so only the
+    current item and an unparsed tail are held in memory.
+    """
+
+    def __init__(self, fields: tuple = None):
+        """
+        :param fields: keep only these keys of object items, e.g. ("id",).
+        """
+        self.fields = fields
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._started = False
+        self.finished = False
+
+    def feed(self, data: bytes, final: bool = False) -> list:
+        """
+        Parse next chunk. \n
+        :param data: chunk of response body.
+        :param final: chunk is the last one.
+        :return: items completed by chunk.
+        """
+        buffer = self._buffer + self._text.decode(data, final)
+        position = 0
+        items = []
+        while not self.finished:
+            while position < len(buffer) and buffer[position] in WHITESPACE:
+                position += 1
+            if position == len(buffer):
+                break
+            char = buffer[position]
+            if not self._started:
+                if char != "[":
+                    raise ValueError(f"Expected JSON array, got: {buffer[position:][:50]!r}")
+                self._started = True
+                position += 1
+            elif char == "]":
+                self.finished = True
+            elif char == ",":
+                position += 1
+            else:
+                try:
+                    item, end = self._json.raw_decode(buffer, position)
+                except json.JSONDecodeError:
+                    if final:
+                        raise
+                    break
+                if not final and not isinstance(item, (dict, list, str)):
+                    # number or literal may continue in next chunk, e.g. "-3" + "e10",
+                    # it is complete only when a delimiter follows
+                    if end == len(buffer) or buffer[end] not in WHITESPACE + ",]":
+                        break
+                items.append(self._project(item))
+                position = end
+        self._buffer = buffer[position:]
+        if final and not self.finished:
+            raise ValueError("Unexpected end of JSON array!")
+        return items
+
+    def _project(self, item: any) -> any:
+        if self.fields is None or not isinstance(item, dict):
+            return item
+        return {field: item.get(field) for field in self.fields}
+
+
+def iter_json_array(chunks: Iterable[bytes], fields: tuple = None) -> Iterator:
+    """
+    Items of top-level JSON array from chunks of bytes. \n
+    :param chunks: e.g. response.iter_bytes().
+    :param fields: keep only these keys of object items.
+    :return: items.
+    """
+    parser = JsonArrayParser(fields=fields)
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.feed(b"", final=True)
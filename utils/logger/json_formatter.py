@@ -0,0 +1,19 @@
+import json
+import logging
+
+
+class JsonFormatter(logging.Formatter):
+    """Запись log в виде JSON: одна строка на запись, поля API вызова отдельными ключами."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "time": self.formatTime(record, self.datefmt),
+            "level": record.levelname,
+            "message": record.getMessage(),
+        }
+        api_call = getattr(record, "api_call", None)
+        if api_call is not None:
+            data.update(api_call)
+        if record.exc_info:
+            data["exception"] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
@@ -4,155 +4,314 @@ import inspect
 import logging
 import logging.config
 import os
+import random
+import reprlib
+import sys
+import time
+from urllib.parse import urlsplit
 
-from requests import Response
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from utils.logger.log_config import LOG_BODY_MAX_LENGTH, LOG_BODY_SAMPLE_RATE, LOGGING_CONFIG
+from utils.metrics import latency, route_key
+from utils.openmetrics import api_metrics, resource_of
 
-from utils.logger.log_config import LOGGING_CONFIG
-
-logging.config.dictConfig(LOGGING_CONFIG)
 logger = logging.getLogger()
+_configured = False
+
+_repr = reprlib.Repr()
+_repr.maxlevel = 3
+_repr.maxdict = _repr.maxlist = _repr.maxtuple = 32
+_repr.maxstring = _repr.maxother = 200
+
+_INFO_TEMPLATE = (
+    "\n"
+    "test_name: %s\n"
+    "method_name: %s\n"
+    "request_method: %s\n"
+    "request_url: %s\n"
+    "request_body: %s\n"
+    "response_status_code: %s\n"
+    "response_text: %s\n"
+)
+_DEBUG_TEMPLATE = (
+    _INFO_TEMPLATE + "response_headers: %s\n" "docstring: %s\n" "encoding: %s\n" "elapsed: %s\n"
+)
+_ERROR_TEMPLATE = (
+    "%s %s \n"
+    "test_name: %s\n"
+    "method_name: %s\n"
+    "request_method: %s\n"
+    "request_url: %s\n"
+    "request_body: %s\n"
+    "response_text: %s\n"
+)
+
+
+class _Signature:
+    """Аргументы вызова, строка формируется только при записи в log."""
+
+    __slots__ = ("args", "kwargs")
+
+    def __init__(self, args: tuple, kwargs: dict):
+        self.args = args
+        self.kwargs = kwargs
+
+    def __str__(self):
+        args_repr = [_repr.repr(a) for a in self.args]
+        kwargs_repr = [f"{k}={_repr.repr(v)}" for k, v in self.kwargs.items()]
+        return ", ".join(args_repr + kwargs_repr)
+
+
+def _test_name() -> str:
+    """Имя текущего теста."""
+    test_name = os.environ.get("PYTEST_CURRENT_TEST")
+    if test_name is not None:
+        test_name = test_name.split(":")[-1].split(" ")[0]
+    return test_name
+
+
+def _body(content: any) -> str:
+    """
+    Тело запроса или ответа, обрезанное до LOG_BODY_MAX_LENGTH. \n
+    :param content: bytes или str.
+    """
+    if not content:
+        return ""
+    size = len(content)
+    if isinstance(content, bytes):
+        text = content[:LOG_BODY_MAX_LENGTH].decode("utf-8", errors="replace")
+    else:
+        text = str(content)[:LOG_BODY_MAX_LENGTH]
+    if size > LOG_BODY_MAX_LENGTH:
+        text += f"... [{size} total]"
+    return text
+
+
+def _log_call(func: any, args: tuple, kwargs: dict, is_class_method: bool):
+    """Запись вызова метода в log."""
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(
+            "method '%s' called with args [%s]",
+            func.__name__,
+            _Signature(args[1:] if is_class_method else args, kwargs),
+        )
+
+
+@functools.lru_cache(maxsize=None)
+def _base_path(url: str) -> str:
+    return urlsplit(url).path
+
+
+def _enter_call(args: tuple, is_class_method: bool) -> str:
+    """
+    Учет начатого вызова в метриках OpenMetrics. \n
+    :return: ресурс вызова, None если метрики выключены.
+    """
+    if not api_metrics.enabled:
+        return None
+    resource = resource_of(args[0] if is_class_method and args else None)
+    api_metrics.enter(resource)
+    return resource
+
+
+def _record_latency(func: any, args: tuple, result: any, seconds: float, is_class_method: bool):
+    """Запись длительности вызова в гистограмму задержек."""
+    failed = isinstance(result, Exception)
+    try:
+        request = result.request
+    except (AttributeError, RuntimeError):
+        key, status_code = func.__qualname__, None
+        latency.record(key, seconds, failed=failed)
+    else:
+        config = getattr(args[0], "config", None) if is_class_method and args else None
+        base_path = _base_path(config["url"]) if isinstance(config, dict) else ""
+        key = route_key(request.method, request.url.path, base_path)
+        status_code = getattr(result, "status_code", None)
+        latency.record(key, seconds, status_code, failed=failed)
+    if api_metrics.enabled:
+        resource = resource_of(args[0] if is_class_method and args else None)
+        api_metrics.observe(resource, key, seconds, None if failed else status_code)
+
+
+def _log_result(func: any, result: any) -> any:
+    """Запись ответа в log."""
+    status_code = getattr(result, "status_code", None)
+    if status_code is None:
+        return result
+
+    if status_code == 400:
+        level = logging.ERROR
+    elif status_code in [401, 403]:
+        level = logging.WARNING
+    elif 500 <= status_code < 600:
+        level = logging.CRITICAL
+    else:
+        level = logger.getEffectiveLevel()
+        if level not in (logging.INFO, logging.DEBUG):
+            return result
+    if not logger.isEnabledFor(level):
+        return result
+
+    request = result.request
+    request_body = getattr(request, "content", None) or getattr(request, "body", None)
+    sampled = level != logging.INFO or random.random() < LOG_BODY_SAMPLE_RATE
+    fields = {
+        "test_name": _test_name(),
+        "method_name": func.__name__,
+        "request_method": request.method,
+        "request_url": str(request.url),
+        "request_body": _body(request_body) if sampled else "[not sampled]",
+        "response_status_code": status_code,
+        "response_text": _body(result.content) if sampled else "[not sampled]",
+    }
+
+    if level == logging.INFO:
+        logger.info(_INFO_TEMPLATE, *fields.values(), extra={"api_call": fields})
+    elif level == logging.DEBUG:
+        fields.update(
+            {
+                "response_headers": dict(result.headers),
+                "docstring": func.__doc__,
+                "encoding": result.encoding,
+                "elapsed": str(result.elapsed),
+            }
+        )
+        logger.debug(_DEBUG_TEMPLATE, *fields.values(), extra={"api_call": fields})
+    else:
+        reason = getattr(result, "reason_phrase", None) or getattr(result, "reason", "")
+        logger.log(
+            level,
+            _ERROR_TEMPLATE,
+            status_code,
+            reason,
+            fields["test_name"],
+            fields["method_name"],
+            fields["request_method"],
+            fields["request_url"],
+            fields["request_body"],
+            fields["response_text"],
+            extra={"api_call": fields},
+        )
+    return result
+
+
+def setup_logging():
+    """
+    Настройка логирования по LOGGING_CONFIG. \n
+    Вызывается один раз в pytest_configure и в точках входа load и benchmarks,
+    повторные вызовы ничего не делают.
+    """
+    global _configured
+    if not _configured:
+        logging.config.dictConfig(LOGGING_CONFIG)
+        _configured = True
+
+
+def _is_selenium_exception(e: Exception, name: str) -> bool:
+    """Проверка исключения selenium без импорта selenium."""
+    # если selenium не загружен, его исключений быть не может
+    exceptions = sys.modules.get("selenium.common.exceptions")
+    return exceptions is not None and isinstance(e, getattr(exceptions, name))
+
+
+def _log_exception(func: any, e: Exception):
+    """Запись исключения в log."""
+    test_name = _test_name()
+    debug = logger.getEffectiveLevel() <= logging.DEBUG
+    if _is_selenium_exception(e, "NoSuchElementException"):
+        trace = inspect.trace()
+        if debug:
+            logger.exception(
+                f"No Such Element Exception\n"
+                f"test_name: {test_name}\n"
+                f"method_name: {func.__name__}\n"
+            )
+        else:
+            logger.error(
+                f"No Such Element Exception\n"
+                f"test_name: {test_name}\n"
+                f"method_name: {func.__name__}\n"
+                f"File {trace[1][1]}, line {trace[1][2]}, in {trace[1][3]}\n  >> {''.join(trace[1][4]).strip()}\n"
+            )
+
+    elif _is_selenium_exception(e, "TimeoutException"):
+        trace = inspect.trace()
+        if debug:
+            logger.exception(
+                f"Timeout Exception\n"
+                f"test_name: {test_name}\n"
+                f"method_name: {func.__name__}\n"
+            )
+        else:
+            logger.error(
+                f"Timeout Exception\n"
+                f"test_name: {test_name}\n"
+                f"method_name: {func.__name__}\n"
+                f"File {trace[1][1]}, line {trace[1][2]}, in {trace[1][3]}\n  >> {''.join(trace[1][4]).strip()}\n"
+            )
+
+    else:
+        trace = inspect.trace()
+        if debug:
+            logger.exception(
+                f"{type(e).__name__, e.args}\n"
+                f"test_name: {test_name}\n"
+                f"method_name: {func.__name__}\n"
+            )
+        else:
+            logger.error(
+                f"{type(e).__name__} Exception\n"
+                f"test_name: {test_name}\n"
+                f"method_name: {func.__name__}\n"
+                f"File {trace[1][1]}, line {trace[1][2]}, in {trace[1][3]}\n  >> {''.join(trace[1][4]).strip()}\n"
+            )
 
 
 def log(func: any, is_class_method: bool = True):
     """
     Декоратор для записи работы методов в log. \n
+    Поддерживает как обычные, так и асинхронные методы.
     :param func: функция, для которой производится логирование.
     :param is_class_method: параметр, который указывает, что используется метод класса.
     """
 
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            """Метод выполняющий запись информации в log."""
+
+            _log_call(func, args, kwargs, is_class_method)
+            resource = _enter_call(args, is_class_method)
+            start = time.perf_counter()
+            try:
+                result = await func(*args, **kwargs)
+                _record_latency(func, args, result, time.perf_counter() - start, is_class_method)
+                return _log_result(func, result)
+            except Exception as e:
+                _record_latency(func, args, e, time.perf_counter() - start, is_class_method)
+                _log_exception(func, e)
+            finally:
+                if resource is not None:
+                    api_metrics.exit(resource)
+
+        return async_wrapper
+
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
         """Метод выполняющий запись информации в log."""
 
-        if is_class_method:
-            args_repr = [repr(a) for a in args[1:]]
-        else:
-            args_repr = [repr(a) for a in args]
-        kwargs_repr = [f"{k}={v!r}" for k, v in kwargs.items()]
-        signature = ", ".join(args_repr + kwargs_repr)
-        logger.info(f"method '{func.__name__}' called with args [{signature}]")
-        test_name = os.environ.get("PYTEST_CURRENT_TEST")
-        if test_name is not None:
-            test_name = test_name.split(":")[-1].split(" ")[0]
-
+        _log_call(func, args, kwargs, is_class_method)
+        resource = _enter_call(args, is_class_method)
+        start = time.perf_counter()
         try:
             result = func(*args, **kwargs)
-            if isinstance(result, Response):
-                if result.status_code == 400:
-                    logger.error(
-                        f"{result.status_code} {result.reason} \n"
-                        f"test_name: {test_name}\n"
-                        f"method_name: {func.__name__}\n"
-                        f"request_method: {result.request.method}\n"
-                        f"request_url: {result.request.url}\n"
-                        f"request_body: {result.request.body}\n"
-                        f"response_text: {result.text}\n"
-                    )
-                    return result
-
-                elif result.status_code in [401, 403]:
-                    logger.warning(
-                        f"{result.status_code} {result.reason} \n"
-                        f"test_name: {test_name}\n"
-                        f"method_name: {func.__name__}\n"
-                        f"request_method: {result.request.method}\n"
-                        f"request_url: {result.request.url}\n"
-                        f"request_body: {result.request.body}\n"
-                        f"response_text: {result.text}\n"
-                    )
-                    return result
-
-                elif result.status_code in range(500, 600):
-                    logger.critical(
-                        f"{result.status_code} {result.reason} \n"
-                        f"test_name: {test_name}\n"
-                        f"method_name: {func.__name__}\n"
-                        f"request_method: {result.request.method}\n"
-                        f"request_url: {result.request.url}\n"
-                        f"request_body: {result.request.body}\n"
-                        f"response_text: {result.text}\n"
-                    )
-                    return result
-
-                if logging.getLevelName(logger.getEffectiveLevel()) == "INFO":
-                    logger.info(
-                        f"\n"
-                        f"test_name: {test_name}\n"
-                        f"method_name: {func.__name__}\n"
-                        f"request_method: {result.request.method}\n"
-                        f"request_url: {result.request.url}\n"
-                        f"request_body: {result.request.body}\n"
-                        f"response_status_code: {result.status_code}\n"
-                        f"response_text: {result.text}\n"
-                    )
-
-                elif logging.getLevelName(logger.getEffectiveLevel()) == "DEBUG":
-                    logger.debug(
-                        f"\n"
-                        f"test_name: {test_name}\n"
-                        f"method_name: {func.__name__}\n"
-                        f"request_method: {result.request.method}\n"
-                        f"request_url: {result.request.url}\n"
-                        f"request_body: {result.request.body}\n"
-                        f"response_status_code: {result.status_code}\n"
-                        f"response_content: {result.content}\n"
-                        f"response_text: {result.text}\n"
-                        f"request_headers: {result.headers}\n"
-                        f"docstring: {func.__doc__}\n"
-                        f"encoding: {result.encoding}\n"
-                        f"cookies: {result.cookies}\n"
-                        f"elapsed: {result.elapsed}\n"
-                    )
-
-            return result
-
-        except NoSuchElementException:
-            trace = inspect.trace()
-            if logging.getLevelName(logger.getEffectiveLevel()) == "DEBUG":
-                logger.exception(
-                    f"No Such Element Exception\n"
-                    f"test_name: {test_name}\n"
-                    f"method_name: {func.__name__}\n"
-                )
-            else:
-                logger.error(
-                    f"No Such Element Exception\n"
-                    f"test_name: {test_name}\n"
-                    f"method_name: {func.__name__}\n"
-                    f"File {trace[1][1]}, line {trace[1][2]}, in {trace[1][3]}\n  >> {''.join(trace[1][4]).strip()}\n"
-                )
-
-        except TimeoutException:
-            trace = inspect.trace()
-            if logging.getLevelName(logger.getEffectiveLevel()) == "DEBUG":
-                logger.exception(
-                    f"Timeout Exception\n"
-                    f"test_name: {test_name}\n"
-                    f"method_name: {func.__name__}\n"
-                )
-            else:
-                logger.error(
-                    f"Timeout Exception\n"
-                    f"test_name: {test_name}\n"
-                    f"method_name: {func.__name__}\n"
-                    f"File {trace[1][1]}, line {trace[1][2]}, in {trace[1][3]}\n  >> {''.join(trace[1][4]).strip()}\n"
-                )
-
+            _record_latency(func, args, result, time.perf_counter() - start, is_class_method)
+            return _log_result(func, result)
         except Exception as e:
-            trace = inspect.trace()
-            if logging.getLevelName(logger.getEffectiveLevel()) == "DEBUG":
-                logger.exception(
-                    f"{type(e).__name__, e.args}\n"
-                    f"test_name: {test_name}\n"
-                    f"method_name: {func.__name__}\n"
-                )
-            else:
-                logger.error(
-                    f"{type(e).__name__} Exception\n"
-                    f"test_name: {test_name}\n"
-                    f"method_name: {func.__name__}\n"
-                    f"File {trace[1][1]}, line {trace[1][2]}, in {trace[1][3]}\n  >> {''.join(trace[1][4]).strip()}\n"
-                )
+            _record_latency(func, args, e, time.perf_counter() - start, is_class_method)
+            _log_exception(func, e)
+        finally:
+            if resource is not None:
+                api_metrics.exit(resource)
 
     return wrapper
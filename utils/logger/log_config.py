@@ -1,5 +1,13 @@
+import os
 from datetime import datetime
 
+# максимальная длина тела запроса/ответа в log
+LOG_BODY_MAX_LENGTH = int(os.environ.get("LOG_BODY_MAX_LENGTH", 2000))
+# доля успешных ответов, для которых тело пишется в log на уровне INFO
+LOG_BODY_SAMPLE_RATE = float(os.environ.get("LOG_BODY_SAMPLE_RATE", 1.0))
+# формат записи в консоль: default или json
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "default")
+
 LOGGING_CONFIG = {
     "version": 1,
     "disable_existing_loggers": False,
@@ -13,11 +21,15 @@ LOGGING_CONFIG = {
             "+%(lineno)d %(funcName)s [%(threadName)s]: %(message)s",  # формат логов
             "datefmt": "%Y-%m-%d %H:%M:%S",  # формат даты
         },
+        "json": {
+            "()": "utils.logger.json_formatter.JsonFormatter",
+            "datefmt": "%Y-%m-%d %H:%M:%S",  # формат даты
+        },
     },
     "handlers": {
         "console": {  # параметры вывода логов в консоль
             "class": "logging.StreamHandler",
-            "formatter": "default",  # используемый форматтер
+            "formatter": LOG_FORMAT,  # используемый форматтер
             "stream": "ext://sys.stdout",  # указываем, что нужно выводить в консоль
         },
         # "file": {  # параметры записи логов в файл
@@ -0,0 +1,344 @@
+import json
+import threading
+
+SUB_BUCKET_BITS = 7
+SUB_BUCKET_HALF = 1 << (SUB_BUCKET_BITS - 1)
+
+
+def bucket_index(value: int) -> int:
+    """
+    Index of log-linear bucket, relative error of a bucket is below 1/64. \n
+    :param value: non-negative integer value.
+    :return: bucket index.
+    """
+    shift = value.bit_length() - SUB_BUCKET_BITS
+    if shift <= 0:
+        return value
+    return shift * SUB_BUCKET_HALF + (value >> shift)
+
+
+def bucket_upper_bound(index: int) -> int:
+    """
+    Highest value of bucket. \n
+    :param index: bucket index.
+    :return: value.
+    """
+    if index < 2 * SUB_BUCKET_HALF:
+        return index
+    shift = index // SUB_BUCKET_HALF - 1
+    return ((index - shift * SUB_BUCKET_HALF + 1) << shift) - 1
+
+
+class Histogram:
+    """HDR-style histogram of integer values with sparse log-linear buckets."""
+
+    def __init__(self):
+        self.counts: dict = {}
+        self.total = 0
+        self.max = 0
+
+    def record(self, value: int):
+        index = bucket_index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.total += 1
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "Histogram"):
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, percent: float) -> int:
+        """
+        Value at percentile. \n
+        :param percent: percentile, 0-100.
+        :return: upper bound of bucket holding the percentile, 0 for empty histogram.
+        """
+        if not self.total:
+            return 0
+        rank = max(1, round(self.total * percent / 100))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(bucket_upper_bound(index), self.max)
+        return self.max
+
+
+class EndpointStats:
+    """Latency histogram in microseconds and error counters of one endpoint."""
+
+    def __init__(self):
+        self.histogram = Histogram()
+        self.client_errors = 0
+        self.errors = 0
+
+    def merge(self, other: "EndpointStats"):
+        self.histogram.merge(other.histogram)
+        self.client_errors += other.client_errors
+        self.errors += other.errors
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.histogram.total,
+            "client_errors": self.client_errors,
+            "errors": self.errors,
+            "p50_ms": self.histogram.percentile(50) / 1000,
+            "p90_ms": self.histogram.percentile(90) / 1000,
+            "p99_ms": self.histogram.percentile(99) / 1000,
+            "max_ms": self.histogram.max / 1000,
+        }
+
+
+class LatencyRegistry:
+    """Latency statistics of API calls keyed by method and route, e.g. "POST /booking/"."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.endpoints: dict = {}
+        # functions called with key and seconds of every recorded call
+        self.listeners: list = []
+        # SharedMetrics block of worker process, see load.driver
+        self.shared = None
+
+    def record(self, key: str, seconds: float, status_code: int = None, failed: bool = False):
+        """
+        Record API call. \n
+        :param key: method and route.
+        :param seconds: call duration.
+        :param status_code: response status code.
+        :param failed: call raised exception.
+        """
+        with self._lock:
+            stats = self.endpoints.get(key)
+            if stats is None:
+                stats = EndpointStats() if self.shared is None else self.shared.stats(key)
+                self.endpoints[key] = stats
+            stats.histogram.record(int(seconds * 1_000_000))
+            if failed or (status_code or 0) >= 500:
+                stats.errors += 1
+            elif (status_code or 0) >= 400:
+                stats.client_errors += 1
+        for listener in self.listeners:
+            listener(key, seconds)
+
+    def merge(self, endpoints: dict):
+        """
+        Add statistics of another process. \n
+        :param endpoints: key to EndpointStats, e.g. from SharedMetrics.read().
+        """
+        with self._lock:
+            for key, other in endpoints.items():
+                stats = self.endpoints.get(key)
+                if stats is None:
+                    stats = self.endpoints[key] = EndpointStats()
+                stats.merge(other)
+
+    def clear(self):
+        with self._lock:
+            self.endpoints.clear()
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {key: stats.to_dict() for key, stats in sorted(self.endpoints.items())}
+
+    def to_json(self, path: str):
+        """
+        Write report to JSON file. \n
+        :param path: path to file.
+        """
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file, indent=2)
+
+    def report(self) -> str:
+        lines = [
+            f"{'endpoint':<28}{'count':>8}{'4xx':>6}{'5xx/exc':>9}"
+            f"{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}"
+        ]
+        for key, stats in self.to_dict().items():
+            lines.append(
+                f"{key:<28}{stats['count']:>8}{stats['client_errors']:>6}{stats['errors']:>9}"
+                f"{stats['p50_ms']:>10.1f}{stats['p90_ms']:>10.1f}"
+                f"{stats['p99_ms']:>10.1f}{stats['max_ms']:>10.1f}"
+            )
+        return "\n".join(lines)
+
+
+# microseconds, ~71 minutes, longer calls are recorded as this value
+SHARED_VALUE_LIMIT = 2**32 - 1
+SHARED_BUCKETS = bucket_index(SHARED_VALUE_LIMIT) + 1
+SHARED_SLOTS = 64
+SHARED_NAME_SIZE = 96
+# int64 fields of slot before bucket counts
+TOTAL, MAX, CLIENT_ERRORS, ERRORS = range(4)
+SLOT_FIELDS = 4 + SHARED_BUCKETS
+
+
+class SharedHistogram(Histogram):
+    """Histogram with dense bucket counts in a slot of SharedMetrics."""
+
+    def __init__(self, values: memoryview, offset: int):
+        self.values = values
+        self.offset = offset
+
+    @property
+    def counts(self) -> dict:
+        start = self.offset + SLOT_FIELDS - SHARED_BUCKETS
+        return {
+            index: count
+            for index, count in enumerate(self.values[start : self.offset + SLOT_FIELDS])
+            if count
+        }
+
+    @property
+    def total(self) -> int:
+        return self.values[self.offset + TOTAL]
+
+    @property
+    def max(self) -> int:
+        return self.values[self.offset + MAX]
+
+    def record(self, value: int):
+        value = min(value, SHARED_VALUE_LIMIT)
+        self.values[self.offset + SLOT_FIELDS - SHARED_BUCKETS + bucket_index(value)] += 1
+        self.values[self.offset + TOTAL] += 1
+        if value > self.values[self.offset + MAX]:
+            self.values[self.offset + MAX] = value
+
+
+class SharedEndpointStats(EndpointStats):
+    """EndpointStats kept in a slot of SharedMetrics."""
+
+    def __init__(self, values: memoryview, offset: int):
+        self.histogram = SharedHistogram(values, offset)
+        self.values = values
+        self.offset = offset
+
+    @property
+    def client_errors(self) -> int:
+        return self.values[self.offset + CLIENT_ERRORS]
+
+    @client_errors.setter
+    def client_errors(self, value: int):
+        self.values[self.offset + CLIENT_ERRORS] = value
+
+    @property
+    def errors(self) -> int:
+        return self.values[self.offset + ERRORS]
+
+    @errors.setter
+    def errors(self, value: int):
+        self.values[self.offset + ERRORS] = value
+
+
+class SharedMetrics:
+    """
+    Endpoint statistics in shared memory, written by one process and merged by another. \n
+    Layout: number of used slots, slot names, then per slot total, max, 4xx and 5xx counters
+    and dense counts of bucket_index buckets. There is one writer process, so readers take
+    counters without locks and may be a few calls behind until the writer exits.
+    Keys beyond SHARED_SLOTS share the last slot "other".
+    """
+
+    def __init__(self, memory):
+        """
+        :param memory: multiprocessing.shared_memory.SharedMemory.
+        """
+        self.memory = memory
+        self.names_offset = 8
+        values_offset = self.names_offset + SHARED_SLOTS * SHARED_NAME_SIZE
+        self.used = memory.buf[: self.names_offset].cast("q")
+        self.values = memory.buf[values_offset:].cast("q")
+        self.slots: dict = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def create(cls) -> "SharedMetrics":
+        """Create zeroed block, name of block is passed to writer process."""
+        # imported here, utils.logger.log imports this module and must stay light
+        from multiprocessing import shared_memory
+
+        size = 8 + SHARED_SLOTS * (SHARED_NAME_SIZE + SLOT_FIELDS * 8)
+        return cls(shared_memory.SharedMemory(create=True, size=size))
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedMetrics":
+        """Open block created by another process."""
+        from multiprocessing import shared_memory
+
+        return cls(shared_memory.SharedMemory(name=name))
+
+    @property
+    def name(self) -> str:
+        return self.memory.name
+
+    def _slot_name(self, slot: int) -> str:
+        start = self.names_offset + slot * SHARED_NAME_SIZE
+        return bytes(self.memory.buf[start : start + SHARED_NAME_SIZE]).rstrip(b"\0").decode()
+
+    def stats(self, key: str) -> SharedEndpointStats:
+        """
+        Statistics of key for writer, slot is taken on first use. \n
+        :param key: endpoint key.
+        :return: stats writing to shared memory.
+        """
+        with self._lock:
+            slot = self.slots.get(key)
+            if slot is None:
+                slot = self.used[0]
+                if slot >= SHARED_SLOTS - 1:
+                    key, slot = "other", SHARED_SLOTS - 1
+                start = self.names_offset + slot * SHARED_NAME_SIZE
+                name = key.encode()[:SHARED_NAME_SIZE]
+                self.memory.buf[start : start + len(name)] = name
+                # slot becomes visible to readers after its name is written
+                self.used[0] = min(slot + 1, SHARED_SLOTS)
+                self.slots[key] = slot
+            return SharedEndpointStats(self.values, slot * SLOT_FIELDS)
+
+    def read(self) -> dict:
+        """
+        Copy of statistics for reader. \n
+        :return: key to EndpointStats.
+        """
+        endpoints = {}
+        for slot in range(self.used[0]):
+            shared = SharedEndpointStats(self.values, slot * SLOT_FIELDS)
+            stats = EndpointStats()
+            stats.histogram.counts = shared.histogram.counts
+            stats.histogram.total = shared.histogram.total
+            stats.histogram.max = shared.histogram.max
+            stats.client_errors = shared.client_errors
+            stats.errors = shared.errors
+            endpoints[self._slot_name(slot)] = stats
+        return endpoints
+
+    def close(self, unlink: bool = False):
+        """
+        Release block. \n
+        :param unlink: free shared memory, done by creator.
+        """
+        self.used.release()
+        self.values.release()
+        self.memory.close()
+        if unlink:
+            self.memory.unlink()
+
+
+def route_key(method: str, path: str, base_path: str = "") -> str:
+    """
+    Endpoint key without environment base path, e.g. "GET /space/". \n
+    :param method: http method.
+    :param path: request url path.
+    :param base_path: path of environment url, e.g. "/one-hour".
+    :return: key.
+    """
+    base_path = base_path.rstrip("/")
+    if base_path and path.startswith(base_path):
+        path = path[len(base_path) :]
+    return f"{method} {path or '/'}"
+
+
+latency = LatencyRegistry()
@@ -0,0 +1,197 @@
+import os
+import threading
+
+PREFIX = "onehour_api"
+# seconds, upper bounds of latency histogram buckets
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+
+def resource_of(api: any) -> str:
+    """
+    Resource of API client: last path segment of its url, e.g. "space". \n
+    :param api: API client instance.
+    :return: resource, "other" for functions without API client.
+    """
+    url = getattr(api, "url", None)
+    if not isinstance(url, str):
+        return "other"
+    return url.rstrip("/").rsplit("/", 1)[-1]
+
+
+def worker_path(path: str, worker: str) -> str:
+    """
+    Textfile of worker process, e.g. metrics.prom -> metrics.gw0.prom. \n
+    :param path: textfile path.
+    :param worker: worker name, "master" keeps path.
+    :return: path.
+    """
+    if worker == "master":
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}.{worker}{ext}"
+
+
+def _escape(value: any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: dict) -> str:
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+class ApiMetrics:
+    """
+    Request, response code, in-flight and latency metrics of API calls in OpenMetrics format. \n
+    Collected by the log decorator when enabled, grouped by resource (space, booking, client)
+    and endpoint of utils.metrics.route_key. Exported to a textfile (node_exporter textfile
+    collector) or served on /metrics.
+    """
+
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.enabled = False
+        self.requests: dict = {}
+        self.responses: dict = {}
+        self.in_flight: dict = {}
+        # key to [bucket counts..., count, sum]
+        self.durations: dict = {}
+        self._lock = threading.Lock()
+
+    def enter(self, resource: str):
+        """Call of API method started."""
+        with self._lock:
+            self.in_flight[resource] = self.in_flight.get(resource, 0) + 1
+
+    def exit(self, resource: str):
+        """Call of API method finished."""
+        with self._lock:
+            self.in_flight[resource] -= 1
+
+    def observe(self, resource: str, key: str, seconds: float, status_code: int = None):
+        """
+        Record finished API call. \n
+        :param resource: e.g. "space".
+        :param key: method and route, e.g. "GET /space/", name of function for exceptions.
+        :param seconds: call duration.
+        :param status_code: response status code, None for exceptions.
+        """
+        method, _, endpoint = key.rpartition(" ")
+        series = (resource, method, endpoint)
+        code = "exception" if status_code is None else str(status_code)
+        with self._lock:
+            self.requests[series] = self.requests.get(series, 0) + 1
+            self.responses[series + (code,)] = self.responses.get(series + (code,), 0) + 1
+            histogram = self.durations.get(series)
+            if histogram is None:
+                histogram = self.durations[series] = [0] * (len(self.buckets) + 2)
+            for index, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    histogram[index] += 1
+            histogram[-2] += 1
+            histogram[-1] += seconds
+
+    def clear(self):
+        with self._lock:
+            self.requests.clear()
+            self.responses.clear()
+            self.durations.clear()
+
+    def to_text(self, labels: dict = None) -> str:
+        """
+        Metrics in OpenMetrics text format. \n
+        :param labels: constant labels of all samples, e.g. {"worker": "gw0"}.
+        :return: exposition ending with # EOF.
+        """
+        labels = labels or {}
+        with self._lock:
+            requests = dict(self.requests)
+            responses = dict(self.responses)
+            in_flight = dict(self.in_flight)
+            durations = {series: list(histogram) for series, histogram in self.durations.items()}
+
+        def series_labels(series: tuple, **extra) -> dict:
+            resource, method, endpoint = series[:3]
+            return {**labels, "resource": resource, "method": method, "endpoint": endpoint, **extra}
+
+        lines = [
+            f"# TYPE {PREFIX}_requests counter",
+            f"# HELP {PREFIX}_requests API calls made by the harness.",
+        ]
+        for series, count in sorted(requests.items()):
+            lines.append(f"{PREFIX}_requests_total{_labels(series_labels(series))} {count}")
+        lines += [
+            f"# TYPE {PREFIX}_responses counter",
+            f"# HELP {PREFIX}_responses API calls by status code, exception when none.",
+        ]
+        for series, count in sorted(responses.items()):
+            sample_labels = _labels(series_labels(series, code=series[3]))
+            lines.append(f"{PREFIX}_responses_total{sample_labels} {count}")
+        lines += [
+            f"# TYPE {PREFIX}_in_flight gauge",
+            f"# HELP {PREFIX}_in_flight API calls in progress.",
+        ]
+        for resource, count in sorted(in_flight.items()):
+            lines.append(f"{PREFIX}_in_flight{_labels({**labels, 'resource': resource})} {count}")
+        lines += [
+            f"# TYPE {PREFIX}_request_duration_seconds histogram",
+            f"# UNIT {PREFIX}_request_duration_seconds seconds",
+            f"# HELP {PREFIX}_request_duration_seconds Duration of API calls.",
+        ]
+        for series, histogram in sorted(durations.items()):
+            name = f"{PREFIX}_request_duration_seconds"
+            for bound, count in zip(self.buckets, histogram):
+                lines.append(f"{name}_bucket{_labels(series_labels(series, le=bound))} {count}")
+            lines.append(
+                f"{name}_bucket{_labels(series_labels(series, le='+Inf'))} {histogram[-2]}"
+            )
+            lines.append(f"{name}_count{_labels(series_labels(series))} {histogram[-2]}")
+            lines.append(f"{name}_sum{_labels(series_labels(series))} {histogram[-1]:.6f}")
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str, labels: dict = None):
+        """
+        Write textfile, replaced atomically so collectors never read a partial file. \n
+        :param path: path to file, e.g. /var/lib/node_exporter/onehour.prom.
+        :param labels: constant labels of all samples.
+        """
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            file.write(self.to_text(labels=labels))
+        os.replace(temporary, path)
+
+    def serve(self, host: str = "127.0.0.1", port: int = 9100, labels: dict = None):
+        """
+        Serve /metrics in background thread. \n
+        :param host: host to bind.
+        :param port: port to bind.
+        :param labels: constant labels of all samples.
+        :return: server, call shutdown() to stop it.
+        """
+        # imported here, utils.logger.log imports this module and must stay light
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                content = metrics.to_text(labels=labels).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+api_metrics = ApiMetrics()
@@ -0,0 +1,67 @@
+import json
+import os
+
+from api_clients.client_api import ClientApi
+from factories.client_factory import ClientFactory
+
+
+def worker_id() -> str:
+    """
+    Id of pytest-xdist worker. \n
+    :return: e.g. "gw0", "master" without xdist.
+    """
+    return os.environ.get("PYTEST_XDIST_WORKER", "master")
+
+
+def sign_up_worker_account(config) -> dict:
+    """
+    Sign up own account for current worker. \n
+    :param config: environment config.
+    :return: phone, password and token of new account and data namespace of worker.
+    """
+    data = ClientFactory().default_data
+    response = ClientApi(config=config).sign_up(data=data)
+    token = response.json().get("token") if response is not None else None
+    if token is None:
+        raise Exception(f"Unable to sign up account for worker {worker_id()}!")
+    return {
+        "phone": data["phone_number"],
+        "password": data["password"],
+        "token": token,
+        "namespace": worker_id(),
+    }
+
+
+class DurationStore:
+    """Recorded test durations used to schedule the longest tests first."""
+
+    def __init__(self, path: str):
+        """
+        :param path: path to JSON file, nodeid to seconds.
+        """
+        self.path = path
+        try:
+            with open(path, encoding="utf-8") as file:
+                self.durations = json.load(file)
+        except (OSError, ValueError):
+            self.durations = {}
+        self.current = {}
+
+    def record(self, nodeid: str, duration: float):
+        """Add duration of test phase (setup, call or teardown)."""
+        self.current[nodeid] = self.current.get(nodeid, 0.0) + duration
+
+    def sort(self, items: list):
+        """
+        Sort tests longest first, tests without recorded duration go first. \n
+        :param items: collected pytest items, sorted in place.
+        """
+        unknown = float("inf")
+        items.sort(key=lambda item: -self.durations.get(item.nodeid, unknown))
+
+    def save(self):
+        self.durations.update(self.current)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(self.durations, file, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
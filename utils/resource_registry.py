@@ -0,0 +1,213 @@
+import asyncio
+import functools
+import inspect
+import threading
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_RETRIES = 3
+AUTOTEST_PREFIX = "Autotest_"
+SWEEP_PAGE_SIZE = 100
+
+# resources deleted by cleanup, in order of deletion
+DELETERS = {"booking": "delete_booking", "space": "delete_space"}
+
+
+class ResourceRegistry:
+    """
+    Registry of resources created through API clients. \n
+    Every resource is stored with config (token) of its creator, so it is deleted by the owner.
+    Only deletable kinds (DELETERS) are registered, so long load runs don't grow it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sequence = 0
+        self.resources = {}
+
+    def add(self, kind: str, id_: str, config):
+        """
+        Register created resource. \n
+        :param kind: resource kind: booking or space.
+        :param id_: resource id.
+        :param config: config of API client which created resource.
+        """
+        if kind not in DELETERS:
+            return
+        with self._lock:
+            self._sequence += 1
+            self.resources[(kind, id_)] = (self._sequence, config)
+
+    def discard(self, kind: str, id_: str):
+        """Unregister deleted resource."""
+        with self._lock:
+            self.resources.pop((kind, id_), None)
+
+    def forget(self, kind: str, ids: list):
+        """Unregister resources managed elsewhere, e.g. by space pool."""
+        with self._lock:
+            for id_ in ids:
+                self.resources.pop((kind, id_), None)
+
+    def mark(self) -> int:
+        """
+        Current position of registry. \n
+        :return: mark for cleanup(since=...).
+        """
+        with self._lock:
+            return self._sequence
+
+    def cleanup(
+        self,
+        since: int = 0,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        retries: int = DEFAULT_RETRIES,
+    ) -> list:
+        """
+        Delete registered resources created after mark. \n
+        Bookings are deleted before spaces. Deletes run on the background loop of
+        api_clients.async_base_api.run_in_loop, so pooled connections are reused.
+        :param since: mark returned by mark().
+        :param concurrency: max concurrent delete requests.
+        :param retries: attempts per resource on network errors and 5xx.
+        :return: keys of resources which were not deleted.
+        """
+        with self._lock:
+            items = [
+                (kind, id_, config)
+                for (kind, id_), (sequence, config) in self.resources.items()
+                if sequence > since
+            ]
+        if not items:
+            return []
+        from api_clients.async_base_api import run_in_loop
+
+        return run_in_loop(self._delete(items, concurrency, retries))
+
+    async def _delete(self, items: list, concurrency: int, retries: int) -> list:
+        # API clients import this module for tracking decorators
+        from api_clients.async_base_api import map_limited
+        from api_clients.booking_api import AsyncBookingApi
+        from api_clients.space_api import AsyncSpaceApi
+
+        api_classes = {"booking": AsyncBookingApi, "space": AsyncSpaceApi}
+        apis = {}
+        failed = []
+
+        async def delete(item: tuple):
+            kind, id_, config = item
+            key = (kind, config.get("token"))
+            if key not in apis:
+                apis[key] = api_classes[kind](config=config)
+            method = getattr(apis[key], DELETERS[kind])
+            for attempt in range(retries):
+                response = await method(id_=id_)
+                if response is not None and response.status_code < 500:
+                    # 400 means resource is already deleted
+                    self.discard(kind, id_)
+                    return
+                await asyncio.sleep(0.1 * 2**attempt)
+            failed.append((kind, id_))
+
+        for kind in DELETERS:
+            await map_limited(delete, [item for item in items if item[0] == kind], concurrency)
+        return failed
+
+    def sweep(self, config, concurrency: int = DEFAULT_CONCURRENCY) -> list:
+        """
+        Delete all spaces of account named with AUTOTEST_PREFIX and their bookings. \n
+        :param config: environment config with token of account.
+        :param concurrency: max concurrent delete requests.
+        :return: keys of resources which were not deleted.
+        """
+        from api_clients.booking_api import BookingApi
+        from api_clients.space_api import SpaceApi
+
+        space_ids = {
+            space.get("id")
+            for space in SpaceApi(config=config).iter_owner_spaces(page_size=SWEEP_PAGE_SIZE)
+            if str(space.get("name", "")).startswith(AUTOTEST_PREFIX)
+        }
+        items = [("space", id_, config) for id_ in space_ids]
+        response = BookingApi(config=config).get_bookings_for_owner()
+        if response is not None and response.status_code == 200:
+            items += [
+                ("booking", booking.get("id"), config)
+                for booking in response.json()
+                if booking.get("space_id") in space_ids
+            ]
+        if not items:
+            return []
+        from api_clients.async_base_api import run_in_loop
+
+        return run_in_loop(self._delete(items, concurrency, DEFAULT_RETRIES))
+
+
+resources = ResourceRegistry()
+
+
+def _created_id(kind: str, result: any, args: tuple, kwargs: dict) -> str:
+    if getattr(result, "status_code", None) != 200:
+        return None
+    return result.json().get("id")
+
+
+def track(kind: str):
+    """
+    Decorator of API method creating resource: id from response is registered. \n
+    :param kind: resource kind: booking or space.
+    """
+
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                result = await func(*args, **kwargs)
+                id_ = _created_id(kind, result, args, kwargs)
+                if id_ is not None:
+                    resources.add(kind, id_, args[0].config)
+                return result
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            result = func(*args, **kwargs)
+            id_ = _created_id(kind, result, args, kwargs)
+            if id_ is not None:
+                resources.add(kind, id_, args[0].config)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def untrack(kind: str):
+    """
+    Decorator of API method deleting resource: id is unregistered on success. \n
+    :param kind: resource kind: booking or space.
+    """
+
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                result = await func(*args, **kwargs)
+                if getattr(result, "status_code", None) == 200:
+                    resources.discard(kind, kwargs.get("id_", args[1] if len(args) > 1 else None))
+                return result
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            result = func(*args, **kwargs)
+            if getattr(result, "status_code", None) == 200:
+                resources.discard(kind, kwargs.get("id_", args[1] if len(args) > 1 else None))
+            return result
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,117 @@
+import threading
+
+# marker arguments of @pytest.mark.latency and their percentiles
+PERCENTILE_LIMITS = {"p50_ms": 50, "p90_ms": 90, "p95_ms": 95, "p99_ms": 99, "max_ms": 100}
+
+
+def percentile(values: list, percent: float) -> float:
+    """
+    Nearest-rank percentile. \n
+    :param values: samples.
+    :param percent: percentile, 0-100.
+    :return: value at percentile, 0 for no samples.
+    """
+    if not values:
+        return 0.0
+    values = sorted(values)
+    rank = max(1, round(len(values) * percent / 100))
+    return values[min(rank, len(values)) - 1]
+
+
+class SlaCollector:
+    """
+    Latency SLA checks of the session. \n
+    While a test runs, API call durations are collected per endpoint and checks of
+    check_latency and @pytest.mark.latency are kept as rows; rows are reported in a
+    pass/fail table at the end of the session.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.observing = False
+        self.samples = {}
+        self.checks = []
+        self.results = []
+        # path of environment url, stripped from endpoint names, set in pytest_configure
+        self.base_path = ""
+
+    def start(self, observe: bool = False):
+        """
+        Start new test. \n
+        :param observe: collect durations of API calls for latency marker.
+        """
+        with self._lock:
+            self.observing = observe
+            self.samples = {}
+            self.checks = []
+
+    def observe(self, key: str, seconds: float):
+        """Listener of utils.metrics.latency: duration of API call in current test."""
+        if self.observing:
+            with self._lock:
+                self.samples.setdefault(key, []).append(seconds * 1000)
+
+    def check(
+        self, name: str, metric: str, limit_ms: float, values: list, percent: float = 100
+    ) -> dict:
+        """
+        Check samples against limit. \n
+        :param name: endpoint, e.g. "GET /booking/owner/".
+        :param metric: limit name, e.g. "p95_ms".
+        :param limit_ms: limit in milliseconds.
+        :param values: samples in milliseconds.
+        :param percent: checked percentile of samples.
+        :return: row with observed value and passed flag.
+        """
+        observed = percentile(values, percent)
+        row = {
+            "name": name,
+            "metric": metric,
+            "limit_ms": limit_ms,
+            "observed_ms": round(observed, 1),
+            "samples": len(values),
+            "passed": bool(values) and observed <= limit_ms,
+        }
+        with self._lock:
+            self.checks.append(row)
+        return row
+
+    def finish(self) -> list:
+        """
+        Finish test. \n
+        :return: rows of checks made by the test.
+        """
+        with self._lock:
+            rows, self.checks = self.checks, []
+            self.observing = False
+            self.samples = {}
+        return rows
+
+    def add_results(self, nodeid: str, rows: list):
+        """Keep rows of finished test for session report."""
+        with self._lock:
+            self.results.extend({"test": nodeid, **row} for row in rows)
+
+    def report(self) -> str:
+        """
+        Pass/fail table of all checks. \n
+        :return: table.
+        """
+        with self._lock:
+            results = list(self.results)
+        lines = [
+            f"{'result':<8}{'endpoint':<32}{'metric':<9}{'limit ms':>10}{'actual ms':>11}"
+            f"{'samples':>9}  test"
+        ]
+        for row in sorted(results, key=lambda row: (row["passed"], row["name"])):
+            lines.append(
+                f"{'PASS' if row['passed'] else 'FAIL':<8}{row['name']:<32}{row['metric']:<9}"
+                f"{row['limit_ms']:>10.1f}{row['observed_ms']:>11.1f}{row['samples']:>9}"
+                f"  {row['test']}"
+            )
+        failed = sum(not row["passed"] for row in results)
+        lines.append(f"{len(results)} checks, {failed} failed")
+        return "\n".join(lines)
+
+
+sla = SlaCollector()
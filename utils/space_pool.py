@@ -0,0 +1,90 @@
+import threading
+
+from api_clients.async_base_api import map_limited, run_in_loop
+from api_clients.space_api import AsyncSpaceApi
+from factories.space_factory import SpaceFactory
+from utils.resource_registry import resources
+
+DEFAULT_POOL_SIZE = 4
+DEFAULT_CONCURRENCY = 8
+
+
+class SpacePool:
+    """
+    Pool of pre-created spaces leased to tests. \n
+    Spaces are created concurrently in batches, returned spaces are reused, consumed
+    (deleted by test) spaces are replaced on next lease, leftovers are deleted on close.
+    """
+
+    def __init__(
+        self, config, size: int = DEFAULT_POOL_SIZE, concurrency: int = DEFAULT_CONCURRENCY
+    ):
+        """
+        :param config: environment config with token.
+        :param size: number of spaces created per batch.
+        :param concurrency: max concurrent create and delete requests.
+        """
+        self.config = config
+        self.size = size
+        self.concurrency = concurrency
+        self.available = []
+        self.leased = {}
+        self._lock = threading.Lock()
+
+    async def _create_spaces(self, payloads: list) -> list:
+        space_api = AsyncSpaceApi(config=self.config)
+        responses = await map_limited(space_api.create_space, payloads, self.concurrency)
+        spaces = [
+            response.json()
+            for response in responses
+            if response is not None and response.status_code == 200
+        ]
+        resources.forget("space", [space["id"] for space in spaces])
+        return spaces
+
+    async def _delete_spaces(self, space_ids: list):
+        space_api = AsyncSpaceApi(config=self.config)
+        await map_limited(space_api.delete_space, space_ids, self.concurrency)
+
+    def fill(self):
+        """Create spaces until size spaces are available."""
+        missing = self.size - len(self.available)
+        if missing > 0:
+            payloads = [
+                {"data": data} for data in SpaceFactory.build_batch(missing, config=self.config)
+            ]
+            self.available.extend(run_in_loop(self._create_spaces(payloads)))
+
+    def lease(self) -> dict:
+        """
+        Take space from pool. \n
+        :return: json data of created space.
+        """
+        with self._lock:
+            if not self.available:
+                self.fill()
+            if not self.available:
+                raise Exception("Unable to create spaces for pool!")
+            space = self.available.pop()
+            self.leased[space["id"]] = space
+            return space
+
+    def release(self, space: dict, consumed: bool = False):
+        """
+        Return space to pool. \n
+        :param space: leased space.
+        :param consumed: space was deleted or changed by test and can't be reused.
+        """
+        with self._lock:
+            self.leased.pop(space["id"], None)
+            if not consumed:
+                self.available.append(space)
+
+    def close(self):
+        """Delete all spaces of pool."""
+        with self._lock:
+            space_ids = [space["id"] for space in self.available + list(self.leased.values())]
+            self.available.clear()
+            self.leased.clear()
+        if space_ids:
+            run_in_loop(self._delete_spaces(space_ids))
@@ -1,6 +1,11 @@
+from typing import Callable, Union
+
 import pytest_check
 from httpx import Response
 
+from utils.metrics import route_key
+from utils.sla import sla
+
 
 def check_status_code(request: Response, exp_code: int):
     """
@@ -13,3 +18,46 @@ def check_status_code(request: Response, exp_code: int):
         status_code == exp_code,
         f"Unexpected status code!\n" f"Expected: {exp_code},\n" f"Actual: {status_code}",
     )
+
+
+def check_latency(
+    response: Union[Response, Callable[[], Response]],
+    max_ms: float,
+    repeat: int = 1,
+    percent: float = 95,
+) -> Response:
+    """
+    Check response time by Response.elapsed. \n
+    When call is passed instead of response, it is called repeat times and percentile of
+    samples is checked. Result goes to the latency SLA table at the end of the session.
+    :param response: response or function returning response, e.g. lambda: api.get_space().
+    :param max_ms: limit in milliseconds.
+    :param repeat: number of calls for function.
+    :param percent: checked percentile of repeated calls.
+    :return: last response.
+    """
+    responses = [response() for _ in range(repeat)] if callable(response) else [response]
+    responses = [item for item in responses if item is not None]
+    try:
+        values = [item.elapsed.total_seconds() * 1000 for item in responses]
+    except RuntimeError:
+        # in-process transports (fake API, replay) answer with pre-read body without elapsed
+        return responses[-1]
+    # same endpoint names as latency marker rows, without environment base path
+    name = (
+        route_key(responses[0].request.method, responses[0].request.url.path, sla.base_path)
+        if responses
+        else "-"
+    )
+    if len(values) <= 1:
+        metric, percent = "max_ms", 100
+    else:
+        metric = f"p{percent:g}_ms"
+    row = sla.check(name, metric, max_ms, values, percent=percent)
+    pytest_check.is_true(
+        row["passed"],
+        f"Response is too slow!\n"
+        f"Expected: {metric} <= {max_ms} ms,\n"
+        f"Actual: {row['observed_ms']} ms of {len(values)} sample(s)",
+    )
+    return responses[-1] if responses else None